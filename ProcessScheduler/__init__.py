@@ -1,4 +1,5 @@
 import azure.functions as func
+import json
 import logging
 import os
 import sys
@@ -8,12 +9,22 @@ root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if root_path not in sys.path:
     sys.path.insert(0, root_path)
 
-from scheduler_script import run_postulacion_checker
+from scheduler_script import run_postulacion_checker, resumen_sin_detalle
+from src.exception.ejecucion_en_curso import EjecucionEnCurso
 
 def main(req: func.HttpRequest) -> func.HttpResponse:
     """
     Azure Function HTTP Trigger para ejecutar el scheduler de notificaciones.
     Esta función puede ser invocada desde Azure Data Factory o manualmente.
+
+    El parámetro opcional `modo` (incremental | completo) sobreescribe el modo
+    configurado en SCHEDULER_MODO_INCREMENTAL; `modo=completo` fuerza una reconciliación.
+
+    Si ya hay una ejecución en curso (de esta función o del endpoint de procesamiento)
+    responde 409; con `esperar=true` espera a que termine y responde con su resumen.
+
+    Responde con el resumen de la ejecución (sin el detalle por convocatoria), que incluye
+    en "instrumentacion" la duración, filas y consultas de cada etapa.
     """
     logging.info('ProcessScheduler function received a request.')
     
@@ -25,15 +36,30 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
     try:
         # Ejecutar la lógica principal
         logging.info("Iniciando ejecución del scheduler...")
-        run_postulacion_checker()
+        modo = req.params.get('modo')
+        opciones = {}
+        if modo in ("incremental", "completo"):
+            opciones["modo_incremental"] = modo == "incremental"
+        esperar = req.params.get('esperar')
+        if esperar is not None:
+            opciones["esperar"] = esperar.lower() in ("1", "true", "yes")
+        resultado = run_postulacion_checker(**opciones)
         logging.info("Scheduler ejecutado correctamente.")
         
         return func.HttpResponse(
-            "Scheduler executed successfully.",
+            json.dumps(resumen_sin_detalle(resultado), default=str),
             status_code=200,
             mimetype="application/json"
         )
         
+    except EjecucionEnCurso as e:
+        logging.info(str(e))
+        return func.HttpResponse(
+            json.dumps({"mensaje": str(e), "en_curso": True}),
+            status_code=409,
+            mimetype="application/json"
+        )
+
     except Exception as e:
         error_msg = f"Error crítico durante la ejecución del scheduler: {str(e)}"
         logging.error(error_msg, exc_info=True)
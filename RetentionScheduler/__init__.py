@@ -0,0 +1,42 @@
+import azure.functions as func
+import json
+import logging
+import os
+import sys
+
+# Ajustar el path para importar módulos desde la raíz
+root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_path not in sys.path:
+    sys.path.insert(0, root_path)
+
+from scheduler_script import run_retencion_notificaciones
+
+def main(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Azure Function HTTP Trigger para archivar las notificaciones antiguas.
+    Pensada para invocarse una vez al día (p. ej. desde Azure Data Factory), fuera de horario.
+
+    Con `simulacion=true` no se modifica nada: responde cuántas notificaciones se
+    archivarían, por tipo y estado de lectura.
+    """
+    logging.info('RetentionScheduler function received a request.')
+
+    try:
+        simulacion = req.params.get('simulacion', '').lower() in ("1", "true", "yes")
+        resultado = run_retencion_notificaciones(simulacion=simulacion)
+
+        return func.HttpResponse(
+            json.dumps(resultado, default=str),
+            status_code=200,
+            mimetype="application/json"
+        )
+
+    except Exception as e:
+        error_msg = f"Error crítico durante la retención de notificaciones: {str(e)}"
+        logging.error(error_msg, exc_info=True)
+
+        return func.HttpResponse(
+            error_msg,
+            status_code=500,
+            mimetype="application/json"
+        )
@@ -0,0 +1,102 @@
+"""
+Benchmark de arranque en frío del scheduler (Azure Function ProcessScheduler).
+
+Lanza un intérprete nuevo por repetición, como en un arranque en frío, y mide:
+importar scheduler_script, cargar los servicios y repositorios (primera invocación),
+crear el motor y completar la primera consulta. Además informa cuántos módulos quedan
+cargados y si se colaron dependencias que el scheduler no usa (FastAPI, dotenv, el
+motor de la API).
+
+Uso:
+    python -m benchmarks.bench_arranque_scheduler --repeticiones 10 --json bench_arranque.json
+    DATABASE_URL="mssql+pyodbc://..." python -m benchmarks.bench_arranque_scheduler
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que no deberían cargarse en el camino del scheduler
+NO_ESPERADOS = ("fastapi", "starlette", "dotenv", "src.config.db", "src.config.db_synapse", "src.routes")
+
+# Se ejecuta en el proceso hijo; imprime una línea JSON con las mediciones
+SONDA = f"""
+import json, sys, time
+t0 = time.perf_counter()
+import scheduler_script
+t1 = time.perf_counter()
+from src.services.postulacion_notificacion_service import PostulacionNotificacionService
+from src.repositories.notificacion_repo import NotificacionRepository
+from src.repositories.convocatoria_snapshot_repo import ConvocatoriaSnapshotRepository
+from src.repositories.analytic_repo import NotificacionAnalyticsRepository
+from src.config.esquema import asegurar_tablas_auxiliares
+t2 = time.perf_counter()
+from sqlalchemy import text
+with scheduler_script.get_engine().connect() as conn:
+    conn.execute(text("SELECT 1")).scalar()
+t3 = time.perf_counter()
+no_esperados = sorted({{m for m in sys.modules if m.startswith({NO_ESPERADOS!r})}})
+print(json.dumps({{
+    "import_scheduler_ms": (t1 - t0) * 1000,
+    "import_servicios_ms": (t2 - t1) * 1000,
+    "primera_consulta_ms": (t3 - t2) * 1000,
+    "total_ms": (t3 - t0) * 1000,
+    "modulos": len(sys.modules),
+    "no_esperados": no_esperados,
+}}))
+"""
+
+
+def ejecutar_sonda(database_url: str) -> dict:
+    entorno = {**os.environ, "DATABASE_URL": database_url}
+    salida = subprocess.run(
+        [sys.executable, "-c", SONDA],
+        cwd=RAIZ, env=entorno, capture_output=True, text=True, check=True
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--json", help="Guardar los resultados en este archivo")
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL") or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_arranque.db')}"
+
+    # Una ejecución previa descartada: compila los .pyc como haría el primer despliegue
+    ejecutar_sonda(database_url)
+    muestras = [ejecutar_sonda(database_url) for _ in range(args.repeticiones)]
+
+    metricas = ("import_scheduler_ms", "import_servicios_ms", "primera_consulta_ms", "total_ms")
+    resumen = {
+        metrica: {
+            "mediana": round(statistics.median(m[metrica] for m in muestras), 2),
+            "min": round(min(m[metrica] for m in muestras), 2),
+            "max": round(max(m[metrica] for m in muestras), 2),
+        }
+        for metrica in metricas
+    }
+    resumen["modulos"] = muestras[-1]["modulos"]
+    resumen["no_esperados"] = muestras[-1]["no_esperados"]
+
+    print(f"{'etapa':<24}{'mediana (ms)':>14}{'min':>10}{'max':>10}")
+    for metrica in metricas:
+        valores = resumen[metrica]
+        print(f"{metrica:<24}{valores['mediana']:>14.1f}{valores['min']:>10.1f}{valores['max']:>10.1f}")
+    print(f"\nMódulos cargados: {resumen['modulos']}")
+    if resumen["no_esperados"]:
+        print(f"ADVERTENCIA: se cargaron módulos que el scheduler no usa: {', '.join(resumen['no_esperados'])}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"repeticiones": args.repeticiones, "resumen": resumen, "muestras": muestras}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark de índices de la tabla notificaciones.
+
+Siembra una base SQLite local con millones de notificaciones, ejecuta las consultas
+calientes del NotificacionRepository sin índices y con los índices declarados en el
+modelo Notificacion, y reporta tiempos (mediana) y planes de ejecución.
+
+Uso:
+    python -m benchmarks.bench_indices_notificaciones --filas 2000000 --json bench_indices.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, text
+from sqlalchemy.schema import CreateTable
+from sqlmodel import select, or_, and_
+
+from src.models.notificacion import Notificacion
+from src.config.esquema import aplicar_indices_notificaciones
+
+TIPOS = ["NUEVA_POSTULACION", "MENSAJE", "RECORDATORIO", "SISTEMA"]
+
+
+def sembrar(engine, filas: int, usuarios: int, empresas: int, lote: int = 50_000) -> None:
+    """Crea la tabla sin índices y la llena con datos sintéticos"""
+    tabla = Notificacion.__table__  # type: ignore
+    with engine.begin() as conn:
+        conn.execute(CreateTable(tabla))
+
+    rnd = random.Random(42)
+    inicio = datetime(2024, 1, 1)
+    sql = (
+        "INSERT INTO notificaciones (id_usuario, id_empresa, tipo_notificacion, asunto, mensaje, "
+        "id_oferta, prioridad, datos_adicionales, leida, fecha_lectura, fecha_creacion) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for desde in range(0, filas, lote):
+            valores = []
+            for i in range(desde, min(desde + lote, filas)):
+                fecha = inicio + timedelta(seconds=i * 15)
+                # La mayoría de las notificaciones viejas ya están leídas
+                leida = rnd.random() < (0.95 if i < filas * 0.9 else 0.3)
+                valores.append((
+                    rnd.randrange(usuarios), rnd.randrange(empresas), rnd.choice(TIPOS),
+                    "Asunto de prueba", "Mensaje de prueba", rnd.randrange(100_000),
+                    str(rnd.randint(1, 3)), None, leida, fecha if leida else None, fecha,
+                ))
+            cursor.executemany(sql, valores)
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def consultas(usuario: int, empresa: int, cursor_fecha: datetime, limite: int = 50):
+    """Consultas equivalentes a las del NotificacionRepository"""
+    orden = (Notificacion.fecha_creacion.desc(), Notificacion.id_notificacion.desc())  # type: ignore
+    despues_de = and_(
+        Notificacion.fecha_creacion <= cursor_fecha,
+        or_(Notificacion.fecha_creacion < cursor_fecha, Notificacion.id_notificacion < 10**12),  # type: ignore
+    )
+    return {
+        "get_no_leidas_by_usuario": select(Notificacion)
+            .where(Notificacion.id_usuario == usuario, Notificacion.leida == False)
+            .order_by(Notificacion.fecha_creacion.desc()),
+        "get_no_leidas_by_empresa": select(Notificacion)
+            .where(Notificacion.id_empresa == empresa, Notificacion.leida == False)
+            .order_by(Notificacion.fecha_creacion.desc()),
+        "pagina_usuario": select(Notificacion)
+            .where(Notificacion.id_usuario == usuario).order_by(*orden).limit(limite + 1),
+        "pagina_empresa_profunda": select(Notificacion)
+            .where(Notificacion.id_empresa == empresa, despues_de).order_by(*orden).limit(limite + 1),
+        "list_all_pagina": select(Notificacion).order_by(*orden).limit(limite + 1),
+        "no_leidas_pagina": select(Notificacion)
+            .where(Notificacion.leida == False).order_by(*orden).limit(limite + 1),
+        "conteo_no_leidas_usuario": select(
+                Notificacion.tipo_notificacion, Notificacion.prioridad, func.count()
+            )
+            .where(Notificacion.id_usuario == usuario, Notificacion.leida == False)
+            .group_by(Notificacion.tipo_notificacion, Notificacion.prioridad),
+    }
+
+
+def plan(conn, stmt) -> list[str]:
+    compilado = stmt.compile(dialect=conn.dialect)
+    params = tuple(compilado.params[nombre] for nombre in compilado.positiontup)
+    filas = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compilado.string}", params).all()
+    return [fila[-1] for fila in filas]
+
+
+def medir(engine, stmts: dict, repeticiones: int) -> dict:
+    resultados = {}
+    with engine.connect() as conn:
+        for nombre, stmt in stmts.items():
+            tiempos = []
+            for _ in range(repeticiones):
+                t0 = time.perf_counter()
+                filas = conn.execute(stmt).all()
+                tiempos.append((time.perf_counter() - t0) * 1000)
+            resultados[nombre] = {
+                "mediana_ms": round(statistics.median(tiempos), 3),
+                "filas": len(filas),
+                "plan": plan(conn, stmt),
+            }
+    return resultados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=2_000_000)
+    parser.add_argument("--usuarios", type=int, default=20_000)
+    parser.add_argument("--empresas", type=int, default=2_000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--db", help="Ruta del archivo SQLite (por defecto uno temporal)")
+    parser.add_argument("--json", help="Guardar los resultados en este archivo")
+    args = parser.parse_args()
+
+    ruta = args.db or os.path.join(tempfile.mkdtemp(), "bench_notificaciones.db")
+    if os.path.exists(ruta):
+        os.remove(ruta)
+    engine = create_engine(f"sqlite:///{ruta}")
+
+    t0 = time.perf_counter()
+    sembrar(engine, args.filas, args.usuarios, args.empresas)
+    print(f"Sembradas {args.filas} filas en {time.perf_counter() - t0:.1f}s ({ruta})")
+
+    cursor_fecha = datetime(2024, 1, 1) + timedelta(seconds=args.filas * 15 // 2)
+    stmts = consultas(usuario=7, empresa=3, cursor_fecha=cursor_fecha)
+
+    sin_indices = medir(engine, stmts, args.repeticiones)
+
+    t0 = time.perf_counter()
+    creados = aplicar_indices_notificaciones(engine)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    print(f"Índices creados en {time.perf_counter() - t0:.1f}s: {', '.join(creados)}")
+
+    con_indices = medir(engine, stmts, args.repeticiones)
+
+    print(f"\n{'consulta':<28}{'sin índices (ms)':>18}{'con índices (ms)':>18}{'mejora':>10}")
+    for nombre in stmts:
+        antes = sin_indices[nombre]["mediana_ms"]
+        despues = con_indices[nombre]["mediana_ms"]
+        mejora = f"{antes / despues:.0f}x" if despues else "-"
+        print(f"{nombre:<28}{antes:>18.2f}{despues:>18.2f}{mejora:>10}")
+        print(f"    plan sin índices: {' | '.join(sin_indices[nombre]['plan'])}")
+        print(f"    plan con índices: {' | '.join(con_indices[nombre]['plan'])}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"filas": args.filas, "sin_indices": sin_indices, "con_indices": con_indices}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Benchmark de punta a punta de PostulacionNotificacionService.procesar_nuevas_postulaciones.
+
+Usa dos archivos SQLite locales: uno hace de Synapse (tabla con la forma de la vista
+postulados_por_convocatoria_python) y otro de Azure SQL (tablas de los modelos). Por cada
+tamaño siembra la vista, hace la carga inicial (todas las convocatorias son nuevas) y
+guarda esa base. Luego, por cada proporción de cambios y modo, parte de una copia de la
+base, incrementa el total de postulados de esa fracción de convocatorias y mide una
+ejecución del proceso en un proceso hijo nuevo (memoria pico sin contaminar).
+
+Reporta tiempo total, tiempo y consultas por etapa, filas escritas y memoria pico.
+
+Uso:
+    python -m benchmarks.bench_pipeline_postulaciones --tamanos 1000,100000,1000000 \\
+        --cambios 0.01,0.1 --modos completo,incremental --json bench_pipeline.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlmodel import SQLModel, Session
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VISTA = "postulados_por_convocatoria_python"
+FECHA_BASE = datetime(2024, 1, 1)
+
+
+def _motor(ruta: str):
+    from src.config.pool import crear_motor
+
+    # crear_motor activa WAL en SQLite, como en las pruebas locales de la API
+    return crear_motor(f"sqlite:///{ruta}", os.path.basename(ruta), "BENCH")
+
+
+def sembrar_vista(ruta: str, convocatorias: int, empresas: int, semilla: int, lote: int = 50_000) -> None:
+    """Crea la tabla que hace de vista de Synapse y la llena con datos sintéticos"""
+    engine = _motor(ruta)
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE TABLE {VISTA} (id_empresa INTEGER, id_convocatoria INTEGER PRIMARY KEY, "
+            "titulo TEXT, total_postulados INTEGER, fecha_ultima_postulacion TIMESTAMP)"
+        ))
+        conn.execute(text(f"CREATE INDEX ix_vista_fecha ON {VISTA} (fecha_ultima_postulacion)"))
+
+    rnd = random.Random(semilla)
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for desde in range(0, convocatorias, lote):
+            cursor.executemany(
+                f"INSERT INTO {VISTA} VALUES (?, ?, ?, ?, ?)",
+                [
+                    (rnd.randrange(empresas), i, f"Convocatoria {i}", rnd.randint(0, 50), FECHA_BASE)
+                    for i in range(desde, min(desde + lote, convocatorias))
+                ]
+            )
+        raw.commit()
+    finally:
+        raw.close()
+    engine.dispose()
+
+
+def aplicar_cambios(ruta: str, convocatorias: int, proporcion: float, semilla: int) -> int:
+    """Suma postulaciones a una fracción aleatoria de convocatorias y marca su fecha de cambio"""
+    rnd = random.Random(semilla)
+    cambiadas = rnd.sample(range(convocatorias), int(convocatorias * proporcion))
+    fecha = datetime.utcnow() + timedelta(hours=1)
+
+    engine = _motor(ruta)
+    raw = engine.raw_connection()
+    try:
+        raw.cursor().executemany(
+            f"UPDATE {VISTA} SET total_postulados = total_postulados + ?, "
+            "fecha_ultima_postulacion = ? WHERE id_convocatoria = ?",
+            [(rnd.randint(1, 5), fecha, id_conv) for id_conv in cambiadas]
+        )
+        raw.commit()
+    finally:
+        raw.close()
+    engine.dispose()
+    return len(cambiadas)
+
+
+def ejecutar_pipeline(ruta_principal: str, ruta_synapse: str, modo_incremental: bool,
+                      tamano_bloque: int, medir_memoria: bool) -> dict:
+    """Una ejecución de procesar_nuevas_postulaciones (corre en un proceso hijo)"""
+    from src.services.postulacion_notificacion_service import PostulacionNotificacionService
+    from src.repositories.notificacion_repo import NotificacionRepository
+    from src.repositories.convocatoria_snapshot_repo import ConvocatoriaSnapshotRepository
+    from src.repositories.analytic_repo import NotificacionAnalyticsRepository
+    import src.models  # noqa: F401  registra todas las tablas en el metadata
+
+    principal = _motor(ruta_principal)
+    synapse = _motor(ruta_synapse)
+    SQLModel.metadata.create_all(principal)
+
+    if medir_memoria:
+        tracemalloc.start()
+
+    with Session(principal) as session, Session(synapse) as session_synapse:
+        notificacion_repo = NotificacionRepository(session)
+        snapshot_repo = ConvocatoriaSnapshotRepository(session)
+        analytics_repo = NotificacionAnalyticsRepository(session_synapse)
+        service = PostulacionNotificacionService(
+            notificacion_repo, snapshot_repo, analytics_repo, tamano_bloque=tamano_bloque
+        )
+
+        inicio = time.perf_counter()
+        resumen = service.procesar_nuevas_postulaciones(session, modo_incremental=modo_incremental)
+        total = time.perf_counter() - inicio
+
+    memoria_python = tracemalloc.get_traced_memory()[1] if medir_memoria else None
+    if medir_memoria:
+        tracemalloc.stop()
+    principal.dispose()
+    synapse.dispose()
+
+    resumen.pop("detalle", None)
+    # Etapas medidas por el propio servicio; "otros" es lo que queda fuera de ellas
+    instrumentacion = resumen.pop("instrumentacion")
+    etapas = {
+        etapa: {"tiempo_s": round(datos["duracion_ms"] / 1000, 4), "consultas": datos["consultas"], "filas": datos["filas"]}
+        for etapa, datos in instrumentacion["etapas"].items()
+    }
+    etapas["otros"] = {
+        "tiempo_s": round(total - sum(e["tiempo_s"] for e in etapas.values()), 4),
+        "consultas": instrumentacion["consultas_totales"] - sum(e["consultas"] for e in etapas.values()),
+        "filas": 0
+    }
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "tiempo_total_s": round(total, 4),
+        "etapas": etapas,
+        "consultas_totales": instrumentacion["consultas_totales"],
+        "filas_escritas": {
+            "notificaciones": resumen.get("notificaciones_creadas", 0),
+            "snapshots_insertados": resumen.get("snapshots_insertados", 0),
+            "snapshots_actualizados": resumen.get("snapshots_actualizados", 0),
+        },
+        "memoria_pico_mb": {
+            "rss_proceso": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor, 1),
+            "python_tracemalloc": round(memoria_python / 1024 / 1024, 1) if memoria_python is not None else None,
+        },
+        "resumen": resumen,
+    }
+
+
+def _en_proceso_nuevo(funcion, *args):
+    contexto = multiprocessing.get_context("spawn")
+    with contexto.Pool(1) as pool:
+        return pool.apply(funcion, args)
+
+
+def _eliminar_base(ruta: str) -> None:
+    for sufijo in ("", "-wal", "-shm"):
+        if os.path.exists(ruta + sufijo):
+            os.remove(ruta + sufijo)
+
+
+def _copiar_base(origen: str, destino: str) -> None:
+    """Copia un archivo SQLite junto con su WAL"""
+    _eliminar_base(destino)
+    for sufijo in ("", "-wal", "-shm"):
+        if os.path.exists(origen + sufijo):
+            shutil.copyfile(origen + sufijo, destino + sufijo)
+
+
+def _commit_actual() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanos", default="1000,100000,1000000", help="Convocatorias por escenario")
+    parser.add_argument("--cambios", default="0.01,0.1", help="Proporciones de convocatorias con nuevas postulaciones")
+    parser.add_argument("--modos", default="completo,incremental")
+    parser.add_argument("--empresas", type=int, default=2_000)
+    parser.add_argument("--tamano-bloque", type=int, default=5_000)
+    parser.add_argument("--tracemalloc", action="store_true", help="Medir también el pico de memoria de Python (más lento)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--dir", help="Directorio de trabajo (por defecto uno temporal)")
+    parser.add_argument("--json", help="Guardar los resultados en este archivo")
+    args = parser.parse_args()
+
+    tamanos = [int(t) for t in args.tamanos.split(",")]
+    cambios = [float(c) for c in args.cambios.split(",")]
+    modos = args.modos.split(",")
+    directorio = args.dir or tempfile.mkdtemp(prefix="bench_pipeline_")
+    os.makedirs(directorio, exist_ok=True)
+
+    resultados = []
+    for tamano in tamanos:
+        base_synapse = os.path.join(directorio, f"synapse_{tamano}.db")
+        base_principal = os.path.join(directorio, f"principal_{tamano}.db")
+        _eliminar_base(base_synapse)
+        _eliminar_base(base_principal)
+
+        t0 = time.perf_counter()
+        sembrar_vista(base_synapse, tamano, args.empresas, args.semilla)
+        carga = _en_proceso_nuevo(ejecutar_pipeline, base_principal, base_synapse, False, args.tamano_bloque, False)
+        print(f"[{tamano} convocatorias] siembra y carga inicial en {time.perf_counter() - t0:.1f}s "
+              f"(proceso: {carga['tiempo_total_s']:.1f}s)")
+
+        for proporcion in cambios:
+            for modo in modos:
+                synapse = os.path.join(directorio, "synapse_trabajo.db")
+                principal = os.path.join(directorio, "principal_trabajo.db")
+                _copiar_base(base_synapse, synapse)
+                _copiar_base(base_principal, principal)
+                cambiadas = aplicar_cambios(synapse, tamano, proporcion, args.semilla + 1)
+
+                medicion = _en_proceso_nuevo(
+                    ejecutar_pipeline, principal, synapse, modo == "incremental", args.tamano_bloque, args.tracemalloc
+                )
+                resultados.append({
+                    "convocatorias": tamano,
+                    "proporcion_cambios": proporcion,
+                    "convocatorias_cambiadas": cambiadas,
+                    "modo": modo,
+                    "carga_inicial_s": carga["tiempo_total_s"],
+                    **medicion,
+                })
+                etapas = ", ".join(
+                    f"{etapa} {datos['tiempo_s']:.2f}s/{datos['consultas']}q"
+                    for etapa, datos in medicion["etapas"].items()
+                )
+                print(f"  cambios {proporcion:>6.1%} {modo:<12} total {medicion['tiempo_total_s']:>8.2f}s  "
+                      f"consultas {medicion['consultas_totales']:>6}  rss {medicion['memoria_pico_mb']['rss_proceso']:>7.1f}MB")
+                print(f"    {etapas}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "metadatos": {
+                    "commit": _commit_actual(),
+                    "fecha": datetime.utcnow().isoformat(),
+                    "python": platform.python_version(),
+                    "plataforma": platform.platform(),
+                },
+                "parametros": vars(args),
+                "resultados": resultados,
+            }, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
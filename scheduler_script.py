@@ -1,53 +1,132 @@
 import os
 import logging
-from sqlmodel import create_engine, Session
-from typing import Generator
+import threading
+from typing import TYPE_CHECKING, Generator, Optional
 
 # Configuración básica del logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# --- AJUSTA ESTAS IMPORTACIONES SEGÚN LA UBICACIÓN DE TUS ARCHIVOS ---
-# Asume que el handler de Azure Function ajusta el sys.path para encontrar src/
-from src.services.postulacion_notificacion_service import PostulacionNotificacionService
-from src.repositories.notificacion_repo import NotificacionRepository
-from src.repositories.convocatoria_snapshot_repo import ConvocatoriaSnapshotRepository
-from src.repositories.analytic_repo import NotificacionAnalyticsRepository
-# ----------------------------------------------------------------------
+# Solo configuración liviana (variables de entorno) al importar. SQLModel, los servicios
+# y los repositorios se importan en el primer uso: el arranque en frío de la Azure Function
+# no carga FastAPI, dotenv ni el motor de la API, que el scheduler no usa.
+from src.config.scheduler import MODO_INCREMENTAL, NUM_SHARDS, SHARDS_EN_PROCESOS, ESPERAR_EN_CURSO
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlmodel import Session
 
 # 1. Configuración de la base de datos (Lee la cadena de conexión de Azure Settings)
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
-if not DATABASE_URL:
-    logger.error("La variable de entorno DATABASE_URL no está configurada.")
-    # En un entorno de producción, esto debería levantar una excepción
-    raise EnvironmentError("Falta la configuración de DATABASE_URL.")
+# Un único motor por proceso, creado en la primera invocación y reutilizado en caliente
+_engine: Optional["Engine"] = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> "Engine":
+    """Devuelve el motor del scheduler, creándolo en el primer uso."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                if not DATABASE_URL:
+                    logger.error("La variable de entorno DATABASE_URL no está configurada.")
+                    raise EnvironmentError("Falta la configuración de DATABASE_URL.")
+
+                from src.config.pool import crear_motor
 
-# Crea el motor de SQLAlchemy
-engine = create_engine(DATABASE_URL)
+                # fast_executemany solo aplica a pyodbc (SQL Server); acelera los upserts masivos
+                engine_kwargs = {"fast_executemany": True} if DATABASE_URL.startswith("mssql+pyodbc") else {}
+                # El pool se configura con las variables SCHEDULER_POOL_* / DB_POOL_* (ver src/config/pool.py)
+                _engine = crear_motor(DATABASE_URL, "scheduler", "SCHEDULER", **engine_kwargs)
+    return _engine
 
-def get_db_session() -> Generator[Session, None, None]:
+def crear_sesion() -> "Session":
+    """Crea una sesión independiente; es de módulo para poder usarse desde otros procesos."""
+    from sqlmodel import Session
+
+    return Session(get_engine())
+
+def get_db_session() -> Generator["Session", None, None]:
     """Generador que proporciona una sesión de base de datos."""
     # El Session(engine) actúa como context manager para asegurar el cierre.
-    with Session(engine) as session:
+    with crear_sesion() as session:
         yield session
 
-def run_postulacion_checker():
-    """Ejecuta la lógica de verificación y creación de notificaciones."""
-    logger.info("Iniciando verificación programada de postulaciones...")
+_tablas_verificadas = False
+
+def resumen_sin_detalle(resultado: dict) -> dict:
+    """El resumen sin el detalle por convocatoria, que puede tener miles de entradas"""
+    return {clave: valor for clave, valor in resultado.items() if clave != "detalle"}
+
+def run_postulacion_checker(modo_incremental: bool = MODO_INCREMENTAL, esperar: bool = ESPERAR_EN_CURSO):
+    """
+    Ejecuta la lógica de verificación y creación de notificaciones.
+
+    Solo corre una ejecución a la vez entre la Azure Function y el endpoint de
+    procesamiento (lease en la base de datos).
+
+    Args:
+        modo_incremental: Solo procesar lo modificado desde la última ejecución.
+            Con False se fuerza una reconciliación completa.
+        esperar: Si ya hay una ejecución en curso, esperar y devolver su resumen
+            en lugar de lanzar EjecucionEnCurso
+
+    Returns:
+        Resumen de la ejecución, con la instrumentación por etapa
+    """
+    from src.services.ejecucion_exclusiva import EjecucionExclusiva
+    from src.services.postulacion_notificacion_service import PROCESO_POSTULACIONES
+    from src.config.esquema import asegurar_tablas_auxiliares
+
+    global _tablas_verificadas
+    logger.info(f"Iniciando verificación programada de postulaciones (incremental={modo_incremental})...")
+    
+    # Las tablas auxiliares se verifican una vez por proceso (no en cada invocación en caliente)
+    if not _tablas_verificadas:
+        asegurar_tablas_auxiliares(get_engine())
+        _tablas_verificadas = True
     
-    # 2. Obtiene la sesión principal para la ejecución de la tarea
+    exclusiva = EjecucionExclusiva(crear_sesion, PROCESO_POSTULACIONES)
+    return exclusiva.ejecutar(lambda: _procesar_postulaciones(modo_incremental), esperar=esperar)
+
+def _procesar_postulaciones(modo_incremental: bool):
+    """Ejecución del proceso de postulaciones, con el lease ya tomado"""
+    from src.services.postulacion_notificacion_service import (
+        PostulacionNotificacionService,
+        procesar_postulaciones_en_paralelo
+    )
+    from src.repositories.notificacion_repo import NotificacionRepository
+    from src.repositories.convocatoria_snapshot_repo import ConvocatoriaSnapshotRepository
+    from src.repositories.analytic_repo import NotificacionAnalyticsRepository
+
+    if NUM_SHARDS > 1:
+        # Cada shard abre sus propias sesiones (la fuente analítica usa el mismo engine)
+        resultado = procesar_postulaciones_en_paralelo(
+            crear_sesion,
+            crear_sesion,
+            num_shards=NUM_SHARDS,
+            en_procesos=SHARDS_EN_PROCESOS,
+            modo_incremental=modo_incremental
+        )
+        logger.info(f"Tarea completada en {NUM_SHARDS} shards. Resultado: {resumen_sin_detalle(resultado)}")
+        return resultado
+    
+    # 2. Obtiene la sesión principal para la ejecución de la tarea y una sesión
+    # aparte para la lectura analítica, que se consume en streaming mientras se escribe
     session_generator = get_db_session()
+    analytics_session_generator = get_db_session()
     
     try:
         session = next(session_generator)
+        analytics_session = next(analytics_session_generator)
         
         # 3. Inicializa los repositorios
         # NOTA: NotificacionRepository NO recibe la sesión aquí, ya que su método create_
         # gestiona su propia sesión para transacciones aisladas.
         notificacion_repo = NotificacionRepository(session=session)
         snapshot_repo = ConvocatoriaSnapshotRepository(session=session)
-        analytics_repo = NotificacionAnalyticsRepository(session=session)
+        analytics_repo = NotificacionAnalyticsRepository(session=analytics_session)
 
         service = PostulacionNotificacionService(
             notificacion_repo=notificacion_repo,
@@ -57,23 +136,59 @@ def run_postulacion_checker():
         
         # 4. Ejecuta el proceso de negocio.
         # La sesión 'session' solo se usa aquí para los repositorios inyectados 
-        # (snapshot y analytics).
-        resultado = service.procesar_nuevas_postulaciones(session)
+        # (notificaciones y snapshot).
+        resultado = service.procesar_nuevas_postulaciones(session, modo_incremental=modo_incremental)
         
-        logger.info(f"Tarea completada. Resultado: {resultado}")
+        logger.info(f"Tarea completada. Resultado: {resumen_sin_detalle(resultado)}")
+        return resultado
         
-    except StopIteration:
+    except StopIteration as e:
         logger.error("Error al iniciar la sesión de base de datos.")
+        # Sin resumen que devolver: quien invoca (lease, Azure Function) recibe el error
+        raise RuntimeError("No se pudo iniciar la sesión de base de datos.") from e
     except Exception as e:
         logger.error(f"Error crítico en el checker: {e}")
         # Re-lanza la excepción para que el handler de Azure Function capture el error 500
         raise e
     finally:
-        # Asegura el cierre correcto del generador
+        # Asegura el cierre correcto de los generadores
+        for generator in (analytics_session_generator, session_generator):
+            try:
+                next(generator)
+            except StopIteration:
+                pass
+
+def run_retencion_notificaciones(simulacion: bool = False):
+    """
+    Archiva las notificaciones antiguas según la retención configurada (RETENCION_*).
+
+    Args:
+        simulacion: Solo informar cuántas notificaciones se archivarían, sin modificar nada
+
+    Returns:
+        Resumen de la ejecución, con la instrumentación por etapa
+    """
+    from src.services.retencion_service import RetencionNotificacionesService
+    from src.repositories.retencion_repo import RetencionNotificacionesRepository
+    from src.config.esquema import asegurar_tablas_auxiliares
+
+    global _tablas_verificadas
+    logger.info(f"Iniciando retención de notificaciones (simulacion={simulacion})...")
+
+    if not _tablas_verificadas:
+        asegurar_tablas_auxiliares(get_engine())
+        _tablas_verificadas = True
+
+    with crear_sesion() as session:
         try:
-            next(session_generator)
-        except StopIteration:
-            pass
+            service = RetencionNotificacionesService(RetencionNotificacionesRepository(session))
+            resultado = service.archivar_antiguas(simulacion=simulacion)
+        except Exception as e:
+            logger.error(f"Error crítico en la retención de notificaciones: {e}")
+            raise e
+
+    logger.info(f"Retención completada. Resultado: {resumen_sin_detalle(resultado)}")
+    return resultado
 
 # NOTA: Se elimina el bloque if __name__ == "__main__": 
 # para que el script no se ejecute automáticamente al ser importado por la Azure Function,
@@ -0,0 +1,92 @@
+import pickle
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+class CacheBackend(ABC):
+    """
+    Interfaz mínima de almacenamiento clave-valor con expiración.
+    Cualquier almacén externo (Redis, Memcached, ...) se integra implementando estos métodos.
+    """
+
+    @abstractmethod
+    def get(self, clave: str) -> Optional[Any]:
+        """Devuelve el valor o None si no existe o expiró"""
+
+    @abstractmethod
+    def set(self, clave: str, valor: Any, ttl: Optional[float] = None) -> None:
+        """Guarda el valor; con ttl=None no expira por tiempo"""
+
+    @abstractmethod
+    def delete(self, clave: str) -> None:
+        """Elimina la clave si existe"""
+
+    def tamano(self) -> Optional[int]:
+        """Cantidad de entradas, si el backend puede informarla"""
+        return None
+
+class LRUCacheTTL(CacheBackend):
+    """
+    Caché en proceso acotada por cantidad de entradas (se descarta la menos usada)
+    y por tiempo de vida. Segura para hilos.
+    """
+
+    def __init__(self, max_entradas: int = 10000):
+        self.max_entradas = max(1, max_entradas)
+        self._datos: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave: str) -> Optional[Any]:
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return None
+            valor, expira = entrada
+            if expira is not None and expira <= time.monotonic():
+                del self._datos[clave]
+                return None
+            self._datos.move_to_end(clave)
+            return valor
+
+    def set(self, clave: str, valor: Any, ttl: Optional[float] = None) -> None:
+        expira = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._datos[clave] = (valor, expira)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+
+    def delete(self, clave: str) -> None:
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def tamano(self) -> Optional[int]:
+        return len(self._datos)
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend externo sobre Redis, compartido por todas las instancias de la API y el scheduler.
+    El paquete redis solo se necesita si se elige este backend.
+    """
+
+    def __init__(self, url: str, prefijo: str = "notificaciones:"):
+        import redis  # dependencia opcional
+
+        self.cliente = redis.Redis.from_url(url)
+        self.prefijo = prefijo
+
+    def get(self, clave: str) -> Optional[Any]:
+        valor = self.cliente.get(self.prefijo + clave)
+        return pickle.loads(valor) if valor is not None else None
+
+    def set(self, clave: str, valor: Any, ttl: Optional[float] = None) -> None:
+        self.cliente.set(
+            self.prefijo + clave,
+            pickle.dumps(valor),
+            px=int(ttl * 1000) if ttl is not None else None
+        )
+
+    def delete(self, clave: str) -> None:
+        self.cliente.delete(self.prefijo + clave)
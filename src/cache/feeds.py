@@ -0,0 +1,161 @@
+import threading
+from uuid import uuid4
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple, TypeVar
+from .backends import CacheBackend, LRUCacheTTL, RedisCacheBackend
+from ..repositories.contador_no_leidas_repo import AMBITO_USUARIO, AMBITO_EMPRESA
+from ..config.cache import (
+    CACHE_FEEDS_HABILITADO,
+    CACHE_FEEDS_BACKEND,
+    CACHE_FEEDS_MAX_ENTRADAS,
+    CACHE_FEEDS_TTL_SEGUNDOS,
+    CACHE_FEEDS_REDIS_URL
+)
+
+T = TypeVar("T")
+
+class CacheFeedsNotificaciones:
+    """
+    Caché de lectura (read-through) de las páginas de los feeds por usuario y por empresa.
+
+    Cada destinatario (ámbito, id) tiene un token de versión; las páginas se guardan bajo
+    una clave que incluye ese token. Invalidar un destinatario es reemplazar su token, así
+    todas sus páginas dejan de ser alcanzables sin recorrer el almacén y sin depender de
+    borrados por prefijo. Si el token se pierde (expulsión del LRU) se genera uno nuevo,
+    por lo que nunca reaparecen páginas viejas.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: Optional[float] = CACHE_FEEDS_TTL_SEGUNDOS,
+        habilitado: bool = True
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.habilitado = habilitado
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+
+    def obtener(self, ambito: str, id_ambito: int, pagina: Tuple[Any, ...], cargar: Callable[[], T]) -> T:
+        """
+        Devuelve la página cacheada o la carga con `cargar` y la guarda.
+
+        Args:
+            ambito: AMBITO_USUARIO o AMBITO_EMPRESA
+            id_ambito: ID del usuario o de la empresa
+            pagina: Parámetros que identifican la página dentro del feed (limit, cursor)
+            cargar: Función que lee la página de la base de datos
+        """
+        if not self.habilitado:
+            return cargar()
+
+        clave, valor = self._leer(ambito, id_ambito, pagina)
+        if valor is None:
+            valor = cargar()
+            self.backend.set(clave, valor, self.ttl)
+        return valor
+
+    async def obtener_async(
+        self,
+        ambito: str,
+        id_ambito: int,
+        pagina: Tuple[Any, ...],
+        cargar: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Versión de obtener para cargas asíncronas"""
+        if not self.habilitado:
+            return await cargar()
+
+        clave, valor = self._leer(ambito, id_ambito, pagina)
+        if valor is None:
+            valor = await cargar()
+            self.backend.set(clave, valor, self.ttl)
+        return valor
+
+    def invalidar(self, ambito: str, id_ambito: int) -> None:
+        """Descarta todas las páginas cacheadas de un destinatario"""
+        if not self.habilitado:
+            return
+        self.backend.set(self._clave_version(ambito, id_ambito), uuid4().hex)
+        self._contar("invalidaciones")
+
+    def invalidar_destinatarios(self, destinatarios: Iterable[Tuple[Optional[int], Optional[int]]]) -> None:
+        """Invalida los feeds de usuario y de empresa de cada par (id_usuario, id_empresa)"""
+        usuarios, empresas = set(), set()
+        for id_usuario, id_empresa in destinatarios:
+            if id_usuario is not None:
+                usuarios.add(id_usuario)
+            if id_empresa is not None:
+                empresas.add(id_empresa)
+
+        for id_usuario in usuarios:
+            self.invalidar(AMBITO_USUARIO, id_usuario)
+        for id_empresa in empresas:
+            self.invalidar(AMBITO_EMPRESA, id_empresa)
+
+    def invalidar_notificaciones(self, notificaciones: Iterable[Any]) -> None:
+        """Invalida los feeds afectados por un conjunto de notificaciones escritas"""
+        self.invalidar_destinatarios((n.id_usuario, n.id_empresa) for n in notificaciones)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        consultas = self.aciertos + self.fallos
+        return {
+            "habilitado": self.habilitado,
+            "backend": type(self.backend).__name__,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0,
+            "invalidaciones": self.invalidaciones,
+            "entradas": self.backend.tamano()
+        }
+
+    def _leer(self, ambito: str, id_ambito: int, pagina: Tuple[Any, ...]) -> Tuple[str, Optional[Any]]:
+        # La versión se lee antes de cargar: si se invalida durante la carga, la página
+        # queda guardada bajo la versión anterior y ya no es alcanzable
+        clave = self._clave_pagina(ambito, id_ambito, pagina)
+        valor = self.backend.get(clave)
+        self._contar("aciertos" if valor is not None else "fallos")
+        return clave, valor
+
+    def _contar(self, contador: str) -> None:
+        with self._lock:
+            setattr(self, contador, getattr(self, contador) + 1)
+
+    def _clave_version(self, ambito: str, id_ambito: int) -> str:
+        return f"feed-version:{ambito}:{id_ambito}"
+
+    def _clave_pagina(self, ambito: str, id_ambito: int, pagina: Tuple[Any, ...]) -> str:
+        clave_version = self._clave_version(ambito, id_ambito)
+        version = self.backend.get(clave_version)
+        if version is None:
+            version = uuid4().hex
+            self.backend.set(clave_version, version)
+        return f"feed:{ambito}:{id_ambito}:{version}:" + ":".join(str(p) for p in pagina)
+
+_cache_feeds: Optional[CacheFeedsNotificaciones] = None
+_cache_lock = threading.Lock()
+
+def get_cache_feeds() -> CacheFeedsNotificaciones:
+    """
+    Devuelve la caché de feeds del proceso, creándola en el primer uso según la configuración.
+    Con el backend en memoria, las escrituras de otro proceso (otra instancia o la Azure
+    Function del scheduler) solo se ven al expirar el TTL; con Redis se ven de inmediato.
+    """
+    global _cache_feeds
+    if _cache_feeds is None:
+        with _cache_lock:
+            if _cache_feeds is None:
+                if CACHE_FEEDS_BACKEND == "redis":
+                    backend: CacheBackend = RedisCacheBackend(CACHE_FEEDS_REDIS_URL)
+                else:
+                    backend = LRUCacheTTL(CACHE_FEEDS_MAX_ENTRADAS)
+                _cache_feeds = CacheFeedsNotificaciones(backend, CACHE_FEEDS_TTL_SEGUNDOS, CACHE_FEEDS_HABILITADO)
+    return _cache_feeds
+
+def configurar_cache_feeds(cache: CacheFeedsNotificaciones) -> None:
+    """Reemplaza la caché del proceso (p. ej. para usar otro backend externo)"""
+    global _cache_feeds
+    with _cache_lock:
+        _cache_feeds = cache
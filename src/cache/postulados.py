@@ -0,0 +1,143 @@
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional, Sequence, Tuple
+from ..dto.postulacion_dto import ConvocatoriaPostuladosRow
+from ..config.cache import CACHE_POSTULADOS_HABILITADO, CACHE_POSTULADOS_TTL_SEGUNDOS
+
+FilasPostulados = Tuple[ConvocatoriaPostuladosRow, ...]
+
+class _Carga:
+    """Lectura de la vista en curso, compartida por los llamadores que llegan mientras tanto"""
+
+    __slots__ = ("evento", "filas", "error", "generacion")
+
+    def __init__(self, generacion: int):
+        self.evento = threading.Event()
+        self.filas: Optional[FilasPostulados] = None
+        self.error: Optional[BaseException] = None
+        self.generacion = generacion
+
+
+class CachePostulados:
+    """
+    Caché en proceso, con TTL, del resultado completo de la vista de postulados de Synapse
+    (registros compactos ordenados por id_convocatoria).
+
+    Las lecturas concurrentes con la caché vacía o vencida comparten una sola consulta
+    (single-flight). Invalidar descarta el contenido y también el resultado de una
+    lectura que esté en curso en ese momento, que igual se entrega a quienes la esperaban.
+    """
+
+    def __init__(self, ttl: float = CACHE_POSTULADOS_TTL_SEGUNDOS, habilitado: bool = True):
+        self.ttl = ttl
+        self.habilitado = habilitado
+        self._lock = threading.Lock()
+        self._filas: Optional[FilasPostulados] = None
+        self._cargado_en: Optional[datetime] = None
+        self._expira = 0.0
+        self._generacion = 0
+        self._carga: Optional[_Carga] = None
+        self.aciertos = 0
+        self.fallos = 0
+        self.esperas = 0
+        self.invalidaciones = 0
+
+    def obtener(self, cargar: Callable[[], Sequence[ConvocatoriaPostuladosRow]]) -> FilasPostulados:
+        """
+        Devuelve las filas cacheadas o las lee con `cargar` (una sola lectura a la vez).
+
+        Args:
+            cargar: Función que lee la vista completa de Synapse
+        """
+        if not self.habilitado:
+            return tuple(cargar())
+
+        with self._lock:
+            if self._filas is not None and time.monotonic() < self._expira:
+                self.aciertos += 1
+                return self._filas
+            carga = self._carga
+            propia = carga is None
+            if propia:
+                self.fallos += 1
+                carga = self._carga = _Carga(self._generacion)
+            else:
+                self.esperas += 1
+
+        if not propia:
+            carga.evento.wait()
+            if carga.error is not None:
+                raise carga.error
+            return carga.filas
+
+        try:
+            cargado_en = datetime.utcnow()
+            carga.filas = tuple(cargar())
+            with self._lock:
+                # Si se invalidó durante la lectura, el resultado no se guarda
+                if carga.generacion == self._generacion:
+                    self._filas = carga.filas
+                    self._cargado_en = cargado_en
+                    self._expira = time.monotonic() + self.ttl
+            return carga.filas
+        except BaseException as e:
+            carga.error = e
+            raise
+        finally:
+            with self._lock:
+                self._carga = None
+            carga.evento.set()
+
+    def vigente(self) -> Optional[Tuple[FilasPostulados, datetime]]:
+        """
+        Filas cacheadas y la fecha en que se leyeron, solo si están vigentes. No lee la
+        vista: para quien prefiere su propia lectura en streaming antes que llenar la caché.
+        """
+        if not self.habilitado:
+            return None
+        with self._lock:
+            if self._filas is None or time.monotonic() >= self._expira:
+                return None
+            self.aciertos += 1
+            return self._filas, self._cargado_en
+
+    def invalidar(self) -> None:
+        """Descarta el contenido; la próxima lectura vuelve a consultar Synapse"""
+        with self._lock:
+            self._filas = None
+            self._cargado_en = None
+            self._generacion += 1
+            self.invalidaciones += 1
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "habilitada": self.habilitado,
+                "ttl_segundos": self.ttl,
+                "filas": len(self._filas) if self._filas is not None else 0,
+                "cargado_en": self._cargado_en,
+                "vigente": self._filas is not None and time.monotonic() < self._expira,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "esperas": self.esperas,
+                "invalidaciones": self.invalidaciones
+            }
+
+_cache_postulados: Optional[CachePostulados] = None
+_cache_lock = threading.Lock()
+
+def get_cache_postulados() -> CachePostulados:
+    """Devuelve la caché de postulados del proceso, creándola en el primer uso"""
+    global _cache_postulados
+    if _cache_postulados is None:
+        with _cache_lock:
+            if _cache_postulados is None:
+                _cache_postulados = CachePostulados(CACHE_POSTULADOS_TTL_SEGUNDOS, CACHE_POSTULADOS_HABILITADO)
+    return _cache_postulados
+
+def configurar_cache_postulados(cache: CachePostulados) -> None:
+    """Reemplaza la caché del proceso (p. ej. con otro TTL)"""
+    global _cache_postulados
+    with _cache_lock:
+        _cache_postulados = cache
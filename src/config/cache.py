@@ -0,0 +1,25 @@
+import os
+
+# Caché de lectura de los feeds de notificaciones por usuario y por empresa.
+# Se leen de las variables de entorno (App Settings en Azure).
+
+# Con False los feeds se leen siempre de la base de datos
+CACHE_FEEDS_HABILITADO = os.getenv("CACHE_FEEDS_HABILITADO", "true").lower() in ("1", "true", "yes")
+
+# Backend: "memoria" (LRU en proceso) o "redis" (almacén externo compartido entre instancias)
+CACHE_FEEDS_BACKEND = os.getenv("CACHE_FEEDS_BACKEND", "memoria").lower()
+
+# Cantidad máxima de entradas del LRU en proceso
+CACHE_FEEDS_MAX_ENTRADAS = int(os.getenv("CACHE_FEEDS_MAX_ENTRADAS", "10000"))
+
+# Vida de cada página cacheada. Con el backend en memoria y varias instancias es además
+# la cota de desactualización ante escrituras hechas por otra instancia o por el scheduler.
+CACHE_FEEDS_TTL_SEGUNDOS = float(os.getenv("CACHE_FEEDS_TTL_SEGUNDOS", "30"))
+
+# Conexión del backend externo
+CACHE_FEEDS_REDIS_URL = os.getenv("CACHE_FEEDS_REDIS_URL", "redis://localhost:6379/0")
+
+# Caché en proceso del resultado completo de la vista de postulados de Synapse, usada por
+# los endpoints de monitoreo (resumen de convocatorias, limpieza de snapshots)
+CACHE_POSTULADOS_HABILITADO = os.getenv("CACHE_POSTULADOS_HABILITADO", "true").lower() in ("1", "true", "yes")
+CACHE_POSTULADOS_TTL_SEGUNDOS = float(os.getenv("CACHE_POSTULADOS_TTL_SEGUNDOS", "300"))
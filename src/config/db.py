@@ -1,5 +1,5 @@
 import os
-from sqlmodel import create_engine
+from .pool import crear_motor
 from dotenv import load_dotenv
 
 dotenv_path = os.path.join(os.path.dirname(__file__), '../../.env')
@@ -14,5 +14,7 @@ SQLAZURE_DRIVER = os.getenv("AZURESQL_DRIVER") or ""
 
 db_connection_url = f"mssql+pyodbc://{SQLAZURE_USER}:{SQLAZURE_PASSWORD}@{SQLAZURE_SERVER}:{SQLAZURE_PORT}/{SQLAZURE_DB}?driver={SQLAZURE_DRIVER.replace(' ', '+')}"
 
-engine = create_engine(db_connection_url)
+# fast_executemany: los executemany de pyodbc (upserts y lotes) viajan en un solo envío.
+# El pool se configura con las variables AZURESQL_POOL_* / DB_POOL_* (ver config/pool.py).
+engine = crear_motor(db_connection_url, "azure_sql", "AZURESQL", fast_executemany=True)
 
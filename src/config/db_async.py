@@ -0,0 +1,44 @@
+import os
+from typing import Optional
+from urllib.parse import quote_plus
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from dotenv import load_dotenv
+from .pool import opciones_motor, preparar_motor
+
+dotenv_path = os.path.join(os.path.dirname(__file__), '../../.env')
+load_dotenv(dotenv_path)
+
+# URL completa del motor asíncrono. Si no se define se arma con las mismas credenciales
+# de Azure SQL usando aioodbc. Para pruebas locales: sqlite+aiosqlite:///./notificaciones.db
+ASYNC_DATABASE_URL = os.getenv("AZURESQL_ASYNC_URL")
+
+if not ASYNC_DATABASE_URL:
+    ASYNC_DATABASE_URL = (
+        f"mssql+aioodbc://{os.getenv('AZURESQL_USER')}:{os.getenv('AZURESQL_PASSWORD')}"
+        f"@{os.getenv('AZURESQL_SERVER')}:{os.getenv('AZURESQL_PORT')}/{os.getenv('AZURESQL_DB')}"
+        f"?driver={quote_plus(os.getenv('AZURESQL_DRIVER') or '')}"
+    )
+
+_async_engine: Optional[AsyncEngine] = None
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Devuelve el motor asíncrono, creándolo en el primer uso.
+    Se crea de forma diferida para que el driver (aioodbc / aiosqlite) solo
+    sea necesario cuando se usan las rutas asíncronas.
+    """
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,  # type: ignore
+            **opciones_motor(ASYNC_DATABASE_URL, "AZURESQL_ASYNC", asincrono=True)  # type: ignore
+        )
+        preparar_motor(_async_engine.sync_engine, "azure_sql_async")
+    return _async_engine
+
+async def dispose_async_engine() -> None:
+    """Cierra las conexiones del motor asíncrono si llegó a crearse"""
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
@@ -1,6 +1,6 @@
 import os
 from urllib.parse import quote_plus
-from sqlmodel import create_engine
+from .pool import crear_motor
 from dotenv import load_dotenv
 
 dotenv_path = os.path.join(os.path.dirname(__file__), '../../.env')
@@ -27,15 +27,20 @@ synapse_connection_url = (
     f"&Encrypt=yes&TrustServerCertificate=no&Connection+Timeout=30"
 )
 
-# Motor de Synapse con configuración optimizada
-synapse_engine = create_engine(
+# Motor de Synapse con configuración optimizada. Los valores de pool son los propios
+# de Synapse y se pueden ajustar con SYNAPSE_POOL_* / DB_POOL_* (ver config/pool.py).
+synapse_engine = crear_motor(
     synapse_connection_url,
+    "synapse",
+    "SYNAPSE",
+    defectos={
+        "pool_pre_ping": True,  # Verifica la conexión antes de usar
+        "pool_size": 10,  # Tamaño del pool de conexiones
+        "max_overflow": 20,  # Conexiones adicionales permitidas
+        "pool_recycle": 3600  # Reciclar conexiones cada hora
+    },
     echo=False,  # Cambiar a True para debug
-    pool_pre_ping=True,  # Verifica la conexión antes de usar
-    pool_size=10,  # Tamaño del pool de conexiones
-    max_overflow=20,  # Conexiones adicionales permitidas
-    pool_recycle=3600,  # Reciclar conexiones cada hora
     connect_args={
         "autocommit": True  # Importante para evitar problemas con transacciones en Synapse
     }
-)
\ No newline at end of file
+)
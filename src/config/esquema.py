@@ -0,0 +1,89 @@
+import argparse
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
+from sqlmodel import SQLModel, Session
+from ..models.marca_agua_scheduler import MarcaAguaScheduler
+from ..models.contador_no_leidas import ContadorNoLeidas
+from ..models.ejecucion_scheduler import EjecucionScheduler
+from ..models.notificacion_archivada import NotificacionArchivada
+from ..models.lease_proceso import LeaseProceso
+from ..models.trabajo_procesamiento import TrabajoProcesamiento
+from ..models.notificacion import Notificacion
+from ..repositories.contador_no_leidas_repo import ContadorNoLeidasRepository
+
+# Tablas auxiliares del servicio (scheduler, contadores, archivo, trabajos); se crean si no existen
+TABLAS_AUXILIARES = [
+    MarcaAguaScheduler.__table__,  # type: ignore
+    ContadorNoLeidas.__table__,  # type: ignore
+    EjecucionScheduler.__table__,  # type: ignore
+    NotificacionArchivada.__table__,  # type: ignore
+    LeaseProceso.__table__,  # type: ignore
+    TrabajoProcesamiento.__table__,  # type: ignore
+]
+
+def asegurar_tablas_auxiliares(engine: Engine) -> None:
+    """
+    Crea las tablas auxiliares que todavía no existan.
+    Si la tabla de contadores es nueva, se carga a partir de las notificaciones existentes.
+    """
+    contadores_existian = inspect(engine).has_table(ContadorNoLeidas.__tablename__)
+    SQLModel.metadata.create_all(engine, tables=TABLAS_AUXILIARES)
+
+    if not contadores_existian:
+        recalcular_contadores(engine)
+
+def recalcular_contadores(engine: Engine) -> int:
+    """Reconstruye los contadores de no leídas desde la tabla notificaciones"""
+    with Session(engine) as session:
+        return ContadorNoLeidasRepository().recalcular(session)
+
+def indices_notificaciones():
+    """Índices declarados en el modelo Notificacion, ordenados por nombre"""
+    return sorted(Notificacion.__table__.indexes, key=lambda idx: idx.name)  # type: ignore
+
+def ddl_indices_notificaciones(engine: Engine) -> list[str]:
+    """Sentencias CREATE INDEX de la tabla notificaciones para el dialecto del engine"""
+    return [str(CreateIndex(idx).compile(dialect=engine.dialect)).strip() for idx in indices_notificaciones()]
+
+def aplicar_indices_notificaciones(engine: Engine) -> list[str]:
+    """
+    Crea los índices de notificaciones que todavía no existan.
+
+    No se ejecuta al iniciar la aplicación: sobre una tabla grande conviene
+    aplicarlo en una ventana de mantenimiento.
+
+    Returns:
+        Nombres de los índices creados
+    """
+    creados = []
+    with engine.begin() as conn:
+        existentes = {idx["name"] for idx in inspect(conn).get_indexes(Notificacion.__tablename__)}
+        for idx in indices_notificaciones():
+            if idx.name not in existentes:
+                idx.create(conn)
+                creados.append(idx.name)
+    return creados
+
+
+if __name__ == "__main__":
+    # Migración manual: python -m src.config.esquema --indices [--sql] | --recalcular-contadores
+    parser = argparse.ArgumentParser(description="Migraciones de esquema del servicio de notificaciones")
+    parser.add_argument("--indices", action="store_true", help="Crear los índices faltantes de notificaciones")
+    parser.add_argument("--sql", action="store_true", help="Solo imprimir el DDL, sin ejecutarlo")
+    parser.add_argument("--recalcular-contadores", action="store_true", help="Reconstruir los contadores de no leídas")
+    args = parser.parse_args()
+
+    from .db import engine
+
+    if args.sql:
+        for sentencia in ddl_indices_notificaciones(engine):
+            print(f"{sentencia};")
+    elif args.indices:
+        asegurar_tablas_auxiliares(engine)
+        print(f"Índices creados: {aplicar_indices_notificaciones(engine) or 'ninguno (ya existían)'}")
+    elif args.recalcular_contadores:
+        asegurar_tablas_auxiliares(engine)
+        print(f"Contadores generados: {recalcular_contadores(engine)}")
+    else:
+        parser.print_help()
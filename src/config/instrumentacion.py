@@ -0,0 +1,11 @@
+import os
+
+# Trazas del proceso de notificaciones (duración, filas y consultas por etapa).
+# Se leen de las variables de entorno (App Settings en Azure).
+
+# Destino de los spans: "ninguno" (solo el resumen de la ejecución) u "opentelemetry"
+# (el TracerProvider que haya configurado la aplicación, p. ej. azure-monitor-opentelemetry)
+INSTRUMENTACION_TRACER = os.getenv("INSTRUMENTACION_TRACER", "ninguno").lower()
+
+# Nombre del instrumentation scope de los spans emitidos
+INSTRUMENTACION_NOMBRE = os.getenv("INSTRUMENTACION_NOMBRE", "process-scheduler")
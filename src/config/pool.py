@@ -0,0 +1,204 @@
+import os
+import time
+import threading
+import logging
+from typing import Any, Dict, Optional
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import Pool, QueuePool, AsyncAdaptedQueuePool
+from sqlmodel import create_engine
+
+from ..instrumentacion.etapas import instrumentar_motor
+
+logger = logging.getLogger(__name__)
+
+# Configuración de los pools de conexiones de todos los motores, leída de las variables
+# de entorno (App Settings en Azure). Cada valor se busca primero con el prefijo del
+# motor (p. ej. SYNAPSE_POOL_SIZE) y luego con el prefijo común DB_POOL_ (DB_POOL_SIZE).
+#
+#   *_POOL_SIZE          conexiones que el pool mantiene abiertas
+#   *_POOL_MAX_OVERFLOW  conexiones extra permitidas por encima de POOL_SIZE
+#   *_POOL_TIMEOUT       segundos de espera por una conexión libre antes de fallar
+#   *_POOL_RECYCLE       segundos de vida de una conexión (Azure SQL corta las inactivas a los 30 min)
+#   *_POOL_PRE_PING      verificar la conexión antes de entregarla
+#   *_POOL_PRECALENTAR   conexiones que se abren al iniciar (0 = ninguna)
+
+POOL_DEFECTO: Dict[str, Any] = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_timeout": 30,
+    "pool_recycle": 1800,
+    "pool_pre_ping": True
+}
+
+_VARIABLES = {
+    "pool_size": ("POOL_SIZE", int),
+    "max_overflow": ("POOL_MAX_OVERFLOW", int),
+    "pool_timeout": ("POOL_TIMEOUT", float),
+    "pool_recycle": ("POOL_RECYCLE", int),
+    "pool_pre_ping": ("POOL_PRE_PING", lambda v: v.lower() in ("1", "true", "yes"))
+}
+
+def _leer(prefijo: str, variable: str) -> Optional[str]:
+    return os.getenv(f"{prefijo}_{variable}") or os.getenv(f"DB_{variable}")
+
+def configuracion_pool(prefijo: str, defectos: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Parámetros de pool para create_engine de un motor.
+
+    Args:
+        prefijo: Prefijo de las variables del motor (AZURESQL, SYNAPSE, SCHEDULER...)
+        defectos: Valores propios del motor cuando no hay variable definida
+    """
+    configuracion = {**POOL_DEFECTO, **(defectos or {})}
+    for opcion, (variable, convertir) in _VARIABLES.items():
+        valor = _leer(prefijo, variable)
+        if valor:
+            configuracion[opcion] = convertir(valor)
+    return configuracion
+
+def conexiones_precalentar(prefijo: str) -> int:
+    return int(_leer(prefijo, "POOL_PRECALENTAR") or "0")
+
+
+class _MedicionObtencion:
+    """
+    Mide cuánto tarda cada checkout del pool (espera por una conexión libre más,
+    si hace falta, la apertura de una nueva) y cuántos terminan en timeout.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock_metricas = threading.Lock()
+        self.obtenciones = 0
+        self.timeouts = 0
+        self.tiempo_total = 0.0
+        self.tiempo_maximo = 0.0
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._lock_metricas:
+                self.timeouts += 1
+            raise
+        finally:
+            duracion = time.perf_counter() - inicio
+            with self._lock_metricas:
+                self.obtenciones += 1
+                self.tiempo_total += duracion
+                self.tiempo_maximo = max(self.tiempo_maximo, duracion)
+
+class QueuePoolMedido(_MedicionObtencion, QueuePool):
+    pass
+
+class AsyncAdaptedQueuePoolMedido(_MedicionObtencion, AsyncAdaptedQueuePool):
+    pass
+
+
+# Motores registrados para /metrics, por nombre. Se guarda el motor y no el pool
+# porque dispose() lo reemplaza por uno nuevo.
+_motores: Dict[str, Engine] = {}
+
+def _activar_wal(conexion_dbapi, _registro) -> None:
+    # Permite lecturas en streaming mientras otra conexión escribe en el mismo archivo
+    cursor = conexion_dbapi.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+def opciones_motor(url: str, prefijo: str, defectos: Optional[Dict[str, Any]] = None, asincrono: bool = False) -> Dict[str, Any]:
+    """
+    Argumentos de create_engine / create_async_engine con el pool configurado y medido.
+    SQLite (pruebas locales) conserva el pool por defecto de SQLAlchemy.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": AsyncAdaptedQueuePoolMedido if asincrono else QueuePoolMedido,
+        **configuracion_pool(prefijo, defectos)
+    }
+
+def preparar_motor(motor: Engine, nombre: str) -> None:
+    """
+    Registra el motor para /metrics, cuenta sus consultas en las etapas medidas del
+    scheduler y activa WAL si es SQLite. Para un AsyncEngine se pasa su sync_engine.
+    """
+    if motor.dialect.name == "sqlite":
+        event.listen(motor, "connect", _activar_wal)
+    instrumentar_motor(motor)
+    _motores[nombre] = motor
+
+def crear_motor(url: str, nombre: str, prefijo: str, defectos: Optional[Dict[str, Any]] = None, **kwargs) -> Engine:
+    """
+    Crea un motor con el pool configurado desde el entorno y lo registra para las métricas.
+
+    Args:
+        url: URL de conexión
+        nombre: Nombre del motor en /metrics
+        prefijo: Prefijo de sus variables de entorno de pool
+        defectos: Valores de pool propios del motor
+        **kwargs: Resto de argumentos de create_engine (connect_args, fast_executemany...)
+    """
+    motor = create_engine(url, **opciones_motor(url, prefijo, defectos), **kwargs)
+    preparar_motor(motor, nombre)
+    return motor
+
+def precalentar_pool(motor: Engine, conexiones: int) -> int:
+    """
+    Abre `conexiones` conexiones a la vez y las devuelve al pool, para que las primeras
+    peticiones no paguen el login. Un fallo solo se registra: no debe impedir el arranque.
+
+    Returns:
+        Cantidad de conexiones abiertas
+    """
+    abiertas = []
+    try:
+        for _ in range(conexiones):
+            abiertas.append(motor.connect())
+    except Exception:
+        logger.exception("No se pudo precalentar el pool de %s", motor.url.render_as_string(hide_password=True))
+    finally:
+        for conexion in abiertas:
+            conexion.close()
+    return len(abiertas)
+
+async def precalentar_pool_async(motor: AsyncEngine, conexiones: int) -> int:
+    """Versión de precalentar_pool para el motor asíncrono"""
+    abiertas = []
+    try:
+        for _ in range(conexiones):
+            abiertas.append(await motor.connect())
+    except Exception:
+        logger.exception("No se pudo precalentar el pool de %s", motor.url.render_as_string(hide_password=True))
+    finally:
+        for conexion in abiertas:
+            await conexion.close()
+    return len(abiertas)
+
+def metricas_pool(pool: Pool) -> Dict[str, Any]:
+    metricas: Dict[str, Any] = {"tipo": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        metricas.update({
+            "tamano": pool.size(),
+            "en_uso": pool.checkedout(),
+            "libres": pool.checkedin(),
+            # Negativo mientras el pool aún no abrió todas sus conexiones base
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout_segundos": pool.timeout()
+        })
+    if isinstance(pool, _MedicionObtencion):
+        with pool._lock_metricas:
+            metricas.update({
+                "obtenciones": pool.obtenciones,
+                "timeouts": pool.timeouts,
+                "espera_promedio_ms": round(1000 * pool.tiempo_total / pool.obtenciones, 3) if pool.obtenciones else 0.0,
+                "espera_maxima_ms": round(1000 * pool.tiempo_maximo, 3)
+            })
+    return metricas
+
+def metricas_pools() -> Dict[str, Dict[str, Any]]:
+    """Estado de los pools de todos los motores registrados"""
+    return {nombre: metricas_pool(motor.pool) for nombre, motor in _motores.items()}
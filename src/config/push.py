@@ -0,0 +1,17 @@
+import os
+
+# Envío en vivo de notificaciones (SSE / WebSocket) a los clientes suscritos.
+# Se leen de las variables de entorno (App Settings en Azure).
+
+# Broker entre procesos: "memoria" (solo el proceso actual) o "redis" (pub/sub entre
+# todas las instancias de la API, el endpoint de procesamiento y la Azure Function)
+PUSH_BROKER = os.getenv("PUSH_BROKER", "memoria").lower()
+
+# Conexión del broker externo
+PUSH_REDIS_URL = os.getenv("PUSH_REDIS_URL", "redis://localhost:6379/0")
+
+# Mensajes pendientes por conexión; si un cliente lento la llena se descartan los nuevos
+PUSH_MAX_PENDIENTES = int(os.getenv("PUSH_MAX_PENDIENTES", "100"))
+
+# Cada cuánto se envía un latido en las conexiones SSE sin tráfico (evita cortes por inactividad)
+PUSH_LATIDO_SEGUNDOS = float(os.getenv("PUSH_LATIDO_SEGUNDOS", "15"))
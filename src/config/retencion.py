@@ -0,0 +1,21 @@
+import os
+
+# Retención de notificaciones: las antiguas se mueven a notificaciones_archivadas.
+# Se leen de las variables de entorno (App Settings en Azure).
+
+# Antigüedad (por fecha_creacion) a partir de la cual se archivan las leídas
+RETENCION_DIAS_LEIDAS = int(os.getenv("RETENCION_DIAS_LEIDAS", "90"))
+
+# Antigüedad a partir de la cual se archivan también las no leídas (debe ser mayor)
+RETENCION_DIAS_NO_LEIDAS = int(os.getenv("RETENCION_DIAS_NO_LEIDAS", "365"))
+
+# Notificaciones movidas por lote; cada lote es una transacción corta, así los bloqueos
+# sobre notificaciones duran lo que tarda un lote y no toda la ejecución
+RETENCION_TAMANO_LOTE = int(os.getenv("RETENCION_TAMANO_LOTE", "500"))
+
+# Pausa entre lotes para dejar pasar a las escrituras y lecturas de la API
+RETENCION_PAUSA_MS = int(os.getenv("RETENCION_PAUSA_MS", "50"))
+
+# Segundos de trabajo por invocación (0 = sin límite). Lo que quede se archiva en la
+# siguiente: el recorrido por clave no necesita punto de control
+RETENCION_PRESUPUESTO_SEGUNDOS = float(os.getenv("RETENCION_PRESUPUESTO_SEGUNDOS", "0"))
@@ -0,0 +1,62 @@
+import os
+
+# Parámetros del proceso programado de notificaciones (Azure Function / endpoint de procesamiento).
+# Se leen de las variables de entorno (App Settings en Azure).
+
+# Cantidad de notificaciones por executemany al insertar en lote
+TAMANO_LOTE_NOTIFICACIONES = int(os.getenv("SCHEDULER_TAMANO_LOTE_NOTIFICACIONES", "500"))
+
+# Filas leídas por bloque del cursor de Synapse; también es el tamaño de cada bloque procesado
+TAMANO_BLOQUE_SYNAPSE = int(os.getenv("SCHEDULER_TAMANO_BLOQUE_SYNAPSE", "5000"))
+
+# Modo por defecto de las ejecuciones programadas: incremental (solo lo modificado
+# desde la última marca de agua) o completo (reconciliación de toda la vista)
+MODO_INCREMENTAL = os.getenv("SCHEDULER_MODO_INCREMENTAL", "false").lower() in ("1", "true", "yes")
+
+# Columna de la vista de Synapse con la fecha del último cambio de cada convocatoria
+COLUMNA_CAMBIO_SYNAPSE = os.getenv("SYNAPSE_COLUMNA_CAMBIO", "fecha_ultima_postulacion")
+
+# Solapamiento aplicado a la marca de agua para tolerar desfases de reloj y cargas tardías.
+# Releer filas ya procesadas es inocuo: sin cambio en el total no se genera notificación.
+MARGEN_DELTA_SEGUNDOS = int(os.getenv("SCHEDULER_MARGEN_DELTA_SEGUNDOS", "300"))
+
+# Ejecución en paralelo por shards de id_empresa (1 = secuencial)
+NUM_SHARDS = int(os.getenv("SCHEDULER_NUM_SHARDS", "1"))
+
+# Con True cada shard corre en un proceso aparte (iniciado con spawn, con su propio engine)
+# en lugar de un hilo
+SHARDS_EN_PROCESOS = os.getenv("SCHEDULER_SHARDS_EN_PROCESOS", "false").lower() in ("1", "true", "yes")
+
+# Detección de incrementos vectorizada con NumPy si está instalado (si no, o con False,
+# se usa la implementación en Python puro, con el mismo resultado)
+DETECCION_NUMPY = os.getenv("SCHEDULER_DETECCION_NUMPY", "true").lower() in ("1", "true", "yes")
+
+# Segundos de trabajo por invocación (0 = sin límite). Al superarse se termina el bloque en
+# curso y la ejecución queda pendiente para la siguiente invocación; conviene dejarlo por
+# debajo del functionTimeout de host.json (10 minutos)
+PRESUPUESTO_SEGUNDOS = float(os.getenv("SCHEDULER_PRESUPUESTO_SEGUNDOS", "0"))
+
+# Una ejecución interrumpida sin avances en estas horas se abandona y se empieza una nueva
+REANUDAR_MAX_HORAS = float(os.getenv("SCHEDULER_REANUDAR_MAX_HORAS", "24"))
+
+# Agrupar las NUEVA_POSTULACION: si la empresa aún no leyó la notificación de una oferta,
+# se actualiza (acumulando las nuevas postulaciones) en lugar de crear otra
+AGRUPAR_NO_LEIDAS = os.getenv("SCHEDULER_AGRUPAR_NO_LEIDAS", "false").lower() in ("1", "true", "yes")
+
+# Vida del lease de ejecución exclusiva; se renueva cada tercio mientras la ejecución sigue
+# viva. Si el proceso muere sin liberarlo, otra invocación lo toma al vencer
+LEASE_SEGUNDOS = float(os.getenv("SCHEDULER_LEASE_SEGUNDOS", "120"))
+
+# Ante una ejecución en curso: esperar su resultado (True) o responder de inmediato que
+# ya hay una en curso (False). Los llamadores pueden indicarlo en cada invocación
+ESPERAR_EN_CURSO = os.getenv("SCHEDULER_ESPERAR_EN_CURSO", "false").lower() in ("1", "true", "yes")
+
+# Tiempo máximo de espera del resultado de la ejecución en curso y cada cuánto se consulta
+ESPERA_MAX_SEGUNDOS = float(os.getenv("SCHEDULER_ESPERA_MAX_SEGUNDOS", "600"))
+ESPERA_INTERVALO_SEGUNDOS = float(os.getenv("SCHEDULER_ESPERA_INTERVALO_SEGUNDOS", "2"))
+
+# Con True la reconciliación completa reutiliza la vista de postulados cacheada por la API si
+# está vigente (nunca la llena: sin caché lee en streaming). Esas filas pueden ser más viejas
+# que los snapshots, que entonces solo se actualizan si el total aumenta. Por defecto siempre
+# consulta Synapse
+USAR_CACHE_POSTULADOS = os.getenv("SCHEDULER_USAR_CACHE_POSTULADOS", "false").lower() in ("1", "true", "yes")
@@ -0,0 +1,14 @@
+import os
+
+# Trabajos asíncronos de procesamiento encolados desde la API (POST /procesamiento/notificar-postulaciones).
+# Se leen de las variables de entorno (App Settings en Azure).
+
+# Trabajos ejecutados a la vez por cada instancia de la API
+TRABAJOS_MAX_WORKERS = int(os.getenv("TRABAJOS_MAX_WORKERS", "1"))
+
+# Cada cuánto se guarda el avance (etapa y filas) de un trabajo en curso; es también su latido
+TRABAJOS_INTERVALO_PROGRESO_SEGUNDOS = float(os.getenv("TRABAJOS_INTERVALO_PROGRESO_SEGUNDOS", "2"))
+
+# Un trabajo en curso sin latido durante este tiempo se considera huérfano (su worker se
+# reinició) y se retoma al iniciar la aplicación
+TRABAJOS_HUERFANO_SEGUNDOS = float(os.getenv("TRABAJOS_HUERFANO_SEGUNDOS", "120"))
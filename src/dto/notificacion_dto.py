@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -30,3 +30,13 @@ class NotificacionResponseDTO(BaseModel):
     fecha_creacion: datetime
 
     model_config = {"from_attributes": True}
+
+
+class ConteoNoLeidasDTO(BaseModel):
+    total: int
+    por_tipo: Dict[str, int]
+    por_prioridad: Dict[str, int]
+
+
+class MarcarLeidasDTO(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=500)
@@ -0,0 +1,61 @@
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from pydantic import BaseModel
+from .notificacion_dto import NotificacionResponseDTO
+from ..exception.cursor_invalido import CursorInvalido
+
+# Tamaño de página por defecto y máximo permitido en los listados paginados
+TAMANO_PAGINA_DEFECTO = 50
+MAX_TAMANO_PAGINA = 100
+
+
+class PaginaNotificacionesDTO(BaseModel):
+    """
+    Página de notificaciones ordenada por (fecha_creacion, id_notificacion) descendente.
+    next_cursor es None cuando no hay más resultados.
+    """
+    items: List[NotificacionResponseDTO]
+    next_cursor: Optional[str] = None
+
+
+def construir_pagina(entidades: List[Any], hay_mas: bool) -> PaginaNotificacionesDTO:
+    """Arma la página de respuesta y el cursor a partir de la última notificación"""
+    items = [NotificacionResponseDTO.model_validate(e) for e in entidades]
+    next_cursor = None
+    if hay_mas and entidades:
+        ultima = entidades[-1]
+        next_cursor = codificar_cursor(ultima.fecha_creacion, ultima.id_notificacion)
+    return PaginaNotificacionesDTO(items=items, next_cursor=next_cursor)
+
+
+def codificar_cursor(fecha_creacion: datetime, id_notificacion: Any) -> str:
+    """Genera el cursor opaco que apunta a la posición después de la notificación dada"""
+    contenido = json.dumps({"f": fecha_creacion.isoformat(), "i": id_notificacion}, default=str)
+    return base64.urlsafe_b64encode(contenido.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> Tuple[datetime, Any]:
+    """
+    Devuelve (fecha_creacion, id_notificacion) de un cursor generado por codificar_cursor
+
+    Raises:
+        CursorInvalido: si el cursor no tiene el formato esperado
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        contenido = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        return datetime.fromisoformat(contenido["f"]), contenido["i"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise CursorInvalido("Cursor de paginación inválido.") from e
+
+
+def etag_pagina(version_feed: Tuple[Any, ...], limit: int, cursor: Optional[str]) -> str:
+    """
+    ETag débil de una página de un feed: cambia cuando cambia la versión del feed
+    (ver NotificacionRepository.get_version_feed) o los parámetros de la página.
+    """
+    contenido = json.dumps([list(version_feed), limit, cursor], default=str)
+    return f'W/"{hashlib.sha1(contenido.encode()).hexdigest()}"'
@@ -1,3 +1,7 @@
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import Iterator, List, NamedTuple, Optional
 from pydantic import BaseModel
 
 class ConvocatoriaPostuladosDTO(BaseModel):
@@ -9,6 +13,57 @@ class ConvocatoriaPostuladosDTO(BaseModel):
     titulo: str
     total_postulados:int
 
+class ConvocatoriaPostuladosRow(NamedTuple):
+    """
+    Registro compacto (tupla) de postulados por convocatoria leído en streaming desde Synapse.
+    fecha_cambio es la fecha del último cambio según Synapse (SYNAPSE_COLUMNA_CAMBIO).
+    """
+    id_empresa: int
+    id_convocatoria: int
+    titulo: str
+    total_postulados: int
+    fecha_cambio: Optional[datetime] = None
+
+class IndiceSnapshots:
+    """
+    Índice de solo lectura id_convocatoria -> total_postulados de los snapshots guardados.
+
+    Se guarda en dos arreglos de enteros alineados y ordenados por id (16 bytes por
+    snapshot) en lugar de entidades ORM; el título solo se carga si se pide.
+    """
+
+    __slots__ = ("ids", "totales", "titulos")
+
+    def __init__(self, ids: Optional[array] = None, totales: Optional[array] = None, titulos: Optional[List[str]] = None):
+        self.ids = ids if ids is not None else array("q")
+        self.totales = totales if totales is not None else array("q")
+        self.titulos = titulos
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids)
+
+    def __contains__(self, id_convocatoria: int) -> bool:
+        return self._posicion(id_convocatoria) >= 0
+
+    def _posicion(self, id_convocatoria: int) -> int:
+        posicion = bisect_left(self.ids, id_convocatoria)
+        if posicion < len(self.ids) and self.ids[posicion] == id_convocatoria:
+            return posicion
+        return -1
+
+    def get(self, id_convocatoria: int, defecto: Optional[int] = None) -> Optional[int]:
+        """Total de postulados del snapshot, o `defecto` si la convocatoria no tiene"""
+        posicion = self._posicion(id_convocatoria)
+        return self.totales[posicion] if posicion >= 0 else defecto
+
+    def titulo(self, id_convocatoria: int) -> Optional[str]:
+        """Título guardado en el snapshot (requiere haber cargado el índice con títulos)"""
+        posicion = self._posicion(id_convocatoria)
+        return self.titulos[posicion] if posicion >= 0 and self.titulos is not None else None
+
 class IncrementoPostulacionesDTO(BaseModel):
     """
     DTO para representar el incremento de postulaciones en una convocatoria
@@ -0,0 +1,2 @@
+class CursorInvalido(Exception):
+    pass
@@ -0,0 +1,2 @@
+class EjecucionEnCurso(Exception):
+    pass
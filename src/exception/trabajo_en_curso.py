@@ -0,0 +1,2 @@
+class TrabajoEnCurso(Exception):
+    pass
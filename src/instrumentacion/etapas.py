@@ -0,0 +1,174 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .tracer import Span, Tracer, get_tracer
+
+T = TypeVar("T")
+
+# Recibe (etapa, filas) al terminar cada ejecución de etapa, p. ej. para informar el avance
+ObservadorProgreso = Callable[[str, int], None]
+
+# Medidor de la ejecución en curso en este hilo / tarea. Las consultas de cualquier motor
+# instrumentado se cuentan en su etapa activa.
+_medidor_actual: ContextVar[Optional["MedidorEtapas"]] = ContextVar("medidor_etapas", default=None)
+
+def _contar_consulta(*_args) -> None:
+    medidor = _medidor_actual.get()
+    if medidor is not None:
+        medidor._contar_consulta()
+
+def instrumentar_motor(motor: Engine) -> None:
+    """Cuenta las consultas del motor en el medidor activo. Es idempotente."""
+    if not event.contains(motor, "before_cursor_execute", _contar_consulta):
+        event.listen(motor, "before_cursor_execute", _contar_consulta)
+
+
+class EstadisticaEtapa:
+    """Acumulado de una etapa a lo largo de la ejecución (puede repetirse por bloque)"""
+
+    __slots__ = ("duracion", "filas", "consultas", "ejecuciones")
+
+    def __init__(self):
+        self.duracion = 0.0
+        self.filas = 0
+        self.consultas = 0
+        self.ejecuciones = 0
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            "duracion_ms": round(self.duracion * 1000, 3),
+            "filas": self.filas,
+            "consultas": self.consultas,
+            "ejecuciones": self.ejecuciones
+        }
+
+class RegistroEtapa:
+    """Una ejecución de una etapa; quien la mide informa las filas que procesó"""
+
+    __slots__ = ("filas", "span")
+
+    def __init__(self, span: Span):
+        self.filas = 0
+        self.span = span
+
+
+class MedidorEtapas:
+    """
+    Mide duración, filas y consultas SQL de cada etapa de un proceso y emite un span
+    por cada ejecución de etapa, hijos del span del proceso.
+
+    Uso:
+        with MedidorEtapas("procesar_nuevas_postulaciones") as medidor:
+            with medidor.etapa("lectura_snapshots") as registro:
+                registro.filas = len(cargar())
+        medidor.resumen()
+    """
+
+    def __init__(
+        self,
+        nombre: str,
+        atributos: Optional[Dict[str, Any]] = None,
+        tracer: Optional[Tracer] = None,
+        progreso: Optional[ObservadorProgreso] = None
+    ):
+        self.nombre = nombre
+        self.atributos = atributos or {}
+        self.tracer = tracer or get_tracer()
+        self.progreso = progreso
+        self.etapas: Dict[str, EstadisticaEtapa] = {}
+        self.consultas_totales = 0
+        self.duracion_total = 0.0
+        self._etapa_activa: Optional[EstadisticaEtapa] = None
+        self._inicio = 0.0
+        self._contexto_span: Optional[ContextManager[Span]] = None
+        self._span: Optional[Span] = None
+        self._token = None
+
+    def __enter__(self) -> "MedidorEtapas":
+        self._contexto_span = self.tracer.span(self.nombre, self.atributos)
+        self._span = self._contexto_span.__enter__()
+        self._token = _medidor_actual.set(self)
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, error, traza) -> None:
+        self.duracion_total = time.perf_counter() - self._inicio
+        _medidor_actual.reset(self._token)
+        self._span.set_attribute("consultas", self.consultas_totales)
+        self._contexto_span.__exit__(tipo, error, traza)
+
+    def _contar_consulta(self) -> None:
+        self.consultas_totales += 1
+        if self._etapa_activa is not None:
+            self._etapa_activa.consultas += 1
+
+    @contextmanager
+    def etapa(self, nombre: str, atributos: Optional[Dict[str, Any]] = None) -> Iterator[RegistroEtapa]:
+        """Mide una ejecución de la etapa `nombre`"""
+        estadistica = self.etapas.setdefault(nombre, EstadisticaEtapa())
+        anterior, self._etapa_activa = self._etapa_activa, estadistica
+        consultas_antes = estadistica.consultas
+
+        with self.tracer.span(nombre, atributos) as span:
+            registro = RegistroEtapa(span)
+            inicio = time.perf_counter()
+            try:
+                yield registro
+            finally:
+                estadistica.duracion += time.perf_counter() - inicio
+                estadistica.filas += registro.filas
+                estadistica.ejecuciones += 1
+                self._etapa_activa = anterior
+                span.set_attribute("filas", registro.filas)
+                span.set_attribute("consultas", estadistica.consultas - consultas_antes)
+                if self.progreso is not None:
+                    self.progreso(nombre, registro.filas)
+
+    def iterar(self, nombre: str, iterable: Iterable[T], filas: Callable[[T], int] = lambda _: 1) -> Iterator[T]:
+        """
+        Recorre un iterable perezoso (p. ej. un cursor en streaming) midiendo cada avance
+        como una ejecución de la etapa, sin contar el trabajo que el llamador hace entre avances.
+
+        Args:
+            filas: Cantidad de filas que aporta cada elemento (len para bloques)
+        """
+        iterador = iter(iterable)
+        while True:
+            with self.etapa(nombre) as registro:
+                try:
+                    elemento = next(iterador)
+                except StopIteration:
+                    return
+                registro.filas = filas(elemento)
+            yield elemento
+
+    def resumen(self) -> Dict[str, Any]:
+        return {
+            "duracion_total_ms": round(self.duracion_total * 1000, 3),
+            "consultas_totales": self.consultas_totales,
+            "etapas": {nombre: estadistica.a_dict() for nombre, estadistica in self.etapas.items()}
+        }
+
+
+def combinar_resumenes(resumenes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Suma las etapas de ejecuciones paralelas (shards). La duración total es la del shard
+    más lento; la de cada etapa es la suma de todos los shards.
+    """
+    etapas: Dict[str, Dict[str, Any]] = {}
+    for resumen in resumenes:
+        for nombre, datos in resumen["etapas"].items():
+            acumulado = etapas.setdefault(nombre, dict.fromkeys(datos, 0))
+            for clave, valor in datos.items():
+                acumulado[clave] += valor
+            acumulado["duracion_ms"] = round(acumulado["duracion_ms"], 3)
+    return {
+        "duracion_total_ms": max((r["duracion_total_ms"] for r in resumenes), default=0.0),
+        "consultas_totales": sum(r["consultas_totales"] for r in resumenes),
+        "etapas": etapas
+    }
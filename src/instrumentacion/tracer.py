@@ -0,0 +1,72 @@
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, ContextManager, Dict, Iterator, Optional
+
+from ..config.instrumentacion import INSTRUMENTACION_TRACER, INSTRUMENTACION_NOMBRE
+
+class Span(ABC):
+    """Intervalo medido; la interfaz es el subconjunto de opentelemetry.trace.Span que se usa"""
+
+    @abstractmethod
+    def set_attribute(self, clave: str, valor: Any) -> None:
+        """Agrega un atributo al span"""
+
+class Tracer(ABC):
+    """
+    Punto de extensión para enviar las etapas del proceso a un sistema de trazas.
+    Otro backend (Application Insights directo, logs estructurados, ...) se integra
+    implementando este método.
+    """
+
+    @abstractmethod
+    def span(self, nombre: str, atributos: Optional[Dict[str, Any]] = None) -> ContextManager[Span]:
+        """Abre un span hijo del span activo y lo cierra al salir del bloque"""
+
+class _SpanNulo(Span):
+    def set_attribute(self, clave: str, valor: Any) -> None:
+        pass
+
+_SPAN_NULO = _SpanNulo()
+
+class TracerNulo(Tracer):
+    """No emite nada; es el tracer por defecto"""
+
+    @contextmanager
+    def span(self, nombre: str, atributos: Optional[Dict[str, Any]] = None) -> Iterator[Span]:
+        yield _SPAN_NULO
+
+class TracerOpenTelemetry(Tracer):
+    """
+    Emite los spans con la API de OpenTelemetry, hacia el TracerProvider global que
+    configure la aplicación. El paquete opentelemetry-api solo se necesita si se elige este tracer.
+    """
+
+    def __init__(self, nombre: str = INSTRUMENTACION_NOMBRE):
+        from opentelemetry import trace  # dependencia opcional
+
+        self._tracer = trace.get_tracer(nombre)
+
+    @contextmanager
+    def span(self, nombre: str, atributos: Optional[Dict[str, Any]] = None) -> Iterator[Span]:
+        with self._tracer.start_as_current_span(nombre, attributes=atributos) as span:
+            yield span
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+def get_tracer() -> Tracer:
+    """Devuelve el tracer del proceso, creándolo en el primer uso según INSTRUMENTACION_TRACER"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = TracerOpenTelemetry() if INSTRUMENTACION_TRACER == "opentelemetry" else TracerNulo()
+    return _tracer
+
+def configurar_tracer(tracer: Optional[Tracer]) -> None:
+    """Reemplaza el tracer del proceso (None vuelve a la configuración del entorno)"""
+    global _tracer
+    with _tracer_lock:
+        _tracer = tracer
@@ -1,13 +1,37 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from sqlmodel import SQLModel
 from .config.db import engine
+from .config.db_synapse import synapse_engine
+from .config.pool import precalentar_pool, conexiones_precalentar
+from .config.esquema import asegurar_tablas_auxiliares
+from .config.db_async import dispose_async_engine
+from .push.hub import cerrar_hub_notificaciones
+from .routes.deps.trabajos import get_gestor_trabajos, cerrar_gestor_trabajos
 from .models import Notificacion
 from .routes.notificacion_router import router
 from fastapi.responses import HTMLResponse
 from .routes.postulacion_notificacion_router import router as postulacion_router
+from .routes.notificacion_async_router import router as notificacion_async_router
+from .routes.notificacion_stream_router import router as notificacion_stream_router
+from .routes.metricas_router import router as metricas_router
 
 
-app = FastAPI(title="Notification-Service")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    asegurar_tablas_auxiliares(engine)
+    # Opcional: abre conexiones por adelantado (AZURESQL_POOL_PRECALENTAR / SYNAPSE_POOL_PRECALENTAR)
+    precalentar_pool(engine, conexiones_precalentar("AZURESQL"))
+    precalentar_pool(synapse_engine, conexiones_precalentar("SYNAPSE"))
+    # Retoma los trabajos asíncronos que quedaron sin terminar en un reinicio
+    get_gestor_trabajos().recuperar()
+    yield
+    cerrar_gestor_trabajos()
+    await dispose_async_engine()
+    cerrar_hub_notificaciones()
+
+
+app = FastAPI(title="Notification-Service", lifespan=lifespan)
 
 @app.get("/", response_class=HTMLResponse)
 def home():
@@ -47,5 +71,8 @@ def home():
     """
     return HTMLResponse(content=html)
 
+app.include_router(notificacion_stream_router)
 app.include_router(router)
-app.include_router(postulacion_router)
\ No newline at end of file
+app.include_router(postulacion_router)
+app.include_router(notificacion_async_router)
+app.include_router(metricas_router)
\ No newline at end of file
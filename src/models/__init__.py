@@ -1,5 +1,11 @@
 from .notificacion import Notificacion
 from .convocatoria_snapshot import ConvocatoriaSnapshot
 from .notificacionInt import NotificacionInt
+from .marca_agua_scheduler import MarcaAguaScheduler
+from .contador_no_leidas import ContadorNoLeidas
+from .ejecucion_scheduler import EjecucionScheduler
+from .notificacion_archivada import NotificacionArchivada
+from .lease_proceso import LeaseProceso
+from .trabajo_procesamiento import TrabajoProcesamiento
 
-__all__ = ["Notificacion", "ConvocatoriaSnapshot", "NotificacionInt"]
\ No newline at end of file
+__all__ = ["Notificacion", "ConvocatoriaSnapshot", "NotificacionInt", "MarcaAguaScheduler", "ContadorNoLeidas", "EjecucionScheduler", "NotificacionArchivada", "LeaseProceso", "TrabajoProcesamiento"]
\ No newline at end of file
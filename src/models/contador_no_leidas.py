@@ -0,0 +1,16 @@
+from sqlmodel import SQLModel, Field
+
+class ContadorNoLeidas(SQLModel, table=True):
+    """
+    Contadores mantenidos de notificaciones no leídas por destinatario, tipo y prioridad.
+    Se actualizan en la misma transacción que las escrituras de notificaciones, de modo
+    que el badge del frontend se resuelve con una lectura por clave.
+    """
+
+    __tablename__ : str = "notificaciones_contadores_no_leidas"
+
+    ambito: str = Field(primary_key=True, max_length=10)  # "usuario" | "empresa"
+    id_ambito: int = Field(primary_key=True)
+    tipo_notificacion: str = Field(primary_key=True, max_length=100)
+    prioridad: str = Field(primary_key=True, max_length=20, default="")
+    total: int = Field(default=0, nullable=False)
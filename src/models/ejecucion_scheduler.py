@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field
+
+class EjecucionScheduler(SQLModel, table=True):
+    """
+    Punto de control de una ejecución del proceso de notificaciones de postulaciones.
+    Se actualiza en la misma transacción que confirma cada bloque, así una ejecución
+    interrumpida (p. ej. por el functionTimeout) se reanuda desde el último bloque confirmado.
+    """
+
+    __tablename__ : str = "scheduler_ejecuciones"
+
+    id_ejecucion: str = Field(primary_key=True, max_length=36)
+    proceso: str = Field(index=True, nullable=False, max_length=100)
+    modo: str = Field(nullable=False, max_length=20)
+    # en_curso | completada | abandonada
+    estado: str = Field(nullable=False, max_length=20)
+    # Fecha de cambio desde la que lee el modo incremental (None en reconciliación completa)
+    desde: Optional[datetime] = Field(default=None)
+    # id_convocatoria del último bloque confirmado; la lectura se reanuda a partir del siguiente
+    ultima_clave: Optional[int] = Field(default=None)
+    # Marca de agua que se guardará al completar (la mayor fecha de cambio vista)
+    nueva_marca: Optional[datetime] = Field(default=None)
+    bloques_confirmados: int = Field(default=0)
+    convocatorias_procesadas: int = Field(default=0)
+    convocatorias_con_incremento: int = Field(default=0)
+    notificaciones_creadas: int = Field(default=0)
+    notificaciones_agrupadas: int = Field(default=0)
+    snapshots_insertados: int = Field(default=0)
+    snapshots_actualizados: int = Field(default=0)
+    reanudaciones: int = Field(default=0)
+    fecha_inicio: datetime = Field(default_factory=datetime.utcnow)
+    fecha_actualizacion: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field, Column, Text
+
+class LeaseProceso(SQLModel, table=True):
+    """
+    Lease de ejecución exclusiva de un proceso programado. Lo toma quien ejecuta el
+    proceso (Azure Function o endpoint) y lo renueva mientras corre; al terminar guarda
+    el resumen para los llamadores que esperaban esa misma ejecución.
+    """
+
+    __tablename__ : str = "scheduler_leases"
+
+    proceso: str = Field(primary_key=True, max_length=100)
+    # Ejecución que tiene el lease (None si está libre) y hasta cuándo es válido
+    titular: Optional[str] = Field(default=None, max_length=36)
+    expira: Optional[datetime] = Field(default=None)
+    fecha_adquisicion: Optional[datetime] = Field(default=None)
+    # Última ejecución terminada: su resumen (JSON, sin detalle) o None si falló
+    ultimo_titular: Optional[str] = Field(default=None, max_length=36)
+    ultimo_resultado: Optional[str] = Field(default=None, sa_column=Column(Text))
+    fecha_liberacion: Optional[datetime] = Field(default=None)
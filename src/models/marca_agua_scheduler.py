@@ -0,0 +1,16 @@
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+
+class MarcaAguaScheduler(SQLModel, table=True):
+    """
+    Marca de agua (high-water mark) de cada proceso programado.
+    Guarda hasta qué fecha de cambio en origen ya se procesaron las convocatorias,
+    para que el modo incremental solo consulte lo modificado desde entonces.
+    """
+
+    __tablename__ : str = "scheduler_marcas_agua"
+
+    proceso: str = Field(primary_key=True, max_length=100)
+    marca: datetime = Field(nullable=False)
+    modo: str = Field(nullable=False, max_length=20)
+    ultima_ejecucion: datetime = Field(default_factory=datetime.utcnow)
@@ -4,13 +4,46 @@ from typing import TYPE_CHECKING, Optional, List
 from datetime import datetime
 
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 
 if TYPE_CHECKING:
     from .tipo_notificacion import TipoNotificacion
 
 
+# Columnas incluidas (SQL Server) para que los conteos de no leídas por tipo/prioridad
+# se resuelvan solo con el índice
+_INCLUDE_CONTEOS = ["tipo_notificacion", "prioridad"]
+
+
 class Notificacion(SQLModel, table=True):
     __tablename__ = "notificaciones"
+    # Índices de los accesos frecuentes. NotificacionInt extiende esta misma tabla,
+    # por eso los índices se declaran solo aquí. Se aplican con `python -m src.config.esquema --indices`.
+    __table_args__ = (
+        # No leídas por usuario / empresa ordenadas por fecha (listados, marcar todas, conteos)
+        Index(
+            "ix_notificaciones_usuario_leida_fecha",
+            "id_usuario", "leida", "fecha_creacion", "id_notificacion",
+            mssql_include=_INCLUDE_CONTEOS,
+        ),
+        Index(
+            "ix_notificaciones_empresa_leida_fecha",
+            "id_empresa", "leida", "fecha_creacion", "id_notificacion",
+            mssql_include=_INCLUDE_CONTEOS,
+        ),
+        # Feed completo por usuario / empresa con paginación keyset
+        Index("ix_notificaciones_usuario_fecha", "id_usuario", "fecha_creacion", "id_notificacion"),
+        Index("ix_notificaciones_empresa_fecha", "id_empresa", "fecha_creacion", "id_notificacion"),
+        # Notificación no leída de una oferta, para agrupar las NUEVA_POSTULACION del scheduler
+        Index(
+            "ix_notificaciones_oferta_tipo_leida",
+            "id_oferta", "tipo_notificacion", "leida",
+            mssql_include=["id_empresa"],
+        ),
+        # Listados globales (todas / no leídas)
+        Index("ix_notificaciones_leida_fecha", "leida", "fecha_creacion", "id_notificacion"),
+        Index("ix_notificaciones_fecha", "fecha_creacion", "id_notificacion"),
+    )
 
     id_notificacion: int | None = Field(default=None, primary_key=True)
 
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field
+
+class NotificacionArchivada(SQLModel, table=True):
+    """
+    Notificaciones retiradas de la tabla notificaciones por el proceso de retención.
+    Conserva las mismas columnas (y el mismo id_notificacion) más la fecha de archivado.
+    """
+
+    __tablename__ : str = "notificaciones_archivadas"
+
+    id_notificacion: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+
+    id_usuario: int
+    id_empresa: int
+
+    tipo_notificacion: str = Field(nullable=False)
+    asunto: str = Field(nullable=False)
+    mensaje: str
+
+    id_oferta: int = Field(nullable=False)
+    prioridad: Optional[str] = None
+    datos_adicionales: Optional[str] = None
+
+    leida: bool = Field(default=False)
+    fecha_lectura: Optional[datetime] = None
+    fecha_creacion: datetime
+    fecha_archivado: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field, Column, Text
+
+class TrabajoProcesamiento(SQLModel, table=True):
+    """
+    Trabajo asíncrono de procesamiento encolado desde la API. Persiste el estado, el
+    avance y el resumen final para consultarlo desde cualquier instancia, y para
+    retomar los trabajos que quedaron sin terminar al reiniciarse un worker.
+    """
+
+    __tablename__ : str = "procesamiento_trabajos"
+
+    id_trabajo: str = Field(primary_key=True, max_length=36)
+    proceso: str = Field(index=True, nullable=False, max_length=100)
+    # pendiente | en_curso | completado | fallido
+    estado: str = Field(nullable=False, max_length=20)
+    # Parámetros de la ejecución (JSON)
+    parametros: str = Field(sa_column=Column(Text, nullable=False))
+    # Última etapa terminada y convocatorias leídas hasta el momento
+    etapa: Optional[str] = Field(default=None, max_length=100)
+    filas_procesadas: int = Field(default=0)
+    intentos: int = Field(default=0)
+    # Resumen final (JSON, sin detalle) o mensaje de error
+    resumen: Optional[str] = Field(default=None, sa_column=Column(Text))
+    error: Optional[str] = Field(default=None, sa_column=Column(Text))
+    fecha_creacion: datetime = Field(default_factory=datetime.utcnow)
+    fecha_inicio: Optional[datetime] = Field(default=None)
+    fecha_fin: Optional[datetime] = Field(default=None)
+    # Latido del worker que lo ejecuta; sin avances recientes el trabajo se considera huérfano
+    fecha_actualizacion: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,73 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional
+
+# Función del hub que reparte un mensaje a los suscriptores locales de un canal
+Entregar = Callable[[str, Dict[str, Any]], None]
+
+class BrokerNotificaciones(ABC):
+    """
+    Transporte de los mensajes publicados hacia los hubs de todos los procesos.
+    Un broker externo (Redis pub/sub, Azure Web PubSub, ...) se integra implementando estos métodos.
+    """
+
+    # True si los mensajes salen del proceso (se publica aunque no haya suscriptores locales)
+    externo: bool = False
+
+    @abstractmethod
+    def iniciar(self, entregar: Entregar) -> None:
+        """Registra la función que recibe cada mensaje llegado del broker"""
+
+    @abstractmethod
+    def publicar(self, canal: str, mensaje: Dict[str, Any]) -> None:
+        """Envía el mensaje a todos los hubs suscritos al broker"""
+
+    def cerrar(self) -> None:
+        """Libera conexiones e hilos del broker"""
+
+class BrokerEnProceso(BrokerNotificaciones):
+    """Entrega directa al hub del mismo proceso; suficiente con un único worker"""
+
+    def __init__(self):
+        self._entregar: Optional[Entregar] = None
+
+    def iniciar(self, entregar: Entregar) -> None:
+        self._entregar = entregar
+
+    def publicar(self, canal: str, mensaje: Dict[str, Any]) -> None:
+        if self._entregar is not None:
+            self._entregar(canal, mensaje)
+
+class RedisBroker(BrokerNotificaciones):
+    """
+    Broker sobre Redis pub/sub para despliegues con varios workers o instancias.
+    El paquete redis solo se necesita si se elige este broker.
+    """
+
+    externo = True
+
+    def __init__(self, url: str, prefijo: str = "notificaciones:push:"):
+        import redis  # dependencia opcional
+
+        self.cliente = redis.Redis.from_url(url)
+        self.prefijo = prefijo
+        self._pubsub = None
+        self._hilo = None
+
+    def iniciar(self, entregar: Entregar) -> None:
+        def _al_recibir(evento):
+            canal = evento["channel"].decode()[len(self.prefijo):]
+            entregar(canal, json.loads(evento["data"]))
+
+        self._pubsub = self.cliente.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.psubscribe(**{f"{self.prefijo}*": _al_recibir})
+        self._hilo = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def publicar(self, canal: str, mensaje: Dict[str, Any]) -> None:
+        self.cliente.publish(self.prefijo + canal, json.dumps(mensaje, default=str))
+
+    def cerrar(self) -> None:
+        if self._hilo is not None:
+            self._hilo.stop()
+        if self._pubsub is not None:
+            self._pubsub.close()
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Iterable, Optional, Set
+from .brokers import BrokerNotificaciones, BrokerEnProceso, RedisBroker
+from ..repositories.contador_no_leidas_repo import AMBITO_USUARIO, AMBITO_EMPRESA
+from ..config.push import PUSH_BROKER, PUSH_REDIS_URL, PUSH_MAX_PENDIENTES
+
+logger = logging.getLogger(__name__)
+
+def canal(ambito: str, id_ambito: int) -> str:
+    """Nombre del canal de un destinatario, p. ej. 'empresa:15'"""
+    return f"{ambito}:{id_ambito}"
+
+class Suscripcion:
+    """Conexión de un cliente a un canal; los mensajes llegan a su cola en el event loop del cliente"""
+
+    def __init__(self, canal: str, loop: asyncio.AbstractEventLoop, max_pendientes: int):
+        self.canal = canal
+        self.cola: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(max_pendientes)
+        self.descartados = 0
+        self._loop = loop
+
+    def _encolar(self, mensaje: Dict[str, Any]) -> None:
+        try:
+            self.cola.put_nowait(mensaje)
+        except asyncio.QueueFull:
+            self.descartados += 1
+
+    def entregar(self, mensaje: Dict[str, Any]) -> None:
+        """Seguro para llamar desde cualquier hilo (handlers síncronos, scheduler, broker)"""
+        try:
+            self._loop.call_soon_threadsafe(self._encolar, mensaje)
+        except RuntimeError:
+            # El event loop del cliente ya se cerró
+            pass
+
+class HubNotificaciones:
+    """
+    Reparto (fan-out) en proceso de las notificaciones nuevas a los clientes suscritos
+    por usuario y por empresa. La publicación pasa siempre por el broker, que decide si
+    el mensaje llega solo a este proceso o a todas las instancias.
+    """
+
+    def __init__(self, broker: Optional[BrokerNotificaciones] = None, max_pendientes: int = PUSH_MAX_PENDIENTES):
+        self.broker = broker or BrokerEnProceso()
+        self.max_pendientes = max_pendientes
+        self._suscripciones: Dict[str, Set[Suscripcion]] = {}
+        self._lock = threading.Lock()
+        self.publicados = 0
+        self.broker.iniciar(self._entregar)
+
+    def suscribir(self, ambito: str, id_ambito: int) -> Suscripcion:
+        """Crea la suscripción en el event loop actual; llamar desde código async"""
+        suscripcion = Suscripcion(canal(ambito, id_ambito), asyncio.get_running_loop(), self.max_pendientes)
+        with self._lock:
+            self._suscripciones.setdefault(suscripcion.canal, set()).add(suscripcion)
+        return suscripcion
+
+    def desuscribir(self, suscripcion: Suscripcion) -> None:
+        with self._lock:
+            suscritos = self._suscripciones.get(suscripcion.canal)
+            if suscritos is not None:
+                suscritos.discard(suscripcion)
+                if not suscritos:
+                    del self._suscripciones[suscripcion.canal]
+
+    def publicacion_activa(self) -> bool:
+        """False si publicar no llegaría a nadie (broker local sin suscriptores)"""
+        return self.broker.externo or bool(self._suscripciones)
+
+    def publicar_notificaciones(self, notificaciones: Iterable[Any]) -> None:
+        """
+        Publica cada notificación en el canal de su usuario y en el de su empresa.
+        Un fallo del broker no debe romper la escritura ya confirmada: se registra y se sigue.
+        """
+        if not self.publicacion_activa():
+            return
+
+        for notificacion in notificaciones:
+            # Sirve tanto para Notificacion como para NotificacionInt (alta en lote del scheduler)
+            mensaje = notificacion.model_dump(mode="json", warnings=False)
+            try:
+                self.broker.publicar(canal(AMBITO_USUARIO, notificacion.id_usuario), mensaje)
+                self.broker.publicar(canal(AMBITO_EMPRESA, notificacion.id_empresa), mensaje)
+                self.publicados += 1
+            except Exception:
+                logger.exception("No se pudo publicar la notificación en el broker")
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            suscritos = [s for grupo in self._suscripciones.values() for s in grupo]
+        return {
+            "broker": type(self.broker).__name__,
+            "canales": len(self._suscripciones),
+            "conexiones": len(suscritos),
+            "publicados": self.publicados,
+            "descartados": sum(s.descartados for s in suscritos)
+        }
+
+    def cerrar(self) -> None:
+        self.broker.cerrar()
+
+    def _entregar(self, nombre_canal: str, mensaje: Dict[str, Any]) -> None:
+        with self._lock:
+            suscritos = list(self._suscripciones.get(nombre_canal, ()))
+        for suscripcion in suscritos:
+            suscripcion.entregar(mensaje)
+
+_hub: Optional[HubNotificaciones] = None
+_hub_lock = threading.Lock()
+
+def get_hub_notificaciones() -> HubNotificaciones:
+    """Devuelve el hub del proceso, creándolo en el primer uso según PUSH_BROKER"""
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                broker = RedisBroker(PUSH_REDIS_URL) if PUSH_BROKER == "redis" else BrokerEnProceso()
+                _hub = HubNotificaciones(broker)
+    return _hub
+
+def cerrar_hub_notificaciones() -> None:
+    """Cierra el broker del hub si llegó a crearse"""
+    global _hub
+    with _hub_lock:
+        if _hub is not None:
+            _hub.cerrar()
+            _hub = None
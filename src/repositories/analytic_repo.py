@@ -1,6 +1,31 @@
 from sqlmodel import Session, text
-from typing import List, Dict, Any
+from sqlalchemy import DateTime
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Sequence
 from datetime import datetime, timedelta
+from bisect import bisect_right
+from ..dto.postulacion_dto import ConvocatoriaPostuladosRow
+from ..cache.postulados import CachePostulados, get_cache_postulados
+from ..config.scheduler import TAMANO_BLOQUE_SYNAPSE, COLUMNA_CAMBIO_SYNAPSE
+
+VISTA_POSTULADOS = "postulados_por_convocatoria_python"
+CAMPOS_POSTULADOS = ("id_empresa", "id_convocatoria", "titulo", "total_postulados")
+COLUMNAS_POSTULADOS = ", ".join(CAMPOS_POSTULADOS)
+
+def _filtro_shard(shard: Optional[Tuple[int, int]]) -> Tuple[List[str], Dict[str, Any]]:
+    """Condición para quedarse con las empresas de un shard (partición por id_empresa)"""
+    if shard is None:
+        return [], {}
+    indice, total = shard
+    return ["id_empresa % :total_shards = :indice_shard"], {"total_shards": total, "indice_shard": indice}
+
+def _filtro_reanudacion(despues_de: Optional[int], condiciones: List[str], params: Dict[str, Any]) -> None:
+    """Continúa la lectura a partir del último id_convocatoria ya procesado"""
+    if despues_de is not None:
+        condiciones.append("id_convocatoria > :despues_de")
+        params["despues_de"] = despues_de
+
+def _where(condiciones: List[str]) -> str:
+    return f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
 
 class NotificacionAnalyticsRepository:
     """
@@ -8,31 +33,166 @@ class NotificacionAnalyticsRepository:
     Orientado a consultas de lectura pesadas y análisis de datos históricos.
     """
     
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, cache: Optional[CachePostulados] = None):
         self.session = session
+        # Resultado completo de la vista compartido por los endpoints de monitoreo
+        self.cache_postulados = cache or get_cache_postulados()
     
 
     def get_postulados_por_convocatoria(
         self, 
+        usar_cache: bool = True
     ) -> List[Dict[str, Any]]:
         """
-        Obtener distribución de notificaciones por tipo.
-        """
-        query = text("""
-            SELECT 
-                *
-            FROM postulados_por_convocatoria_python
-        """)
-        
-        results = self.session.exec(query).all() #type: ignore
-        
-        return [
-            {
-                "id_empresa": row[0],
-                "id_convocatoria": row[1],
-                "titulo": row[2],
-                "total_postulados": row[3]
-            }
-            for row in results
-        ]
-    
\ No newline at end of file
+        Obtener el total de postulados de todas las convocatorias activas como lista de dicts.
+        """
+        return [dict(zip(CAMPOS_POSTULADOS, fila)) for fila in self.get_filas_postulados(usar_cache)]
+
+    def get_filas_postulados(self, usar_cache: bool = True) -> Sequence[ConvocatoriaPostuladosRow]:
+        """
+        Vista completa como registros compactos ordenados por id_convocatoria.
+
+        Args:
+            usar_cache: Con True se sirve de la caché del proceso (CACHE_POSTULADOS_TTL_SEGUNDOS);
+                si está vacía o vencida, los llamadores concurrentes comparten una sola consulta
+        """
+        if not usar_cache:
+            return tuple(self.iter_postulados_por_convocatoria())
+        return self.cache_postulados.obtener(self.iter_postulados_por_convocatoria)
+
+    def get_postulados_vigentes(
+        self,
+        shard: Optional[Tuple[int, int]] = None,
+        despues_de: Optional[int] = None
+    ) -> Optional[Tuple[Iterator[ConvocatoriaPostuladosRow], Optional[datetime]]]:
+        """
+        Recorrido de la vista cacheada con los mismos filtros y orden que
+        iter_postulados_por_convocatoria, solo si la caché está vigente (no consulta Synapse).
+
+        Returns:
+            (filas, mayor fecha de cambio de la lectura cacheada, según el reloj de Synapse),
+            o None si no hay caché vigente
+        """
+        vigente = self.cache_postulados.vigente()
+        if vigente is None:
+            return None
+        filas, _ = vigente
+        marca_origen = max((fila.fecha_cambio for fila in filas if fila.fecha_cambio is not None), default=None)
+        inicio = 0 if despues_de is None else bisect_right(filas, despues_de, key=lambda fila: fila.id_convocatoria)
+        recorrido = (
+            filas[i] for i in range(inicio, len(filas))
+            if shard is None or filas[i].id_empresa % shard[1] == shard[0]
+        )
+        return recorrido, marca_origen
+
+    def invalidar_cache_postulados(self) -> None:
+        """Descarta la vista cacheada; la próxima lectura consulta Synapse"""
+        self.cache_postulados.invalidar()
+
+    def get_marca_origen(self, shard: Optional[Tuple[int, int]] = None) -> Optional[datetime]:
+        """
+        Mayor fecha de cambio de la vista (SYNAPSE_COLUMNA_CAMBIO), leída con el reloj de
+        Synapse. Tomada antes de una reconciliación completa, es la marca de agua que esta
+        cubre: todo cambio posterior tiene una fecha mayor.
+
+        Args:
+            shard: (indice, total) para considerar solo las empresas del shard
+        """
+        condiciones, params = _filtro_shard(shard)
+        query = text(f"""
+            SELECT MAX({COLUMNA_CAMBIO_SYNAPSE}) AS marca
+            FROM {VISTA_POSTULADOS}
+            {_where(condiciones)}
+        """).columns(marca=DateTime)
+        return self.session.execute(query, params).scalar()
+
+    def iter_postulados_por_convocatoria(
+        self,
+        tamano_bloque: int = TAMANO_BLOQUE_SYNAPSE,
+        shard: Optional[Tuple[int, int]] = None,
+        despues_de: Optional[int] = None
+    ) -> Iterator[ConvocatoriaPostuladosRow]:
+        """
+        Recorre la vista de postulados en streaming, sin cargarla completa en memoria.
+
+        Solo proyecta las columnas necesarias (más la fecha de cambio, que llega en
+        fecha_cambio) y lee con cursor del lado del servidor en bloques de tamaño fijo,
+        ordenado por id_convocatoria para poder reanudar una lectura interrumpida.
+
+        Args:
+            tamano_bloque: Cantidad de filas traídas por cada fetch
+            shard: (indice, total) para leer solo las empresas con id_empresa % total == indice
+            despues_de: Solo las convocatorias con id_convocatoria mayor (reanudación)
+
+        Yields:
+            Registros compactos ConvocatoriaPostuladosRow
+        """
+        condiciones, params = _filtro_shard(shard)
+        _filtro_reanudacion(despues_de, condiciones, params)
+
+        query = text(f"""
+            SELECT {COLUMNAS_POSTULADOS}, {COLUMNA_CAMBIO_SYNAPSE}
+            FROM {VISTA_POSTULADOS}
+            {_where(condiciones)}
+            ORDER BY id_convocatoria
+        """).columns(**{COLUMNA_CAMBIO_SYNAPSE: DateTime})
+
+        return self._iter_query(query, params, tamano_bloque)
+
+    def iter_postulados_modificados_desde(
+        self,
+        desde: datetime,
+        tamano_bloque: int = TAMANO_BLOQUE_SYNAPSE,
+        shard: Optional[Tuple[int, int]] = None,
+        despues_de: Optional[int] = None
+    ) -> Iterator[ConvocatoriaPostuladosRow]:
+        """
+        Recorre en streaming solo las convocatorias cuyo conteo cambió después de `desde`.
+
+        Usa la columna de fecha de cambio de la vista (SYNAPSE_COLUMNA_CAMBIO) y la
+        devuelve en fecha_cambio para que el llamador avance su marca de agua.
+        Ordenado por id_convocatoria, como iter_postulados_por_convocatoria.
+
+        Args:
+            desde: Marca de agua de la última ejecución procesada
+            tamano_bloque: Cantidad de filas traídas por cada fetch
+            shard: (indice, total) para leer solo las empresas con id_empresa % total == indice
+            despues_de: Solo las convocatorias con id_convocatoria mayor (reanudación)
+
+        Yields:
+            Registros compactos ConvocatoriaPostuladosRow con fecha_cambio
+        """
+        condiciones, params = _filtro_shard(shard)
+        condiciones.append(f"{COLUMNA_CAMBIO_SYNAPSE} > :desde")
+        params["desde"] = desde
+        _filtro_reanudacion(despues_de, condiciones, params)
+
+        # Tipado explícito para que la fecha llegue como datetime en cualquier driver
+        query = text(f"""
+            SELECT {COLUMNAS_POSTULADOS}, {COLUMNA_CAMBIO_SYNAPSE}
+            FROM {VISTA_POSTULADOS}
+            {_where(condiciones)}
+            ORDER BY id_convocatoria
+        """).columns(**{COLUMNA_CAMBIO_SYNAPSE: DateTime})
+
+        return self._iter_query(query, params, tamano_bloque)
+
+    def _iter_query(
+        self,
+        query,
+        params: Dict[str, Any],
+        tamano_bloque: int
+    ) -> Iterator[ConvocatoriaPostuladosRow]:
+        """Ejecuta la consulta con cursor del lado del servidor y la recorre por particiones"""
+        resultado = self.session.execute(
+            query,
+            params,
+            execution_options={"stream_results": True, "yield_per": tamano_bloque}
+        )
+
+        try:
+            for particion in resultado.partitions(tamano_bloque):
+                for fila in particion:
+                    yield ConvocatoriaPostuladosRow(*fila)
+        finally:
+            resultado.close()
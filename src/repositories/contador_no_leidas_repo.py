@@ -0,0 +1,248 @@
+from collections import defaultdict
+from sqlmodel import Session, select, delete, func, cast, String
+from sqlalchemy import insert, update, inspect, literal, bindparam
+from sqlalchemy.exc import IntegrityError
+from typing import Any, Dict, Iterable, List, Set, Tuple
+from ..models.contador_no_leidas import ContadorNoLeidas
+from ..models.notificacion import Notificacion
+
+AMBITO_USUARIO = "usuario"
+AMBITO_EMPRESA = "empresa"
+
+# Destinatario de las notificaciones del scheduler, dirigidas a la empresa y no a un usuario.
+# No lleva contador de ámbito usuario: todos los shards lo actualizarían en cada bloque
+ID_USUARIO_SISTEMA = 0
+
+# (ambito, id_ambito, tipo_notificacion, prioridad) -> variación del contador
+ClaveContador = Tuple[str, int, str, str]
+Deltas = Dict[ClaveContador, int]
+
+_CAMPOS_CLAVE = ("id_usuario", "id_empresa", "tipo_notificacion", "prioridad", "leida")
+
+# Con más variaciones que esto se ajusta en bloque (executemany) en lugar de clave por clave
+MAX_AJUSTES_INDIVIDUALES = 4
+
+# Tamaño máximo de las listas IN, por debajo del límite de parámetros de SQLite/SQL Server
+MAX_PARAMETROS_IN = 900
+
+
+def _prioridad(valor: Any) -> str:
+    # Notificacion guarda la prioridad como texto y NotificacionInt como entero
+    return "" if valor is None else str(valor)
+
+
+def _claves(id_usuario: int, id_empresa: int, tipo: str, prioridad: Any) -> Tuple[ClaveContador, ...]:
+    clave_empresa = (AMBITO_EMPRESA, id_empresa, tipo, _prioridad(prioridad))
+    if id_usuario == ID_USUARIO_SISTEMA:
+        return (clave_empresa,)
+    return ((AMBITO_USUARIO, id_usuario, tipo, _prioridad(prioridad)), clave_empresa)
+
+
+class ContadorNoLeidasRepository:
+    """
+    Repositorio de los contadores de no leídas.
+    ajustar() no hace commit: debe llamarse dentro de la transacción de la escritura
+    de notificaciones correspondiente.
+    """
+
+    ## CÁLCULO DE VARIACIONES
+
+    @staticmethod
+    def deltas_alta(notificaciones: Iterable[Any], signo: int = 1) -> Deltas:
+        """Variación por notificaciones creadas (signo=1) o eliminadas (signo=-1)"""
+        deltas: Deltas = defaultdict(int)
+        for n in notificaciones:
+            if not n.leida:
+                for clave in _claves(n.id_usuario, n.id_empresa, n.tipo_notificacion, n.prioridad):
+                    deltas[clave] += signo
+        return deltas
+
+    @staticmethod
+    def deltas_cambio(notificaciones: Iterable[Any]) -> Deltas:
+        """
+        Variación por notificaciones modificadas en la sesión y aún no enviadas (flush).
+        Compara el estado cargado con el actual usando el historial de atributos.
+        """
+        deltas: Deltas = defaultdict(int)
+        for n in notificaciones:
+            estado = inspect(n)
+            anterior, actual = {}, {}
+            for campo in _CAMPOS_CLAVE:
+                historial = estado.attrs[campo].history
+                actual[campo] = getattr(n, campo)
+                anterior[campo] = historial.deleted[0] if historial.deleted else actual[campo]
+
+            if anterior == actual:
+                continue
+            if not anterior["leida"]:
+                for clave in _claves(anterior["id_usuario"], anterior["id_empresa"], anterior["tipo_notificacion"], anterior["prioridad"]):
+                    deltas[clave] -= 1
+            if not actual["leida"]:
+                for clave in _claves(actual["id_usuario"], actual["id_empresa"], actual["tipo_notificacion"], actual["prioridad"]):
+                    deltas[clave] += 1
+        return deltas
+
+    ## ESCRITURA
+
+    def ajustar(self, session: Session, deltas: Deltas) -> None:
+        """
+        Aplica las variaciones a los contadores (sin commit).
+        Las claves se recorren ordenadas para que las escrituras concurrentes bloqueen las
+        filas de contadores siempre en el mismo orden y no se produzcan interbloqueos.
+        """
+        deltas = {clave: delta for clave, delta in sorted(deltas.items()) if delta != 0}
+        if len(deltas) > MAX_AJUSTES_INDIVIDUALES:
+            self._ajustar_en_bloque(session, deltas)
+        else:
+            for clave, delta in deltas.items():
+                self._ajustar_clave(session, clave, delta)
+
+    def _ajustar_clave(self, session: Session, clave: ClaveContador, delta: int) -> None:
+        """UPDATE del contador y, si no existe y el delta es positivo, INSERT"""
+        tabla = ContadorNoLeidas.__table__  # type: ignore
+        ambito, id_ambito, tipo, prioridad = clave
+
+        condicion = (
+            (tabla.c.ambito == ambito)
+            & (tabla.c.id_ambito == id_ambito)
+            & (tabla.c.tipo_notificacion == tipo)
+            & (tabla.c.prioridad == prioridad)
+        )
+        actualizar = update(tabla).where(condicion).values(total=tabla.c.total + delta)
+
+        if session.execute(actualizar).rowcount or delta < 0:
+            return
+
+        try:
+            with session.begin_nested():
+                session.execute(insert(tabla).values(
+                    ambito=ambito, id_ambito=id_ambito, tipo_notificacion=tipo,
+                    prioridad=prioridad, total=delta
+                ))
+        except IntegrityError:
+            # Otra transacción creó la fila en paralelo
+            session.execute(actualizar)
+
+    def _ajustar_en_bloque(self, session: Session, deltas: Deltas) -> None:
+        """
+        Variaciones de una escritura masiva (p. ej. un lote del scheduler): las claves
+        existentes se leen con una consulta por ámbito y se actualizan con un solo
+        executemany; las nuevas se insertan con otro. Ambos conservan el orden de `deltas`.
+        """
+        tabla = ContadorNoLeidas.__table__  # type: ignore
+        existentes = self._claves_existentes(session, deltas.keys())
+
+        actualizaciones = [
+            {"b_ambito": ambito, "b_id_ambito": id_ambito, "b_tipo": tipo, "b_prioridad": prioridad, "b_delta": delta}
+            for (ambito, id_ambito, tipo, prioridad), delta in deltas.items()
+            if (ambito, id_ambito, tipo, prioridad) in existentes
+        ]
+        # Un contador inexistente con delta negativo no tiene nada que descontar
+        nuevas = {clave: delta for clave, delta in deltas.items() if clave not in existentes and delta > 0}
+
+        if actualizaciones:
+            session.execute(
+                update(tabla)
+                .where(
+                    (tabla.c.ambito == bindparam("b_ambito"))
+                    & (tabla.c.id_ambito == bindparam("b_id_ambito"))
+                    & (tabla.c.tipo_notificacion == bindparam("b_tipo"))
+                    & (tabla.c.prioridad == bindparam("b_prioridad"))
+                )
+                .values(total=tabla.c.total + bindparam("b_delta")),
+                actualizaciones
+            )
+
+        if not nuevas:
+            return
+        try:
+            with session.begin_nested():
+                session.execute(insert(tabla), [
+                    {"ambito": ambito, "id_ambito": id_ambito, "tipo_notificacion": tipo, "prioridad": prioridad, "total": delta}
+                    for (ambito, id_ambito, tipo, prioridad), delta in nuevas.items()
+                ])
+        except IntegrityError:
+            # Otra transacción creó alguna de las filas en paralelo: se resuelven una por una
+            for clave, delta in nuevas.items():
+                self._ajustar_clave(session, clave, delta)
+
+    def _claves_existentes(self, session: Session, claves: Iterable[ClaveContador]) -> Set[ClaveContador]:
+        """Claves que ya tienen contador, consultando por ámbito e id (portátil, sin IN de tuplas)"""
+        tabla = ContadorNoLeidas.__table__  # type: ignore
+        ids_por_ambito: Dict[str, Set[int]] = defaultdict(set)
+        for ambito, id_ambito, _, _ in claves:
+            ids_por_ambito[ambito].add(id_ambito)
+
+        existentes: Set[ClaveContador] = set()
+        for ambito, ids in ids_por_ambito.items():
+            ids_ordenados: List[int] = sorted(ids)
+            for inicio in range(0, len(ids_ordenados), MAX_PARAMETROS_IN):
+                stmt = select(
+                    tabla.c.ambito, tabla.c.id_ambito, tabla.c.tipo_notificacion, tabla.c.prioridad
+                ).where(
+                    tabla.c.ambito == ambito,
+                    tabla.c.id_ambito.in_(ids_ordenados[inicio:inicio + MAX_PARAMETROS_IN])
+                )
+                existentes.update(tuple(fila) for fila in session.execute(stmt))
+        return existentes
+
+    def recalcular(self, session: Session) -> int:
+        """
+        Reconstruye todos los contadores a partir de la tabla notificaciones.
+        Sirve para la carga inicial y para corregir desvíos.
+
+        Returns:
+            Cantidad de contadores generados
+        """
+        tabla = ContadorNoLeidas.__table__  # type: ignore
+        prioridad = func.coalesce(cast(Notificacion.prioridad, String), "")
+
+        session.execute(delete(tabla))
+        generados = 0
+        for ambito, columna in ((AMBITO_USUARIO, Notificacion.id_usuario), (AMBITO_EMPRESA, Notificacion.id_empresa)):
+            condiciones = [Notificacion.leida == False]
+            if ambito == AMBITO_USUARIO:
+                condiciones.append(Notificacion.id_usuario != ID_USUARIO_SISTEMA)
+            origen = (
+                select(
+                    literal(ambito), columna, Notificacion.tipo_notificacion, prioridad, func.count()
+                )
+                .where(*condiciones)
+                .group_by(columna, Notificacion.tipo_notificacion, prioridad)
+            )
+            resultado = session.execute(
+                insert(tabla).from_select(
+                    ["ambito", "id_ambito", "tipo_notificacion", "prioridad", "total"], origen
+                )
+            )
+            generados += max(resultado.rowcount, 0)
+
+        session.commit()
+        return generados
+
+    ## LECTURA
+
+    def get_conteo(self, session: Session, ambito: str, id_ambito: int) -> Dict[str, Any]:
+        """
+        Conteo de no leídas de un usuario o empresa, desglosado por tipo y prioridad
+
+        Returns:
+            Dict con total, por_tipo y por_prioridad
+        """
+        stmt = select(ContadorNoLeidas).where(
+            ContadorNoLeidas.ambito == ambito,
+            ContadorNoLeidas.id_ambito == id_ambito,
+            ContadorNoLeidas.total > 0
+        )
+
+        por_tipo: Dict[str, int] = defaultdict(int)
+        por_prioridad: Dict[str, int] = defaultdict(int)
+        for contador in session.exec(stmt).all():
+            por_tipo[contador.tipo_notificacion] += contador.total
+            por_prioridad[contador.prioridad or "SIN_PRIORIDAD"] += contador.total
+
+        return {
+            "total": sum(por_tipo.values()),
+            "por_tipo": dict(por_tipo),
+            "por_prioridad": dict(por_prioridad),
+        }
@@ -1,7 +1,28 @@
-from sqlmodel import Session, select
-from typing import List, Dict, Optional
+from sqlmodel import Session, select, text
+from typing import List, Dict, Optional, Iterator, Tuple
 from datetime import datetime
 from ..models.convocatoria_snapshot import ConvocatoriaSnapshot
+from ..dto.postulacion_dto import IndiceSnapshots
+
+TABLA_STAGING_SNAPSHOTS = "#convocatoria_snapshots_staging"
+
+# Tamaño máximo de las listas IN, por debajo del límite de parámetros de SQLite/SQL Server
+MAX_PARAMETROS_IN = 900
+
+# Filas por fetch al construir el índice de snapshots
+TAMANO_FETCH_INDICE = 10_000
+
+def _bloques_de_ids(ids: List[int]) -> Iterator[List[int]]:
+    """Parte una lista de IDs en bloques aptos para una cláusula IN"""
+    for inicio in range(0, len(ids), MAX_PARAMETROS_IN):
+        yield ids[inicio:inicio + MAX_PARAMETROS_IN]
+
+def _total_actualizado(actual: str, nuevo: str, solo_aumentar: bool) -> str:
+    """Expresión SQL del total_postulados al actualizar un snapshot existente"""
+    if not solo_aumentar:
+        return nuevo
+    return f"CASE WHEN {nuevo} > {actual} THEN {nuevo} ELSE {actual} END"
+
 
 class ConvocatoriaSnapshotRepository:
     """Repositorio para gestionar snapshots de conteos de postulaciones"""
@@ -37,6 +58,55 @@ class ConvocatoriaSnapshotRepository:
         )
         return list(self.session.exec(stmt).all())
     
+    def get_indice_snapshots(
+        self,
+        shard: Optional[Tuple[int, int]] = None,
+        ids_convocatoria: Optional[List[int]] = None,
+        con_titulo: bool = False
+    ) -> IndiceSnapshots:
+        """
+        Índice compacto id_convocatoria -> total_postulados de los snapshots, leído con una
+        consulta proyectada: no se crean entidades ORM ni se registran en la sesión.
+
+        Args:
+            shard: (indice, total) para quedarse con las empresas con id_empresa % total == indice
+            ids_convocatoria: Solo estas convocatorias (p. ej. las de un bloque)
+            con_titulo: Cargar también el título de cada snapshot
+
+        Returns:
+            Índice ordenado por id_convocatoria
+        """
+        columnas = [ConvocatoriaSnapshot.id_convocatoria, ConvocatoriaSnapshot.total_postulados]
+        if con_titulo:
+            columnas.append(ConvocatoriaSnapshot.titulo)
+        base = select(*columnas).order_by(ConvocatoriaSnapshot.id_convocatoria)
+        if shard is not None:
+            indice, total = shard
+            base = base.where(ConvocatoriaSnapshot.id_empresa % total == indice)
+
+        if ids_convocatoria is None:
+            consultas = [base]
+        else:
+            # Con los IDs ordenados, cada bloque IN devuelve un tramo contiguo del índice
+            consultas = [
+                base.where(ConvocatoriaSnapshot.id_convocatoria.in_(bloque))  # type: ignore
+                for bloque in _bloques_de_ids(sorted(set(ids_convocatoria)))
+            ]
+
+        indice_snapshots = IndiceSnapshots(titulos=[] if con_titulo else None)
+        ids, totales, titulos = indice_snapshots.ids, indice_snapshots.totales, indice_snapshots.titulos
+        for stmt in consultas:
+            resultado = self.session.execute(
+                stmt,
+                execution_options={"stream_results": True, "yield_per": TAMANO_FETCH_INDICE}
+            )
+            for fila in resultado:
+                ids.append(fila[0])
+                totales.append(fila[1])
+                if titulos is not None:
+                    titulos.append(fila[2])
+        return indice_snapshots
+    
     def crear_o_actualizar_sanpshot(
             self,
             id_empresa: int,
@@ -101,6 +171,183 @@ class ConvocatoriaSnapshotRepository:
             )
 
         return resultados
+
+    def upsert_masivo_snapshots(
+        self,
+        snapshots_data: List[Dict],
+        confirmar: bool = True,
+        solo_aumentar: bool = False
+    ) -> Dict[str, int]:
+        """
+        Inserta o actualiza todos los snapshots del lote con una sola sentencia
+        basada en conjuntos y dentro de una única transacción.
+
+        En SQL Server el lote se carga en una tabla temporal y se aplica con MERGE;
+        en SQLite (ejecuciones locales) se usa INSERT ... ON CONFLICT. Para otros
+        motores se separan las existentes y se aplican un UPDATE y un INSERT por lote,
+        dentro de la misma transacción.
+
+        Args:
+            snapshots_data: Lista de dicts con id_empresa, id_convocatoria, titulo, total_postulados
+            confirmar: Con False no se hace commit ni rollback: el upsert forma parte de una
+                transacción mayor del llamador
+            solo_aumentar: Con True un snapshot existente nunca baja su total_postulados (se
+                conserva el mayor); para lotes que pueden ser más viejos que el snapshot
+
+        Returns:
+            Dict con la cantidad de snapshots insertados y actualizados
+        """
+        # Si una convocatoria aparece varias veces en el lote, prevalece la última
+        filas = {
+            data['id_convocatoria']: {
+                'id_empresa': data['id_empresa'],
+                'id_convocatoria': data['id_convocatoria'],
+                'titulo': data['titulo'],
+                'total_postulados': data['total_postulados'],
+            }
+            for data in snapshots_data
+        }
+
+        if not filas:
+            return {"insertados": 0, "actualizados": 0}
+
+        dialecto = self.session.get_bind().dialect.name
+        ahora = datetime.utcnow()
+        parametros = [{**fila, 'ultima_actualizacion': ahora} for fila in filas.values()]
+
+        try:
+            if dialecto == "mssql":
+                resultado = self._merge_sql_server(parametros, solo_aumentar)
+            elif dialecto == "sqlite":
+                resultado = self._upsert_sqlite(parametros, solo_aumentar)
+            else:
+                resultado = self._upsert_generico(parametros, solo_aumentar)
+
+            if confirmar:
+                self.session.commit()
+            return resultado
+
+        except Exception as e:
+            if confirmar:
+                self.session.rollback()
+            raise e
+
+    def _merge_sql_server(self, parametros: List[Dict], solo_aumentar: bool) -> Dict[str, int]:
+        """Carga el lote en una tabla temporal y lo aplica con un único MERGE"""
+        total = _total_actualizado("destino.total_postulados", "origen.total_postulados", solo_aumentar)
+        self.session.execute(text(f"""
+            IF OBJECT_ID('tempdb..{TABLA_STAGING_SNAPSHOTS}') IS NOT NULL
+                DROP TABLE {TABLA_STAGING_SNAPSHOTS};
+            CREATE TABLE {TABLA_STAGING_SNAPSHOTS} (
+                id_empresa INT NOT NULL,
+                id_convocatoria INT NOT NULL PRIMARY KEY,
+                titulo NVARCHAR(4000) NOT NULL,
+                total_postulados INT NOT NULL,
+                ultima_actualizacion DATETIME2 NOT NULL
+            );
+        """))
+
+        # executemany: con fast_executemany en el engine se envía en bloque
+        self.session.execute(
+            text(f"""
+                INSERT INTO {TABLA_STAGING_SNAPSHOTS}
+                    (id_empresa, id_convocatoria, titulo, total_postulados, ultima_actualizacion)
+                VALUES
+                    (:id_empresa, :id_convocatoria, :titulo, :total_postulados, :ultima_actualizacion)
+            """),
+            parametros
+        )
+
+        acciones = self.session.execute(text(f"""
+            MERGE convocatoria_snapshots WITH (HOLDLOCK) AS destino
+            USING {TABLA_STAGING_SNAPSHOTS} AS origen
+                ON destino.id_convocatoria = origen.id_convocatoria
+            WHEN MATCHED THEN UPDATE SET
+                destino.id_empresa = origen.id_empresa,
+                destino.titulo = origen.titulo,
+                destino.total_postulados = {total},
+                destino.ultima_actualizacion = origen.ultima_actualizacion
+            WHEN NOT MATCHED BY TARGET THEN
+                INSERT (id_empresa, id_convocatoria, titulo, total_postulados, ultima_actualizacion)
+                VALUES (origen.id_empresa, origen.id_convocatoria, origen.titulo,
+                        origen.total_postulados, origen.ultima_actualizacion)
+            OUTPUT $action;
+        """)).scalars().all()
+
+        self.session.execute(text(f"DROP TABLE {TABLA_STAGING_SNAPSHOTS}"))
+
+        return {
+            "insertados": sum(1 for accion in acciones if accion == "INSERT"),
+            "actualizados": sum(1 for accion in acciones if accion == "UPDATE"),
+        }
+
+    def _upsert_sqlite(self, parametros: List[Dict], solo_aumentar: bool) -> Dict[str, int]:
+        """Aplica el lote con INSERT ... ON CONFLICT (ejecuciones locales)"""
+        existentes = self._contar_existentes([p['id_convocatoria'] for p in parametros])
+        total = _total_actualizado("convocatoria_snapshots.total_postulados", "excluded.total_postulados", solo_aumentar)
+
+        self.session.execute(
+            text(f"""
+                INSERT INTO convocatoria_snapshots
+                    (id_empresa, id_convocatoria, titulo, total_postulados, ultima_actualizacion)
+                VALUES
+                    (:id_empresa, :id_convocatoria, :titulo, :total_postulados, :ultima_actualizacion)
+                ON CONFLICT (id_convocatoria) DO UPDATE SET
+                    id_empresa = excluded.id_empresa,
+                    titulo = excluded.titulo,
+                    total_postulados = {total},
+                    ultima_actualizacion = excluded.ultima_actualizacion
+            """),
+            parametros
+        )
+
+        return {"insertados": len(parametros) - existentes, "actualizados": existentes}
+
+    def _upsert_generico(self, parametros: List[Dict], solo_aumentar: bool) -> Dict[str, int]:
+        """Actualiza las existentes y después inserta las nuevas, sin confirmar"""
+        total = _total_actualizado("total_postulados", ":total_postulados", solo_aumentar)
+        existentes = set(self._get_ids_existentes([p['id_convocatoria'] for p in parametros]))
+        actualizar = [p for p in parametros if p['id_convocatoria'] in existentes]
+        insertar = [p for p in parametros if p['id_convocatoria'] not in existentes]
+
+        if actualizar:
+            self.session.execute(
+                text(f"""
+                    UPDATE convocatoria_snapshots SET
+                        id_empresa = :id_empresa,
+                        titulo = :titulo,
+                        total_postulados = {total},
+                        ultima_actualizacion = :ultima_actualizacion
+                    WHERE id_convocatoria = :id_convocatoria
+                """),
+                actualizar
+            )
+        if insertar:
+            self.session.execute(
+                text("""
+                    INSERT INTO convocatoria_snapshots
+                        (id_empresa, id_convocatoria, titulo, total_postulados, ultima_actualizacion)
+                    VALUES
+                        (:id_empresa, :id_convocatoria, :titulo, :total_postulados, :ultima_actualizacion)
+                """),
+                insertar
+            )
+
+        return {"insertados": len(insertar), "actualizados": len(actualizar)}
+
+    def _get_ids_existentes(self, ids_convocatoria: List[int]) -> List[int]:
+        """IDs de las convocatorias dadas que ya tienen snapshot"""
+        existentes: List[int] = []
+        for bloque in _bloques_de_ids(ids_convocatoria):
+            stmt = select(ConvocatoriaSnapshot.id_convocatoria).where(
+                ConvocatoriaSnapshot.id_convocatoria.in_(bloque)  # type: ignore
+            )
+            existentes.extend(self.session.exec(stmt).all())
+        return existentes
+
+    def _contar_existentes(self, ids_convocatoria: List[int]) -> int:
+        """Cuenta cuántas de las convocatorias dadas ya tienen snapshot"""
+        return len(self._get_ids_existentes(ids_convocatoria))
     
     def eliminar_snapshot(self, id_convocatoria: int) -> bool:
         """
@@ -0,0 +1,96 @@
+import uuid
+from sqlmodel import Session, select
+from typing import Optional
+from datetime import datetime
+from ..models.ejecucion_scheduler import EjecucionScheduler
+
+ESTADO_EN_CURSO = "en_curso"
+ESTADO_COMPLETADA = "completada"
+ESTADO_ABANDONADA = "abandonada"
+
+class EjecucionSchedulerRepository:
+    """Repositorio de los puntos de control de las ejecuciones del scheduler"""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def get_en_curso(self, proceso: str) -> Optional[EjecucionScheduler]:
+        """
+        Obtiene la ejecución sin terminar más reciente de un proceso
+
+        Args:
+            proceso: Nombre del proceso (incluye el shard)
+
+        Returns:
+            La ejecución a reanudar, o None si la última terminó
+        """
+        stmt = (
+            select(EjecucionScheduler)
+            .where(EjecucionScheduler.proceso == proceso, EjecucionScheduler.estado == ESTADO_EN_CURSO)
+            .order_by(EjecucionScheduler.fecha_inicio.desc())  # type: ignore
+        )
+        return self.session.exec(stmt).first()
+
+    def iniciar(self, proceso: str, modo: str, desde: Optional[datetime], marca_anterior: Optional[datetime]) -> EjecucionScheduler:
+        """Registra una ejecución nueva (se confirma antes de procesar el primer bloque)"""
+        ejecucion = EjecucionScheduler(
+            id_ejecucion=str(uuid.uuid4()),
+            proceso=proceso,
+            modo=modo,
+            estado=ESTADO_EN_CURSO,
+            desde=desde,
+            nueva_marca=marca_anterior
+        )
+        self.session.add(ejecucion)
+        self.session.commit()
+        self.session.refresh(ejecucion)
+        return ejecucion
+
+    def reanudar(self, ejecucion: EjecucionScheduler) -> EjecucionScheduler:
+        ejecucion.reanudaciones += 1
+        ejecucion.fecha_actualizacion = datetime.utcnow()
+        self.session.add(ejecucion)
+        self.session.commit()
+        self.session.refresh(ejecucion)
+        return ejecucion
+
+    def abandonar(self, ejecucion: EjecucionScheduler) -> None:
+        """Descarta una ejecución que no se reanudará; lo ya confirmado se conserva"""
+        ejecucion.estado = ESTADO_ABANDONADA
+        ejecucion.fecha_actualizacion = datetime.utcnow()
+        self.session.add(ejecucion)
+        self.session.commit()
+
+    def registrar_bloque(
+        self,
+        ejecucion: EjecucionScheduler,
+        ultima_clave: int,
+        nueva_marca: Optional[datetime],
+        convocatorias: int,
+        con_incremento: int,
+        notificaciones: int,
+        insertados: int,
+        actualizados: int,
+        agrupadas: int = 0
+    ) -> None:
+        """
+        Avanza el punto de control con un bloque procesado. No hace commit: se confirma
+        junto con las notificaciones y los snapshots del bloque.
+        """
+        ejecucion.ultima_clave = ultima_clave
+        ejecucion.nueva_marca = nueva_marca
+        ejecucion.bloques_confirmados += 1
+        ejecucion.convocatorias_procesadas += convocatorias
+        ejecucion.convocatorias_con_incremento += con_incremento
+        ejecucion.notificaciones_creadas += notificaciones
+        ejecucion.notificaciones_agrupadas += agrupadas
+        ejecucion.snapshots_insertados += insertados
+        ejecucion.snapshots_actualizados += actualizados
+        ejecucion.fecha_actualizacion = datetime.utcnow()
+        self.session.add(ejecucion)
+
+    def completar(self, ejecucion: EjecucionScheduler) -> None:
+        ejecucion.estado = ESTADO_COMPLETADA
+        ejecucion.fecha_actualizacion = datetime.utcnow()
+        self.session.add(ejecucion)
+        self.session.commit()
@@ -0,0 +1,116 @@
+from sqlmodel import Session
+from sqlalchemy import update, or_
+from sqlalchemy.exc import IntegrityError
+from typing import Optional
+from datetime import datetime, timedelta
+from ..models.lease_proceso import LeaseProceso
+
+class LeaseRepository:
+    """
+    Repositorio de los leases de ejecución exclusiva de los procesos programados.
+    Cada operación es un UPDATE condicional con su propio commit: la base de datos
+    decide quién gana ante llamadores concurrentes, aunque estén en instancias distintas.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def get(self, proceso: str) -> Optional[LeaseProceso]:
+        """Estado actual del lease de un proceso, leído de la base (sin caché de la sesión)"""
+        return self.session.get(LeaseProceso, proceso, populate_existing=True)
+
+    def adquirir(self, proceso: str, titular: str, duracion_segundos: float) -> bool:
+        """
+        Toma el lease si está libre o vencido
+
+        Args:
+            proceso: Nombre del proceso
+            titular: Identificador de la ejecución que lo toma
+            duracion_segundos: Vigencia del lease (se extiende con renovar)
+
+        Returns:
+            True si se obtuvo el lease
+        """
+        self._asegurar_registro(proceso)
+        ahora = datetime.utcnow()
+        tabla = LeaseProceso.__table__  # type: ignore
+        try:
+            resultado = self.session.execute(
+                update(tabla)
+                .where(
+                    tabla.c.proceso == proceso,
+                    or_(tabla.c.titular.is_(None), tabla.c.expira < ahora)
+                )
+                .values(
+                    titular=titular,
+                    expira=ahora + timedelta(seconds=duracion_segundos),
+                    fecha_adquisicion=ahora
+                )
+            )
+            self.session.commit()
+            return resultado.rowcount == 1
+        except Exception as e:
+            self.session.rollback()
+            raise e
+
+    def renovar(self, proceso: str, titular: str, duracion_segundos: float) -> bool:
+        """
+        Extiende el lease de una ejecución en curso
+
+        Returns:
+            False si la ejecución ya no es titular (el lease venció y lo tomó otra)
+        """
+        tabla = LeaseProceso.__table__  # type: ignore
+        try:
+            resultado = self.session.execute(
+                update(tabla)
+                .where(tabla.c.proceso == proceso, tabla.c.titular == titular)
+                .values(expira=datetime.utcnow() + timedelta(seconds=duracion_segundos))
+            )
+            self.session.commit()
+            return resultado.rowcount == 1
+        except Exception as e:
+            self.session.rollback()
+            raise e
+
+    def liberar(self, proceso: str, titular: str, resultado: Optional[str]) -> bool:
+        """
+        Libera el lease y publica el resumen de la ejecución para quienes la esperaban
+
+        Args:
+            proceso: Nombre del proceso
+            titular: Ejecución que tenía el lease
+            resultado: Resumen serializado en JSON, o None si la ejecución falló
+
+        Returns:
+            False si la ejecución ya no era titular
+        """
+        tabla = LeaseProceso.__table__  # type: ignore
+        try:
+            filas = self.session.execute(
+                update(tabla)
+                .where(tabla.c.proceso == proceso, tabla.c.titular == titular)
+                .values(
+                    titular=None,
+                    expira=None,
+                    ultimo_titular=titular,
+                    ultimo_resultado=resultado,
+                    fecha_liberacion=datetime.utcnow()
+                )
+            )
+            self.session.commit()
+            return filas.rowcount == 1
+        except Exception as e:
+            self.session.rollback()
+            raise e
+
+    def _asegurar_registro(self, proceso: str) -> None:
+        """Crea el registro libre del proceso la primera vez"""
+        if self.session.get(LeaseProceso, proceso) is not None:
+            return
+        try:
+            self.session.add(LeaseProceso(proceso=proceso))
+            self.session.commit()
+        except IntegrityError:
+            # Otro llamador lo creó al mismo tiempo
+            self.session.rollback()
@@ -0,0 +1,49 @@
+from sqlmodel import Session
+from typing import Optional
+from datetime import datetime
+from ..models.marca_agua_scheduler import MarcaAguaScheduler
+
+class MarcaAguaRepository:
+    """Repositorio para las marcas de agua de los procesos programados"""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def get_marca(self, proceso: str) -> Optional[datetime]:
+        """
+        Obtiene la marca de agua de un proceso
+
+        Args:
+            proceso: Nombre del proceso
+
+        Returns:
+            Fecha de la marca si existe, None si el proceso nunca se ejecutó
+        """
+        registro = self.session.get(MarcaAguaScheduler, proceso)
+        return registro.marca if registro else None
+
+    def guardar_marca(self, proceso: str, marca: datetime, modo: str) -> MarcaAguaScheduler:
+        """
+        Crea o actualiza la marca de agua de un proceso
+
+        Args:
+            proceso: Nombre del proceso
+            marca: Nueva marca (fecha de cambio en origen hasta la que se procesó)
+            modo: Modo de la ejecución que la generó (completo / incremental)
+
+        Returns:
+            Registro de la marca guardado
+        """
+        registro = self.session.get(MarcaAguaScheduler, proceso)
+
+        if registro:
+            registro.marca = marca
+            registro.modo = modo
+            registro.ultima_ejecucion = datetime.utcnow()
+        else:
+            registro = MarcaAguaScheduler(proceso=proceso, marca=marca, modo=modo)
+
+        self.session.add(registro)
+        self.session.commit()
+        self.session.refresh(registro)
+        return registro
@@ -0,0 +1,150 @@
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional, Tuple, Any
+from uuid import UUID
+from datetime import datetime
+from ..models.notificacion import Notificacion
+from .notificacion_repo import _stmt_pagina, _stmt_version_feed, _marcar_leidas, _destinatarios_antes_y_despues
+from .contador_no_leidas_repo import ContadorNoLeidasRepository
+from ..cache.feeds import CacheFeedsNotificaciones, get_cache_feeds
+
+class NotificacionAsyncRepository:
+    """Versión asíncrona de NotificacionRepository para las rutas async"""
+
+    def __init__(
+        self,
+        contadores: Optional[ContadorNoLeidasRepository] = None,
+        cache: Optional[CacheFeedsNotificaciones] = None
+    ):
+        # Los contadores se ajustan con el código síncrono vía run_sync, en la misma transacción
+        self.contadores = contadores or ContadorNoLeidasRepository()
+        # Misma caché de feeds que el repositorio síncrono, invalidada tras cada commit
+        self.cache = cache or get_cache_feeds()
+
+    ## FUNCIONES DE OBTENER
+
+    async def get_by_id(self, session: AsyncSession, id_: UUID) -> Optional[Notificacion]:
+        return await session.get(Notificacion, id_)
+
+    async def get_by_id_usuario(self, session: AsyncSession, id_usuario: int) -> List[Notificacion]:
+        stmt = select(Notificacion).where(Notificacion.id_usuario == id_usuario)
+        results = await session.exec(stmt)
+        return list(results.all())
+
+    async def get_by_id_empresa(self, session: AsyncSession, id_empresa: int) -> List[Notificacion]:
+        stmt = select(Notificacion).where(Notificacion.id_empresa == id_empresa)
+        results = await session.exec(stmt)
+        return list(results.all())
+
+    async def get_no_leidas_by_usuario(self, session: AsyncSession, id_usuario: int) -> List[Notificacion]:
+        """Obtener notificaciones no leídas de un usuario"""
+        stmt = (
+            select(Notificacion)
+            .where(Notificacion.id_usuario == id_usuario)
+            .where(Notificacion.leida == False)
+            .order_by(Notificacion.fecha_creacion.desc())
+        )
+        results = await session.exec(stmt)
+        return list(results.all())
+
+    async def get_no_leidas_by_empresa(self, session: AsyncSession, id_empresa: int) -> List[Notificacion]:
+        """Obtener notificaciones no leídas de una empresa"""
+        stmt = (
+            select(Notificacion)
+            .where(Notificacion.id_empresa == id_empresa)
+            .where(Notificacion.leida == False)
+            .order_by(Notificacion.fecha_creacion.desc())
+        )
+        results = await session.exec(stmt)
+        return list(results.all())
+
+    async def list_all(self, session: AsyncSession, skip: int = 0, limit: int = 100) -> List[Notificacion]:
+        stmt = select(Notificacion).order_by(Notificacion.fecha_creacion.desc()).offset(skip).limit(limit)
+        results = await session.exec(stmt)
+        return list(results.all())
+
+    async def get_by_status(self, session: AsyncSession) -> List[Notificacion]:
+        stmt = select(Notificacion).where(Notificacion.leida == False)
+        results = await session.exec(stmt)
+        return list(results.all())
+
+    async def get_pagina(
+        self,
+        session: AsyncSession,
+        limite: int,
+        despues_de: Optional[Tuple[datetime, Any]] = None,
+        id_usuario: Optional[int] = None,
+        id_empresa: Optional[int] = None,
+        solo_no_leidas: bool = False
+    ) -> Tuple[List[Notificacion], bool]:
+        """Obtener una página por keyset (ver NotificacionRepository.get_pagina)"""
+        stmt = _stmt_pagina(limite, despues_de, id_usuario, id_empresa, solo_no_leidas)
+        results = list((await session.exec(stmt)).all())
+        return results[:limite], len(results) > limite
+
+
+    async def get_version_feed(
+        self,
+        session: AsyncSession,
+        id_usuario: Optional[int] = None,
+        id_empresa: Optional[int] = None
+    ) -> Tuple[Any, ...]:
+        """Token de versión del feed (ver NotificacionRepository.get_version_feed)"""
+        return tuple((await session.exec(_stmt_version_feed(id_usuario, id_empresa))).one())
+
+    # FUNCIONES POST
+
+    async def create(self, session: AsyncSession, notificacion: Notificacion) -> Notificacion:
+        session.add(notificacion)
+        await session.run_sync(self.contadores.ajustar, self.contadores.deltas_alta([notificacion]))
+        await session.commit()
+        await session.refresh(notificacion)
+        self.cache.invalidar_notificaciones([notificacion])
+        return notificacion
+
+    #FUNCIONES PUT/PATCH
+
+    async def update(self, session: AsyncSession, notificacion: Notificacion) -> Notificacion:
+        deltas = self.contadores.deltas_cambio([notificacion])
+        destinatarios = _destinatarios_antes_y_despues([notificacion])
+        session.add(notificacion)
+        await session.run_sync(self.contadores.ajustar, deltas)
+        await session.commit()
+        await session.refresh(notificacion)
+        self.cache.invalidar_destinatarios(destinatarios)
+        return notificacion
+
+    async def marcar_leidas(
+        self,
+        session: AsyncSession,
+        fecha_lectura: datetime,
+        id_usuario: Optional[int] = None,
+        id_empresa: Optional[int] = None,
+        ids: Optional[List[int]] = None
+    ) -> int:
+        """Marcar como leídas en una sola sentencia (ver NotificacionRepository.marcar_leidas)"""
+        actualizadas, destinatarios = await session.run_sync(
+            _marcar_leidas, self.contadores, fecha_lectura, id_usuario, id_empresa, ids
+        )
+        self.cache.invalidar_destinatarios(destinatarios)
+        return actualizadas
+
+    async def update_many(self, session: AsyncSession, notificaciones: List[Notificacion]) -> None:
+        """Actualizar múltiples notificaciones"""
+        deltas = self.contadores.deltas_cambio(notificaciones)
+        destinatarios = _destinatarios_antes_y_despues(notificaciones)
+        for notificacion in notificaciones:
+            session.add(notificacion)
+        await session.run_sync(self.contadores.ajustar, deltas)
+        await session.commit()
+        self.cache.invalidar_destinatarios(destinatarios)
+
+
+    #FUNCIONES DELETE
+
+    async def delete(self, session: AsyncSession, notificacion: Notificacion) -> None:
+        destinatario = (notificacion.id_usuario, notificacion.id_empresa)
+        await session.delete(notificacion)
+        await session.run_sync(self.contadores.ajustar, self.contadores.deltas_alta([notificacion], signo=-1))
+        await session.commit()
+        self.cache.invalidar_destinatarios([destinatario])
@@ -1,13 +1,160 @@
-from sqlmodel import select, Session
-from typing import List, Optional, Iterator
+from sqlmodel import select, Session, or_, func, case
+from sqlalchemy import insert, update, inspect, bindparam
+from typing import List, Optional, Tuple, Any, Set, Dict, Iterable
 from uuid import UUID
+from datetime import datetime
 from ..models.notificacion import Notificacion
-from ..routes.deps.db_session import get_db
 from ..models.notificacionInt import NotificacionInt
+from .contador_no_leidas_repo import ContadorNoLeidasRepository, Deltas, _claves
+from ..cache.feeds import CacheFeedsNotificaciones, get_cache_feeds
+
+# Tamaño máximo de las listas IN, por debajo del límite de parámetros de SQLite/SQL Server
+MAX_PARAMETROS_IN = 900
+
+def _stmt_pagina(
+    limite: int,
+    despues_de: Optional[Tuple[datetime, Any]],
+    id_usuario: Optional[int],
+    id_empresa: Optional[int],
+    solo_no_leidas: bool
+):
+    """Consulta keyset compartida por los repositorios síncrono y asíncrono"""
+    stmt = select(Notificacion)
+
+    if id_usuario is not None:
+        stmt = stmt.where(Notificacion.id_usuario == id_usuario)
+    if id_empresa is not None:
+        stmt = stmt.where(Notificacion.id_empresa == id_empresa)
+    if solo_no_leidas:
+        stmt = stmt.where(Notificacion.leida == False)
+
+    if despues_de is not None:
+        fecha, id_ = despues_de
+        # La cota fecha_creacion <= fecha es redundante pero permite que el índice haga un seek por rango
+        stmt = stmt.where(
+            Notificacion.fecha_creacion <= fecha,
+            or_(
+                Notificacion.fecha_creacion < fecha,
+                Notificacion.id_notificacion < id_  # type: ignore
+            )
+        )
+
+    # Se pide una fila extra para saber si existe una página siguiente
+    return (
+        stmt
+        .order_by(Notificacion.fecha_creacion.desc(), Notificacion.id_notificacion.desc())  # type: ignore
+        .limit(limite + 1)
+    )
+
+def _stmt_version_feed(id_usuario: Optional[int], id_empresa: Optional[int]):
+    """
+    Agregado barato que cambia con cualquier alta, baja o lectura en el feed:
+    (total, máx. fecha_creacion, máx. fecha_lectura, total leídas). Resuelto sobre el
+    índice por destinatario, sin traer filas.
+    """
+    stmt = select(
+        func.count(),
+        func.max(Notificacion.fecha_creacion),
+        func.max(Notificacion.fecha_lectura),
+        func.sum(case((Notificacion.leida == True, 1), else_=0))
+    )
+    if id_usuario is not None:
+        stmt = stmt.where(Notificacion.id_usuario == id_usuario)
+    if id_empresa is not None:
+        stmt = stmt.where(Notificacion.id_empresa == id_empresa)
+    return stmt
+
+def _marcar_leidas(
+    session: Session,
+    contadores: ContadorNoLeidasRepository,
+    fecha_lectura: datetime,
+    id_usuario: Optional[int] = None,
+    id_empresa: Optional[int] = None,
+    ids: Optional[List[int]] = None
+) -> Tuple[int, Set[Tuple[int, int]]]:
+    """
+    Marca como leídas, con un único UPDATE por bloque, las no leídas que cumplen el filtro,
+    y descuenta de los contadores exactamente las filas que ese UPDATE cambió.
+    Compartida por los repositorios síncrono y asíncrono (este último vía run_sync).
+
+    Returns:
+        (cantidad actualizada, pares (id_usuario, id_empresa) afectados)
+    """
+    tabla = Notificacion.__table__  # type: ignore
+    condiciones = [tabla.c.leida == False]
+    if id_usuario is not None:
+        condiciones.append(tabla.c.id_usuario == id_usuario)
+    if id_empresa is not None:
+        condiciones.append(tabla.c.id_empresa == id_empresa)
+
+    # Los IDs se procesan en bloques por debajo del límite de parámetros del motor
+    bloques: List[List[int]] = [[]] if ids is None else [
+        ids[i:i + MAX_PARAMETROS_IN] for i in range(0, len(ids), MAX_PARAMETROS_IN)
+    ]
+
+    actualizadas = 0
+    destinatarios: Set[Tuple[int, int]] = set()
+    try:
+        for bloque in bloques:
+            condiciones_bloque = list(condiciones)
+            if ids is not None:
+                condiciones_bloque.append(tabla.c.id_notificacion.in_(bloque))
+
+            # Los contadores se descuentan con las filas que el UPDATE devuelve (OUTPUT en
+            # SQL Server, RETURNING en el resto): ante una marca concurrente, cada fila la
+            # cambia y la descuenta una sola de las dos
+            marcadas = session.execute(
+                update(tabla)
+                .where(*condiciones_bloque)
+                .values(leida=True, fecha_lectura=fecha_lectura)
+                .returning(tabla.c.id_usuario, tabla.c.id_empresa, tabla.c.tipo_notificacion, tabla.c.prioridad)
+            ).all()
+
+            deltas: Deltas = {}
+            for id_usr, id_emp, tipo, prioridad in marcadas:
+                destinatarios.add((id_usr, id_emp))
+                for clave in _claves(id_usr, id_emp, tipo, prioridad):
+                    deltas[clave] = deltas.get(clave, 0) - 1
+            contadores.ajustar(session, deltas)
+            actualizadas += len(marcadas)
+
+        session.commit()
+        return actualizadas, destinatarios
+
+    except Exception as e:
+        session.rollback()
+        raise e
+
+def _destinatarios_antes_y_despues(notificaciones: List[Any]) -> Set[Tuple[int, int]]:
+    """
+    Pares (id_usuario, id_empresa) actuales y previos al cambio de cada notificación,
+    para invalidar también el feed del que sale una notificación reasignada
+    """
+    destinatarios: Set[Tuple[int, int]] = set()
+    for n in notificaciones:
+        destinatarios.add((n.id_usuario, n.id_empresa))
+        estado = inspect(n, raiseerr=False)
+        if estado is None:
+            continue
+        historia_usuario = estado.attrs.id_usuario.history
+        historia_empresa = estado.attrs.id_empresa.history
+        for id_usuario in historia_usuario.deleted or [n.id_usuario]:
+            for id_empresa in historia_empresa.deleted or [n.id_empresa]:
+                destinatarios.add((id_usuario, id_empresa))
+    return destinatarios
 
 class NotificacionRepository:
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        contadores: Optional[ContadorNoLeidasRepository] = None,
+        cache: Optional[CacheFeedsNotificaciones] = None
+    ):
         self.session = session
+        # Los contadores de no leídas se ajustan en la misma transacción de cada escritura
+        self.contadores = contadores or ContadorNoLeidasRepository()
+        # Los feeds cacheados de los destinatarios afectados se invalidan tras cada commit
+        self.cache = cache or get_cache_feeds()
     
     ## FUNCIONES DE OBTENER
 
@@ -55,53 +202,271 @@ class NotificacionRepository:
         results = session.exec(stmt)
         return results.all()
 
+    def get_pagina(
+        self,
+        session: Session,
+        limite: int,
+        despues_de: Optional[Tuple[datetime, Any]] = None,
+        id_usuario: Optional[int] = None,
+        id_empresa: Optional[int] = None,
+        solo_no_leidas: bool = False
+    ) -> Tuple[List[Notificacion], bool]:
+        """
+        Obtener una página por keyset, ordenada por (fecha_creacion, id_notificacion) descendente.
+
+        Args:
+            limite: Cantidad máxima de notificaciones de la página
+            despues_de: (fecha_creacion, id_notificacion) de la última notificación de la página anterior
+            id_usuario / id_empresa: Filtros opcionales por destinatario
+            solo_no_leidas: Filtrar solo las no leídas
+
+        Returns:
+            (notificaciones de la página, True si hay más páginas)
+        """
+        stmt = _stmt_pagina(limite, despues_de, id_usuario, id_empresa, solo_no_leidas)
+        results = list(session.exec(stmt).all())
+        return results[:limite], len(results) > limite
+
+
+    def get_version_feed(
+        self,
+        session: Session,
+        id_usuario: Optional[int] = None,
+        id_empresa: Optional[int] = None
+    ) -> Tuple[Any, ...]:
+        """
+        Token de versión del feed de un usuario o empresa, sin cargar las notificaciones.
+
+        Returns:
+            (total, máx. fecha_creacion, máx. fecha_lectura, total leídas)
+        """
+        return tuple(session.exec(_stmt_version_feed(id_usuario, id_empresa)).one())
 
     # FUNCIONES POST 
 
     def create(self, session: Session, notificacion: Notificacion) -> Notificacion:
         session.add(notificacion)
+        self.contadores.ajustar(session, self.contadores.deltas_alta([notificacion]))
         session.commit()
         session.refresh(notificacion)
+        self.cache.invalidar_notificaciones([notificacion])
         return notificacion
     
-    def create_(self, obj: NotificacionInt) -> NotificacionInt:
-        session_generator: Iterator[Session] = get_db()
-        session: Optional[Session] = None 
+    def crear_en_lote(
+        self,
+        notificaciones: List[NotificacionInt],
+        tamano_lote: int = 500,
+        devolver_ids: bool = False,
+        confirmar: bool = True
+    ) -> List[int]:
+        """
+        Inserta varias notificaciones en bloques de executemany dentro de una sola transacción.
+
+        Args:
+            notificaciones: Notificaciones a insertar
+            tamano_lote: Cantidad de filas por executemany
+            devolver_ids: Si es True se devuelven los IDs generados (más costoso, usa RETURNING/OUTPUT)
+            confirmar: Con False no se hace commit ni rollback: la inserción forma parte de una
+                transacción mayor del llamador, que después del commit debe llamar a
+                invalidar_cache_notificaciones
+
+        Returns:
+            IDs insertados en el mismo orden de entrada, o lista vacía si no se pidieron
+        """
+        if not notificaciones:
+            return []
+
+        tabla = NotificacionInt.__table__  # type: ignore
+        stmt = insert(tabla)
+        if devolver_ids:
+            stmt = stmt.returning(tabla.c.id_notificacion, sort_by_parameter_order=True)
+
+        ids: List[int] = []
         try:
-            session = next(session_generator)
-            session.add(obj)
-            session.commit()
-            session.refresh(obj)
-            
-            return obj
-            
+            for inicio in range(0, len(notificaciones), tamano_lote):
+                filas = [
+                    n.model_dump(exclude={"id_notificacion"})
+                    for n in notificaciones[inicio:inicio + tamano_lote]
+                ]
+                resultado = self.session.execute(stmt, filas)
+                if devolver_ids:
+                    ids.extend(resultado.scalars().all())
+
+            self.contadores.ajustar(self.session, self.contadores.deltas_alta(notificaciones))
+            if confirmar:
+                self.session.commit()
+                self.invalidar_cache_notificaciones(notificaciones)
+            return ids
+
         except Exception as e:
-            if session:
-                session.rollback()
-            raise e 
-        
-        finally:
-            try:
-                next(session_generator)
-            except StopIteration:
-                pass
+            if confirmar:
+                self.session.rollback()
+            raise e
+
+    def invalidar_cache_notificaciones(self, notificaciones: List[Any]) -> None:
+        """Invalida los feeds de los destinatarios de notificaciones ya confirmadas"""
+        self.cache.invalidar_notificaciones(notificaciones)
+
+    def get_no_leidas_por_oferta(
+        self,
+        tipo_notificacion: str,
+        id_usuario: int,
+        claves: Iterable[Tuple[int, int]]
+    ) -> Dict[Tuple[int, int], Tuple[int, Optional[str]]]:
+        """
+        Notificación no leída más reciente de un tipo y un destinatario para cada
+        (id_empresa, id_oferta), con una consulta proyectada por bloque de ofertas.
+
+        Args:
+            tipo_notificacion: Tipo de notificación (p. ej. NUEVA_POSTULACION)
+            id_usuario: Destinatario de las notificaciones buscadas (p. ej. ID_USUARIO_SISTEMA
+                para las del scheduler); las de otros usuarios no se consideran
+            claves: Pares (id_empresa, id_oferta) buscados
+
+        Returns:
+            (id_empresa, id_oferta) -> (id_notificacion, datos_adicionales)
+        """
+        buscadas = set(claves)
+        ofertas = sorted({id_oferta for _, id_oferta in buscadas})
+        tabla = NotificacionInt.__table__  # type: ignore
+
+        encontradas: Dict[Tuple[int, int], Tuple[int, Optional[str]]] = {}
+        for inicio in range(0, len(ofertas), MAX_PARAMETROS_IN):
+            stmt = (
+                select(tabla.c.id_empresa, tabla.c.id_oferta, tabla.c.id_notificacion, tabla.c.datos_adicionales)
+                .where(
+                    tabla.c.tipo_notificacion == tipo_notificacion,
+                    tabla.c.id_usuario == id_usuario,
+                    tabla.c.leida == False,
+                    tabla.c.id_oferta.in_(ofertas[inicio:inicio + MAX_PARAMETROS_IN])
+                )
+                .order_by(tabla.c.id_notificacion)
+            )
+            # Por el orden, si hay varias no leídas para la misma clave queda la más reciente
+            for id_empresa, id_oferta, id_notificacion, datos in self.session.execute(stmt):
+                if (id_empresa, id_oferta) in buscadas:
+                    encontradas[(id_empresa, id_oferta)] = (id_notificacion, datos)
+        return encontradas
+
+    def agrupar_en_no_leidas(self, actualizaciones: List[Dict[str, Any]], confirmar: bool = True) -> Set[int]:
+        """
+        Reescribe en bloque (un executemany) notificaciones no leídas existentes con un
+        nuevo asunto, mensaje y datos_adicionales, y renueva su fecha_creacion para que
+        vuelvan al principio de los feeds. Siguen sin leer y con el mismo tipo, prioridad
+        y destinatarios, así que los contadores de no leídas no cambian.
+
+        Args:
+            actualizaciones: Dicts con id_notificacion, id_usuario, id_empresa, asunto, mensaje
+                y datos_adicionales
+            confirmar: Con False no se hace commit ni rollback: el llamador confirma e
+                invalida la caché de feeds
+
+        Returns:
+            IDs que no se actualizaron porque entretanto se marcaron como leídas o cambiaron
+            de destinatario
+        """
+        if not actualizaciones:
+            return set()
+
+        tabla = NotificacionInt.__table__  # type: ignore
+        ahora = datetime.utcnow()
+        try:
+            self.session.execute(
+                update(tabla)
+                .where(
+                    tabla.c.id_notificacion == bindparam("b_id"),
+                    tabla.c.id_usuario == bindparam("b_usuario"),
+                    tabla.c.id_empresa == bindparam("b_empresa"),
+                    tabla.c.leida == False
+                )
+                .values(
+                    asunto=bindparam("b_asunto"),
+                    mensaje=bindparam("b_mensaje"),
+                    datos_adicionales=bindparam("b_datos"),
+                    fecha_creacion=bindparam("b_fecha")
+                ),
+                [
+                    {
+                        "b_id": a["id_notificacion"], "b_usuario": a["id_usuario"], "b_empresa": a["id_empresa"],
+                        "b_asunto": a["asunto"], "b_mensaje": a["mensaje"],
+                        "b_datos": a["datos_adicionales"], "b_fecha": ahora
+                    }
+                    for a in actualizaciones
+                ]
+            )
+            # El rowcount de un executemany no es fiable en todos los drivers: se comprueba
+            # cuáles se leyeron o reasignaron antes del UPDATE (después quedan bloqueadas por él)
+            esperados = {a["id_notificacion"]: (a["id_usuario"], a["id_empresa"]) for a in actualizaciones}
+            ids = list(esperados)
+            leidas: Set[int] = set(ids)
+            for inicio in range(0, len(ids), MAX_PARAMETROS_IN):
+                for id_notificacion, leida, id_usr, id_emp in self.session.execute(
+                    select(tabla.c.id_notificacion, tabla.c.leida, tabla.c.id_usuario, tabla.c.id_empresa).where(
+                        tabla.c.id_notificacion.in_(ids[inicio:inicio + MAX_PARAMETROS_IN])
+                    )
+                ):
+                    if not leida and esperados[id_notificacion] == (id_usr, id_emp):
+                        leidas.discard(id_notificacion)
+
+            if confirmar:
+                self.session.commit()
+                self.cache.invalidar_destinatarios((a["id_usuario"], a["id_empresa"]) for a in actualizaciones)
+            return leidas
+
+        except Exception as e:
+            if confirmar:
+                self.session.rollback()
+            raise e
+
     #FUNCIONES PUT/PATCH
 
     def update(self, session: Session, notificacion: Notificacion) -> Notificacion:
+        deltas = self.contadores.deltas_cambio([notificacion])
+        destinatarios = _destinatarios_antes_y_despues([notificacion])
         session.add(notificacion)
+        self.contadores.ajustar(session, deltas)
         session.commit()
         session.refresh(notificacion)
+        self.cache.invalidar_destinatarios(destinatarios)
         return notificacion
     
+    def marcar_leidas(
+        self,
+        session: Session,
+        fecha_lectura: datetime,
+        id_usuario: Optional[int] = None,
+        id_empresa: Optional[int] = None,
+        ids: Optional[List[int]] = None
+    ) -> int:
+        """
+        Marcar como leídas en una sola sentencia las no leídas de un usuario, de una empresa
+        y/o de una lista de IDs.
+
+        Returns:
+            Cantidad de notificaciones actualizadas
+        """
+        actualizadas, destinatarios = _marcar_leidas(
+            session, self.contadores, fecha_lectura, id_usuario, id_empresa, ids
+        )
+        self.cache.invalidar_destinatarios(destinatarios)
+        return actualizadas
+
     def update_many(self, session: Session, notificaciones: List[Notificacion]) -> None:
         """Actualizar múltiples notificaciones"""
+        deltas = self.contadores.deltas_cambio(notificaciones)
+        destinatarios = _destinatarios_antes_y_despues(notificaciones)
         for notificacion in notificaciones:
             session.add(notificacion)
+        self.contadores.ajustar(session, deltas)
         session.commit()
+        self.cache.invalidar_destinatarios(destinatarios)
 
 
     #FUNCIONES DELETE
     
     def delete(self, session: Session, notificacion: Notificacion) -> None:
+        destinatario = (notificacion.id_usuario, notificacion.id_empresa)
         session.delete(notificacion)
-        session.commit()
\ No newline at end of file
+        self.contadores.ajustar(session, self.contadores.deltas_alta([notificacion], signo=-1))
+        session.commit()
+        self.cache.invalidar_destinatarios([destinatario])
\ No newline at end of file
@@ -0,0 +1,145 @@
+from sqlmodel import Session, select, func, or_, and_
+from sqlalchemy import insert, delete
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from ..models.notificacion import Notificacion
+from ..models.notificacion_archivada import NotificacionArchivada
+from .contador_no_leidas_repo import ContadorNoLeidasRepository, MAX_PARAMETROS_IN
+from ..cache.feeds import CacheFeedsNotificaciones, get_cache_feeds
+
+def _condicion_retencion(tabla, limite_leidas: datetime, limite_no_leidas: datetime):
+    """Leídas creadas antes de limite_leidas y no leídas creadas antes de limite_no_leidas"""
+    return or_(
+        and_(tabla.c.leida == True, tabla.c.fecha_creacion < limite_leidas),
+        and_(tabla.c.leida == False, tabla.c.fecha_creacion < limite_no_leidas)
+    )
+
+class RetencionNotificacionesRepository:
+    """
+    Repositorio del archivado de notificaciones antiguas.
+    Mueve filas de notificaciones a notificaciones_archivadas por lotes ordenados por
+    id_notificacion; cada lote (copia, borrado y ajuste de contadores) es una transacción.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        contadores: Optional[ContadorNoLeidasRepository] = None,
+        cache: Optional[CacheFeedsNotificaciones] = None
+    ):
+        self.session = session
+        self.contadores = contadores or ContadorNoLeidasRepository()
+        self.cache = cache or get_cache_feeds()
+        self.tabla = Notificacion.__table__  # type: ignore
+        self.tabla_archivo = NotificacionArchivada.__table__  # type: ignore
+        # Columnas copiadas tal cual al archivo
+        self.columnas = [c for c in self.tabla.c if c.name in self.tabla_archivo.c]
+
+    def id_tope(self, limite_leidas: datetime, limite_no_leidas: datetime) -> Optional[int]:
+        """
+        Mayor id_notificacion que puede archivarse: ninguna candidata es posterior al
+        límite más reciente. Acota el recorrido por clave sin leer las notificaciones nuevas.
+        """
+        limite = max(limite_leidas, limite_no_leidas)
+        return self.session.execute(
+            select(func.max(self.tabla.c.id_notificacion)).where(self.tabla.c.fecha_creacion < limite)
+        ).scalar()
+
+    def contar_candidatas(self, limite_leidas: datetime, limite_no_leidas: datetime) -> List[Dict[str, Any]]:
+        """
+        Notificaciones que se archivarían, agrupadas por tipo y estado de lectura.
+        No modifica nada (modo simulación).
+        """
+        stmt = (
+            select(
+                self.tabla.c.tipo_notificacion,
+                self.tabla.c.leida,
+                func.count(),
+                func.min(self.tabla.c.fecha_creacion)
+            )
+            .where(_condicion_retencion(self.tabla, limite_leidas, limite_no_leidas))
+            .group_by(self.tabla.c.tipo_notificacion, self.tabla.c.leida)
+            .order_by(self.tabla.c.tipo_notificacion, self.tabla.c.leida)
+        )
+        return [
+            {"tipo_notificacion": tipo, "leida": bool(leida), "cantidad": cantidad, "mas_antigua": mas_antigua}
+            for tipo, leida, cantidad, mas_antigua in self.session.execute(stmt)
+        ]
+
+    def archivar_lote(
+        self,
+        limite_leidas: datetime,
+        limite_no_leidas: datetime,
+        despues_de: Optional[int],
+        hasta: int,
+        tamano: int
+    ) -> Tuple[int, int, int, Optional[int]]:
+        """
+        Archiva el siguiente lote de candidatas con id_notificacion en (despues_de, hasta].
+
+        El borrado, la copia al archivo y el descuento de los contadores de no leídas son
+        una sola transacción, y la copia y el descuento usan las filas que devuelve el
+        DELETE: una marca de lectura concurrente queda antes (la fila se borra ya leída) o
+        espera al commit y ya no la encuentra, así que nunca se descuenta dos veces.
+
+        Args:
+            limite_leidas: Se archivan las leídas creadas antes de esta fecha
+            limite_no_leidas: Se archivan las no leídas creadas antes de esta fecha
+            despues_de: Última clave del lote anterior (None en el primero)
+            hasta: Clave máxima a recorrer (ver id_tope)
+            tamano: Cantidad máxima de notificaciones del lote
+
+        Returns:
+            (leídas archivadas, no leídas archivadas, candidatas seleccionadas, última clave del
+            lote o None si no quedan). Las archivadas pueden ser menos que las seleccionadas si
+            alguna dejó de cumplir la condición antes del DELETE.
+        """
+        condiciones = [
+            _condicion_retencion(self.tabla, limite_leidas, limite_no_leidas),
+            self.tabla.c.id_notificacion <= hasta
+        ]
+        if despues_de is not None:
+            condiciones.append(self.tabla.c.id_notificacion > despues_de)
+
+        try:
+            ids = list(self.session.execute(
+                select(self.tabla.c.id_notificacion)
+                .where(*condiciones)
+                .order_by(self.tabla.c.id_notificacion)
+                .limit(tamano)
+            ).scalars())
+            if not ids:
+                self.session.rollback()
+                return 0, 0, 0, None
+
+            # El DELETE vuelve a evaluar la condición y devuelve las filas tal como las borró
+            # (OUTPUT deleted.* en SQL Server, RETURNING en el resto): se archivan y se
+            # descuentan de los contadores solo esas
+            filas = []
+            for inicio in range(0, len(ids), MAX_PARAMETROS_IN):
+                filas.extend(self.session.execute(
+                    delete(self.tabla)
+                    .where(
+                        self.tabla.c.id_notificacion.in_(ids[inicio:inicio + MAX_PARAMETROS_IN]),
+                        *condiciones
+                    )
+                    .returning(*self.columnas)
+                ).all())
+
+            if filas:
+                ahora = datetime.utcnow()
+                self.session.execute(
+                    insert(self.tabla_archivo),
+                    [{**fila._mapping, "fecha_archivado": ahora} for fila in filas]
+                )
+                # Las no leídas archivadas dejan de contar en el badge
+                self.contadores.ajustar(self.session, self.contadores.deltas_alta(filas, signo=-1))
+            self.session.commit()
+
+        except Exception as e:
+            self.session.rollback()
+            raise e
+
+        self.cache.invalidar_destinatarios((fila.id_usuario, fila.id_empresa) for fila in filas)
+        leidas = sum(1 for fila in filas if fila.leida)
+        return leidas, len(filas) - leidas, len(ids), ids[-1]
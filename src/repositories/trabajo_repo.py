@@ -0,0 +1,128 @@
+from sqlmodel import Session, select
+from sqlalchemy import update, or_, and_
+from typing import List, Optional
+from datetime import datetime
+from uuid import uuid4
+from ..models.trabajo_procesamiento import TrabajoProcesamiento
+
+ESTADO_PENDIENTE = "pendiente"
+ESTADO_EN_CURSO = "en_curso"
+ESTADO_COMPLETADO = "completado"
+ESTADO_FALLIDO = "fallido"
+
+class TrabajoRepository:
+    """
+    Repositorio de los trabajos asíncronos de procesamiento.
+    Cada operación hace su propio commit; el paso a en_curso es un UPDATE condicional
+    para que un trabajo lo ejecute una sola instancia.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def get(self, id_trabajo: str) -> Optional[TrabajoProcesamiento]:
+        return self.session.get(TrabajoProcesamiento, id_trabajo, populate_existing=True)
+
+    def crear(self, proceso: str, parametros: str) -> TrabajoProcesamiento:
+        """Registra un trabajo pendiente"""
+        trabajo = TrabajoProcesamiento(
+            id_trabajo=str(uuid4()),
+            proceso=proceso,
+            estado=ESTADO_PENDIENTE,
+            parametros=parametros
+        )
+        self.session.add(trabajo)
+        self.session.commit()
+        self.session.refresh(trabajo)
+        return trabajo
+
+    def get_activo(self, proceso: str, huerfano_antes: datetime) -> Optional[TrabajoProcesamiento]:
+        """Trabajo pendiente o en curso (con latido reciente) de un proceso, el más antiguo"""
+        stmt = (
+            select(TrabajoProcesamiento)
+            .where(TrabajoProcesamiento.proceso == proceso, self._activo(huerfano_antes))
+            .order_by(TrabajoProcesamiento.fecha_creacion)
+            .limit(1)
+        )
+        return self.session.exec(stmt).first()
+
+    def get_recuperables(self, huerfano_antes: datetime) -> List[str]:
+        """IDs de los trabajos pendientes y de los en curso huérfanos, por orden de creación"""
+        stmt = (
+            select(TrabajoProcesamiento.id_trabajo)
+            .where(self._recuperable(huerfano_antes))
+            .order_by(TrabajoProcesamiento.fecha_creacion)
+        )
+        return list(self.session.exec(stmt).all())
+
+    def reclamar(self, id_trabajo: str, huerfano_antes: datetime) -> bool:
+        """
+        Pasa a en_curso un trabajo pendiente o huérfano
+
+        Returns:
+            False si otro worker ya lo tomó o si ya terminó
+        """
+        ahora = datetime.utcnow()
+        tabla = TrabajoProcesamiento.__table__  # type: ignore
+        try:
+            resultado = self.session.execute(
+                update(tabla)
+                .where(tabla.c.id_trabajo == id_trabajo, self._recuperable(huerfano_antes))
+                .values(
+                    estado=ESTADO_EN_CURSO,
+                    intentos=tabla.c.intentos + 1,
+                    fecha_inicio=ahora,
+                    fecha_actualizacion=ahora
+                )
+            )
+            self.session.commit()
+            return resultado.rowcount == 1
+        except Exception as e:
+            self.session.rollback()
+            raise e
+
+    def registrar_progreso(self, id_trabajo: str, etapa: Optional[str], filas_procesadas: int) -> None:
+        """Guarda el avance de un trabajo en curso y renueva su latido"""
+        self._actualizar(
+            id_trabajo,
+            etapa=etapa,
+            filas_procesadas=filas_procesadas,
+            fecha_actualizacion=datetime.utcnow()
+        )
+
+    def completar(self, id_trabajo: str, resumen: str) -> None:
+        ahora = datetime.utcnow()
+        self._actualizar(id_trabajo, estado=ESTADO_COMPLETADO, resumen=resumen, fecha_fin=ahora, fecha_actualizacion=ahora)
+
+    def fallar(self, id_trabajo: str, error: str) -> None:
+        ahora = datetime.utcnow()
+        self._actualizar(id_trabajo, estado=ESTADO_FALLIDO, error=error, fecha_fin=ahora, fecha_actualizacion=ahora)
+
+    def _actualizar(self, id_trabajo: str, **valores) -> None:
+        tabla = TrabajoProcesamiento.__table__  # type: ignore
+        try:
+            self.session.execute(update(tabla).where(tabla.c.id_trabajo == id_trabajo).values(**valores))
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            raise e
+
+    @staticmethod
+    def _activo(huerfano_antes: datetime):
+        return or_(
+            TrabajoProcesamiento.estado == ESTADO_PENDIENTE,
+            and_(
+                TrabajoProcesamiento.estado == ESTADO_EN_CURSO,
+                TrabajoProcesamiento.fecha_actualizacion >= huerfano_antes
+            )
+        )
+
+    @staticmethod
+    def _recuperable(huerfano_antes: datetime):
+        return or_(
+            TrabajoProcesamiento.estado == ESTADO_PENDIENTE,
+            and_(
+                TrabajoProcesamiento.estado == ESTADO_EN_CURSO,
+                TrabajoProcesamiento.fecha_actualizacion < huerfano_antes
+            )
+        )
@@ -0,0 +1,11 @@
+from typing import Annotated, AsyncGenerator
+from fastapi import Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ...config.db_async import get_async_engine
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    # expire_on_commit=False: evita recargas implícitas (no permitidas en async) tras el commit
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
@@ -3,6 +3,10 @@ from fastapi import Depends
 from sqlmodel import Session
 from ...config.db import engine
 
+def crear_sesion() -> Session:
+    """Crea una sesión independiente (p. ej. para workers en paralelo)"""
+    return Session(engine)
+
 def get_db() -> Generator[Session, None, None]:
     with Session(engine) as session:
         yield session
@@ -0,0 +1,29 @@
+from fastapi import Request, Response, status
+
+# Obliga al cliente a revalidar con If-None-Match en cada consulta en lugar de usar su copia
+CACHE_CONTROL_REVALIDAR = "no-cache"
+
+def _sin_prefijo_debil(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+def coincide_etag(request: Request, etag: str) -> bool:
+    """True si el If-None-Match del cliente incluye el ETag actual (comparación débil)"""
+    cabecera = request.headers.get("if-none-match")
+    if not cabecera:
+        return False
+    if cabecera.strip() == "*":
+        return True
+    actual = _sin_prefijo_debil(etag)
+    return any(_sin_prefijo_debil(candidato) == actual for candidato in cabecera.split(","))
+
+def no_modificado(etag: str) -> Response:
+    """Respuesta 304 sin cuerpo para un cliente con la versión vigente"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL_REVALIDAR}
+    )
+
+def agregar_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL_REVALIDAR
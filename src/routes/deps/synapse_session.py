@@ -4,6 +4,11 @@ from sqlmodel import Session
 from ...config.db_synapse import synapse_engine
 
 
+def crear_sesion_synapse() -> Session:
+    """Crea una sesión de Synapse independiente (p. ej. para workers en paralelo)"""
+    return Session(synapse_engine)
+
+
 def get_synapse_session() -> Generator[Session, None, None]:
     """
     Generador de sesión para Azure Synapse Analytics.
@@ -0,0 +1,25 @@
+import threading
+from typing import Optional
+from ...services.trabajos_service import GestorTrabajos
+from .db_session import crear_sesion
+from .synapse_session import crear_sesion_synapse
+
+_gestor: Optional[GestorTrabajos] = None
+_gestor_lock = threading.Lock()
+
+def get_gestor_trabajos() -> GestorTrabajos:
+    """Gestor de trabajos asíncronos de la aplicación, creado en el primer uso"""
+    global _gestor
+    if _gestor is None:
+        with _gestor_lock:
+            if _gestor is None:
+                _gestor = GestorTrabajos(crear_sesion, crear_sesion_synapse)
+    return _gestor
+
+def cerrar_gestor_trabajos() -> None:
+    """Detiene el executor de trabajos si llegó a crearse"""
+    global _gestor
+    with _gestor_lock:
+        if _gestor is not None:
+            _gestor.cerrar()
+            _gestor = None
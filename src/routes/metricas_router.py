@@ -0,0 +1,24 @@
+from fastapi import APIRouter, status
+from ..config.pool import metricas_pools
+from ..cache.feeds import get_cache_feeds
+from ..cache.postulados import get_cache_postulados
+from ..push.hub import get_hub_notificaciones
+
+router = APIRouter(
+    tags=["Métricas"]
+)
+
+
+@router.get("/metrics", status_code=status.HTTP_200_OK)
+def metricas():
+    """
+    Estado de los pools de conexiones por motor (en uso, libres, overflow, esperas
+    y timeouts al obtener conexión), de las cachés de feeds y de postulados y de las
+    conexiones en vivo
+    """
+    return {
+        "pools": metricas_pools(),
+        "cache_feeds": get_cache_feeds().estadisticas(),
+        "cache_postulados": get_cache_postulados().estadisticas(),
+        "push": get_hub_notificaciones().estadisticas()
+    }
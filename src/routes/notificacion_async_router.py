@@ -0,0 +1,222 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+from uuid import UUID
+from typing import List, Optional
+from .deps.async_db_session import get_async_db
+from .deps.etag import coincide_etag, no_modificado, agregar_etag
+from ..services.notificacion_async_service import NotificacionAsyncService
+from ..repositories.notificacion_async_repo import NotificacionAsyncRepository
+from ..dto.notificacion_dto import NotificacionCreateDTO, NotificacionResponseDTO, ConteoNoLeidasDTO, MarcarLeidasDTO
+from ..dto.paginacion_dto import PaginaNotificacionesDTO, TAMANO_PAGINA_DEFECTO, MAX_TAMANO_PAGINA
+from ..exception.notificacion_not_found import NotificacionNotFound
+from ..exception.cursor_invalido import CursorInvalido
+
+# Mismas rutas que /notificaciones pero con handlers async sobre un motor asíncrono:
+# no ocupan hilos del thread pool mientras esperan a la base de datos.
+router = APIRouter(
+    prefix="/v2/notificaciones",
+    tags=["Notificaciones (async)"]
+)
+
+# Dependencia para inyectar el servicio
+def get_notificacion_async_service() -> NotificacionAsyncService:
+    return NotificacionAsyncService(NotificacionAsyncRepository())
+
+
+@router.get("/", response_model=PaginaNotificacionesDTO, status_code=status.HTTP_200_OK)
+async def listar_notificaciones(
+    limit: int = Query(default=TAMANO_PAGINA_DEFECTO, le=MAX_TAMANO_PAGINA, ge=1),
+    cursor: Optional[str] = Query(default=None, description="next_cursor de la página anterior"),
+    session: AsyncSession = Depends(get_async_db),
+    service: NotificacionAsyncService = Depends(get_notificacion_async_service)
+):
+    """
+    Listar todas las notificaciones con paginación por cursor
+    """
+    try:
+        return await service.listar_todas(session, limit, cursor)
+    except CursorInvalido as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/no-leidas", response_model=PaginaNotificacionesDTO, status_code=status.HTTP_200_OK)
+async def listar_notificaciones_no_leidas(
+    limit: int = Query(default=TAMANO_PAGINA_DEFECTO, le=MAX_TAMANO_PAGINA, ge=1),
+    cursor: Optional[str] = Query(default=None, description="next_cursor de la página anterior"),
+    session: AsyncSession = Depends(get_async_db),
+    service: NotificacionAsyncService = Depends(get_notificacion_async_service)
+):
+    """
+    Listar solo las notificaciones no leídas, paginadas por cursor
+    """
+    try:
+        return await service.listar_no_leidas(session, limit, cursor)
+    except CursorInvalido as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/{id_notificacion}", response_model=NotificacionResponseDTO, status_code=status.HTTP_200_OK)
+async def obtener_notificacion(
+    id_notificacion: UUID,
+    session: AsyncSession = Depends(get_async_db),
+    service: NotificacionAsyncService = Depends(get_notificacion_async_service)
+):
+    """
+    Obtener una notificación por su ID
+    """
+    try:
+        return await service.get_by_id(session, id_notificacion)
+    except NotificacionNotFound as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+@router.get("/{id_usuario}/user/all", response_model=PaginaNotificacionesDTO, status_code=status.HTTP_200_OK)
+async def obterner_todas_por_usuario(
+    id_usuario: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(default=TAMANO_PAGINA_DEFECTO, le=MAX_TAMANO_PAGINA, ge=1),
+    cursor: Optional[str] = Query(default=None, description="next_cursor de la página anterior"),
+    session: AsyncSession = Depends(get_async_db),
+    service: NotificacionAsyncService = Depends(get_notificacion_async_service)
+):
+    """
+    Responde 304 Not Modified si el If-None-Match del cliente coincide con la versión actual del feed
+    """
+    etag = await service.etag_feed_usuario(session, id_usuario, limit, cursor)
+    if coincide_etag(request, etag):
+        return no_modificado(etag)
+
+    try:
+        pagina = await service.listar_dado_id_usuario(session, id_usuario, limit, cursor, etag)
+    except CursorInvalido as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    agregar_etag(response, etag)
+    return pagina
+
+@router.get("/{id_empresa}/company/all", response_model=PaginaNotificacionesDTO, status_code=status.HTTP_200_OK)
+async def obtener_todas_por_empresa(
+    id_empresa: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(default=TAMANO_PAGINA_DEFECTO, le=MAX_TAMANO_PAGINA, ge=1),
+    cursor: Optional[str] = Query(default=None, description="next_cursor de la página anterior"),
+    session: AsyncSession = Depends(get_async_db),
+    service: NotificacionAsyncService = Depends(get_notificacion_async_service)
+):
+    """
+    Responde 304 Not Modified si el If-None-Match del cliente coincide con la versión actual del feed
+    """
+    etag = await service.etag_feed_empresa(session, id_empresa, limit, cursor)
+    if coincide_etag(request, etag):
+        return no_modificado(etag)
+
+    try:
+        pagina = await service.listar_dado_id_empresa(session, id_empresa, limit, cursor, etag)
+    except CursorInvalido as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    agregar_etag(response, etag)
+    return pagina
+
+
+@router.get("/{id_usuario}/user/no-leidas/conteo", response_model=ConteoNoLeidasDTO, status_code=status.HTTP_200_OK)
+async def contar_no_leidas_usuario(
+    id_usuario: int,
+    session: AsyncSession = Depends(get_async_db),
+    service: NotificacionAsyncService = Depends(get_notificacion_async_service)
+):
+    """
+    Cantidad de notificaciones no leídas de un usuario, por tipo y prioridad (badge)
+    """
+    return await service.conteo_no_leidas_usuario(session, id_usuario)
+
+@router.get("/{id_empresa}/company/no-leidas/conteo", response_model=ConteoNoLeidasDTO, status_code=status.HTTP_200_OK)
+async def contar_no_leidas_empresa(
+    id_empresa: int,
+    session: AsyncSession = Depends(get_async_db),
+    service: NotificacionAsyncService = Depends(get_notificacion_async_service)
+):
+    """
+    Cantidad de notificaciones no leídas de una empresa, por tipo y prioridad (badge)
+    """
+    return await service.conteo_no_leidas_empresa(session, id_empresa)
+
+
+@router.post("/", response_model=NotificacionResponseDTO, status_code=status.HTTP_201_CREATED)
+async def crear_notificacion(
+    notificacion: NotificacionCreateDTO,
+    session: AsyncSession = Depends(get_async_db),
+    service: NotificacionAsyncService = Depends(get_notificacion_async_service)
+):
+    """
+    Crear una nueva notificación
+    """
+    return await service.create(session, notificacion)
+
+@router.patch("/{id_notificacion}/marcar-leida", response_model=NotificacionResponseDTO, status_code=status.HTTP_200_OK)
+async def marcar_notificacion_leida(
+    id_notificacion: UUID,
+    session: AsyncSession = Depends(get_async_db),
+    service: NotificacionAsyncService = Depends(get_notificacion_async_service)
+):
+    """
+    Marcar una notificación como leída
+    """
+    try:
+        return await service.marcar_como_leida(session, id_notificacion)
+    except NotificacionNotFound as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+@router.patch("/marcar-leidas", status_code=status.HTTP_200_OK)
+async def marcar_notificaciones_leidas(
+    body: MarcarLeidasDTO,
+    session: AsyncSession = Depends(get_async_db),
+    service: NotificacionAsyncService = Depends(get_notificacion_async_service)
+):
+    """Marcar como leídas varias notificaciones en una sola operación"""
+    return await service.marcar_leidas_por_ids(session, body.ids)
+
+@router.patch("/usuario/{id_usuario}/marcar-todas-leidas", status_code=status.HTTP_200_OK)
+async def marcar_todas_leidas_usuario(
+    id_usuario: int,
+    session: AsyncSession = Depends(get_async_db),
+    service: NotificacionAsyncService = Depends(get_notificacion_async_service)
+):
+    """Marcar todas las notificaciones de un usuario como leídas"""
+    return await service.marcar_todas_leidas_usuario(session, id_usuario)
+
+
+@router.patch("/empresa/{id_empresa}/marcar-todas-leidas", status_code=status.HTTP_200_OK)
+async def marcar_todas_leidas_empresa(
+    id_empresa: int,
+    session: AsyncSession = Depends(get_async_db),
+    service: NotificacionAsyncService = Depends(get_notificacion_async_service)
+):
+    """Marcar todas las notificaciones de una empresa como leídas"""
+    return await service.marcar_todas_leidas_empresa(session, id_empresa)
+
+
+@router.delete("/{id_notificacion}", status_code=status.HTTP_204_NO_CONTENT)
+async def eliminar_notificacion(
+    id_notificacion: UUID,
+    session: AsyncSession = Depends(get_async_db),
+    service: NotificacionAsyncService = Depends(get_notificacion_async_service)
+):
+    """
+    Eliminar una notificación
+    """
+    try:
+        await service.delete(session, id_notificacion)
+        return None
+    except NotificacionNotFound as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlmodel import Session
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 from .deps.db_session import get_db  # Ajusta según tu configuración de BD
+from .deps.etag import coincide_etag, no_modificado, agregar_etag
 from ..services.notificacion_service import NotificacionService
 from ..repositories.notificacion_repo import NotificacionRepository
-from ..dto.notificacion_dto import NotificacionCreateDTO, NotificacionResponseDTO
+from ..dto.notificacion_dto import NotificacionCreateDTO, NotificacionResponseDTO, ConteoNoLeidasDTO, MarcarLeidasDTO
+from ..dto.paginacion_dto import PaginaNotificacionesDTO, TAMANO_PAGINA_DEFECTO, MAX_TAMANO_PAGINA
 from ..exception.notificacion_not_found import NotificacionNotFound
+from ..exception.cursor_invalido import CursorInvalido
+from ..cache.feeds import get_cache_feeds
 
 router = APIRouter(
     prefix="/notificaciones",
@@ -19,28 +23,36 @@ def get_notificacion_service(session: Session = Depends(get_db)) -> Notificacion
     return NotificacionService(repository)
 
 
-@router.get("/", response_model=List[NotificacionResponseDTO], status_code=status.HTTP_200_OK)
+@router.get("/", response_model=PaginaNotificacionesDTO, status_code=status.HTTP_200_OK)
 def listar_notificaciones(
-    limit: int = Query(default=100, le=100, ge=1),
-    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=TAMANO_PAGINA_DEFECTO, le=MAX_TAMANO_PAGINA, ge=1),
+    cursor: Optional[str] = Query(default=None, description="next_cursor de la página anterior"),
     session: Session = Depends(get_db),
     service: NotificacionService = Depends(get_notificacion_service)
 ):
     """
-    Listar todas las notificaciones con paginación
+    Listar todas las notificaciones con paginación por cursor
     """
-    return service.listar_todas(session, limit, offset)
+    try:
+        return service.listar_todas(session, limit, cursor)
+    except CursorInvalido as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/no-leidas", response_model=List[NotificacionResponseDTO], status_code=status.HTTP_200_OK)
+@router.get("/no-leidas", response_model=PaginaNotificacionesDTO, status_code=status.HTTP_200_OK)
 def listar_notificaciones_no_leidas(
+    limit: int = Query(default=TAMANO_PAGINA_DEFECTO, le=MAX_TAMANO_PAGINA, ge=1),
+    cursor: Optional[str] = Query(default=None, description="next_cursor de la página anterior"),
     session: Session = Depends(get_db),
     service: NotificacionService = Depends(get_notificacion_service)
 ):
     """
-    Listar solo las notificaciones no leídas
+    Listar solo las notificaciones no leídas, paginadas por cursor
     """
-    return service.listar_no_leidas(session)
+    try:
+        return service.listar_no_leidas(session, limit, cursor)
+    except CursorInvalido as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/{id_notificacion}", response_model=NotificacionResponseDTO, status_code=status.HTTP_200_OK)
@@ -60,13 +72,85 @@ def obtener_notificacion(
             detail=str(e)
         )
     
-@router.get("/{id_usuario}/user/all", response_model=List[NotificacionResponseDTO], status_code=status.HTTP_200_OK)
-def obterner_todas_por_usuario(id_usuario:int, session: Session = Depends(get_db), service: NotificacionService = Depends(get_notificacion_service)):
-    return service.listar_dado_id_usuario(session, id_usuario)
+@router.get("/{id_usuario}/user/all", response_model=PaginaNotificacionesDTO, status_code=status.HTTP_200_OK)
+def obterner_todas_por_usuario(
+    id_usuario: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(default=TAMANO_PAGINA_DEFECTO, le=MAX_TAMANO_PAGINA, ge=1),
+    cursor: Optional[str] = Query(default=None, description="next_cursor de la página anterior"),
+    session: Session = Depends(get_db),
+    service: NotificacionService = Depends(get_notificacion_service)
+):
+    """
+    Responde 304 Not Modified si el If-None-Match del cliente coincide con la versión actual del feed
+    """
+    etag = service.etag_feed_usuario(session, id_usuario, limit, cursor)
+    if coincide_etag(request, etag):
+        return no_modificado(etag)
+
+    try:
+        pagina = service.listar_dado_id_usuario(session, id_usuario, limit, cursor, etag)
+    except CursorInvalido as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    agregar_etag(response, etag)
+    return pagina
+
+@router.get("/{id_empresa}/company/all", response_model=PaginaNotificacionesDTO, status_code=status.HTTP_200_OK)
+def obtener_todas_por_empresa(
+    id_empresa: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(default=TAMANO_PAGINA_DEFECTO, le=MAX_TAMANO_PAGINA, ge=1),
+    cursor: Optional[str] = Query(default=None, description="next_cursor de la página anterior"),
+    session: Session = Depends(get_db),
+    service: NotificacionService = Depends(get_notificacion_service)
+):
+    """
+    Responde 304 Not Modified si el If-None-Match del cliente coincide con la versión actual del feed
+    """
+    etag = service.etag_feed_empresa(session, id_empresa, limit, cursor)
+    if coincide_etag(request, etag):
+        return no_modificado(etag)
+
+    try:
+        pagina = service.listar_dado_id_empresa(session, id_empresa, limit, cursor, etag)
+    except CursorInvalido as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    agregar_etag(response, etag)
+    return pagina
 
-@router.get("/{id_empresa}/company/all", response_model=List[NotificacionResponseDTO], status_code=status.HTTP_200_OK)
-def obtener_todas_por_empresa(id_empresa:int, session: Session = Depends(get_db), service: NotificacionService = Depends(get_notificacion_service)):
-    return service.listar_dado_id_empresa(session, id_empresa)
+
+@router.get("/{id_usuario}/user/no-leidas/conteo", response_model=ConteoNoLeidasDTO, status_code=status.HTTP_200_OK)
+def contar_no_leidas_usuario(
+    id_usuario: int,
+    session: Session = Depends(get_db),
+    service: NotificacionService = Depends(get_notificacion_service)
+):
+    """
+    Cantidad de notificaciones no leídas de un usuario, por tipo y prioridad (badge)
+    """
+    return service.conteo_no_leidas_usuario(session, id_usuario)
+
+@router.get("/{id_empresa}/company/no-leidas/conteo", response_model=ConteoNoLeidasDTO, status_code=status.HTTP_200_OK)
+def contar_no_leidas_empresa(
+    id_empresa: int,
+    session: Session = Depends(get_db),
+    service: NotificacionService = Depends(get_notificacion_service)
+):
+    """
+    Cantidad de notificaciones no leídas de una empresa, por tipo y prioridad (badge)
+    """
+    return service.conteo_no_leidas_empresa(session, id_empresa)
+
+@router.get("/cache/estadisticas", status_code=status.HTTP_200_OK)
+def estadisticas_cache_feeds():
+    """
+    Aciertos, fallos e invalidaciones de la caché de feeds por usuario y por empresa
+    """
+    return get_cache_feeds().estadisticas()
 
 
 @router.post("/", response_model=NotificacionResponseDTO, status_code=status.HTTP_201_CREATED)
@@ -97,6 +181,15 @@ def marcar_notificacion_leida(
             detail=str(e)
         )
 
+@router.patch("/marcar-leidas", status_code=status.HTTP_200_OK)
+def marcar_notificaciones_leidas(
+    body: MarcarLeidasDTO,
+    session: Session = Depends(get_db),
+    service: NotificacionService = Depends(get_notificacion_service)
+):
+    """Marcar como leídas varias notificaciones en una sola operación"""
+    return service.marcar_leidas_por_ids(session, body.ids)
+
 @router.patch("/usuario/{id_usuario}/marcar-todas-leidas", status_code=status.HTTP_200_OK)
 def marcar_todas_leidas_usuario(
     id_usuario: int,
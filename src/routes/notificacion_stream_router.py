@@ -0,0 +1,110 @@
+import asyncio
+import json
+from typing import AsyncIterator
+from fastapi import APIRouter, Depends, Request, WebSocket, status
+from fastapi.responses import StreamingResponse
+from ..push.hub import HubNotificaciones, get_hub_notificaciones
+from ..repositories.contador_no_leidas_repo import AMBITO_USUARIO, AMBITO_EMPRESA
+from ..config.push import PUSH_LATIDO_SEGUNDOS
+
+# Suscripción en vivo a las notificaciones nuevas de un usuario o de una empresa.
+# Reemplaza el sondeo periódico de /{id}/user/all y /{id}/company/all.
+router = APIRouter(
+    prefix="/notificaciones/stream",
+    tags=["Notificaciones en vivo"]
+)
+
+CABECERAS_SSE = {
+    "Cache-Control": "no-cache",
+    # Evita que un proxy intermedio acumule los eventos antes de enviarlos
+    "X-Accel-Buffering": "no"
+}
+
+
+async def _eventos_sse(request: Request, hub: HubNotificaciones, ambito: str, id_ambito: int) -> AsyncIterator[str]:
+    """Eventos SSE de un canal, con latidos periódicos mientras no haya notificaciones"""
+    suscripcion = hub.suscribir(ambito, id_ambito)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                mensaje = await asyncio.wait_for(suscripcion.cola.get(), timeout=PUSH_LATIDO_SEGUNDOS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": latido\n\n"
+                continue
+            yield f"event: notificacion\ndata: {json.dumps(mensaje)}\n\n"
+    finally:
+        hub.desuscribir(suscripcion)
+
+
+async def _enviar_por_websocket(websocket: WebSocket, hub: HubNotificaciones, ambito: str, id_ambito: int) -> None:
+    """Envía las notificaciones del canal hasta que el cliente cierre la conexión"""
+    await websocket.accept()
+    suscripcion = hub.suscribir(ambito, id_ambito)
+
+    async def _esperar_cierre() -> None:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    cierre = asyncio.create_task(_esperar_cierre())
+    try:
+        while not cierre.done():
+            siguiente = asyncio.create_task(suscripcion.cola.get())
+            listas, _ = await asyncio.wait({siguiente, cierre}, return_when=asyncio.FIRST_COMPLETED)
+            if siguiente in listas:
+                await websocket.send_json(siguiente.result())
+            else:
+                siguiente.cancel()
+    finally:
+        cierre.cancel()
+        hub.desuscribir(suscripcion)
+
+
+@router.get("/usuario/{id_usuario}", status_code=status.HTTP_200_OK)
+async def stream_usuario(
+    id_usuario: int,
+    request: Request,
+    hub: HubNotificaciones = Depends(get_hub_notificaciones)
+):
+    """
+    Server-Sent Events con cada notificación nueva del usuario (evento `notificacion`)
+    """
+    return StreamingResponse(
+        _eventos_sse(request, hub, AMBITO_USUARIO, id_usuario),
+        media_type="text/event-stream",
+        headers=CABECERAS_SSE
+    )
+
+@router.get("/empresa/{id_empresa}", status_code=status.HTTP_200_OK)
+async def stream_empresa(
+    id_empresa: int,
+    request: Request,
+    hub: HubNotificaciones = Depends(get_hub_notificaciones)
+):
+    """
+    Server-Sent Events con cada notificación nueva de la empresa (evento `notificacion`)
+    """
+    return StreamingResponse(
+        _eventos_sse(request, hub, AMBITO_EMPRESA, id_empresa),
+        media_type="text/event-stream",
+        headers=CABECERAS_SSE
+    )
+
+@router.websocket("/ws/usuario/{id_usuario}")
+async def websocket_usuario(websocket: WebSocket, id_usuario: int):
+    """WebSocket que recibe como JSON cada notificación nueva del usuario"""
+    await _enviar_por_websocket(websocket, get_hub_notificaciones(), AMBITO_USUARIO, id_usuario)
+
+@router.websocket("/ws/empresa/{id_empresa}")
+async def websocket_empresa(websocket: WebSocket, id_empresa: int):
+    """WebSocket que recibe como JSON cada notificación nueva de la empresa"""
+    await _enviar_por_websocket(websocket, get_hub_notificaciones(), AMBITO_EMPRESA, id_empresa)
+
+@router.get("/estadisticas", status_code=status.HTTP_200_OK)
+def estadisticas_stream(hub: HubNotificaciones = Depends(get_hub_notificaciones)):
+    """
+    Conexiones abiertas, notificaciones publicadas y mensajes descartados por clientes lentos
+    """
+    return hub.estadisticas()
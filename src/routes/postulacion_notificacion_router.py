@@ -1,13 +1,24 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlmodel import Session
 from typing import Dict
 
-from ..routes.deps.db_session import get_db
-from ..routes.deps.synapse_session import get_synapse_session
-from ..services.postulacion_notificacion_service import PostulacionNotificacionService
+from ..routes.deps.db_session import get_db, crear_sesion
+from ..routes.deps.synapse_session import get_synapse_session, crear_sesion_synapse
+from ..routes.deps.trabajos import get_gestor_trabajos
+from ..services.trabajos_service import GestorTrabajos
+from ..services.postulacion_notificacion_service import (
+    PostulacionNotificacionService,
+    procesar_postulaciones_en_paralelo,
+    PROCESO_POSTULACIONES
+)
+from ..services.ejecucion_exclusiva import EjecucionExclusiva
+from ..exception.ejecucion_en_curso import EjecucionEnCurso
+from ..exception.trabajo_en_curso import TrabajoEnCurso
+from ..config.scheduler import ESPERAR_EN_CURSO
 from ..repositories.notificacion_repo import NotificacionRepository
 from ..repositories.convocatoria_snapshot_repo import ConvocatoriaSnapshotRepository
 from ..repositories.analytic_repo import NotificacionAnalyticsRepository
+from ..cache.postulados import get_cache_postulados
 
 
 router = APIRouter(
@@ -35,7 +46,7 @@ def get_postulacion_service(
 @router.post(
     "/notificar-postulaciones",
     response_model=Dict,
-    status_code=status.HTTP_200_OK,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Procesar y notificar nuevas postulaciones",
     description="""
     Procesa todas las convocatorias activas y crea notificaciones cuando detecta
@@ -47,23 +58,96 @@ def get_postulacion_service(
     3. Si hay incremento, crea una notificación para la empresa
     4. Actualiza los snapshots con los valores actuales
     
+    **Modo incremental:** con `incremental=true` solo se consultan las convocatorias
+    modificadas desde la última ejecución (marca de agua). Con `incremental=false`
+    se hace una reconciliación completa de la vista.
+    
+    **Ejecución en paralelo:** con `shards=N` (N > 1) las empresas se reparten en N
+    particiones por `id_empresa`, cada una procesada en su propio hilo y sesión.
+    
+    **Modo asíncrono (por defecto):** responde `202` de inmediato con el id del trabajo
+    encolado, o del que ya estaba pendiente / en curso con los mismos parámetros (si
+    tiene otros, responde 409). El avance y el resumen final se consultan en
+    `GET /procesamiento/jobs/{id_trabajo}` (cabecera `Location`).
+    
+    **Modo síncrono:** con `asincrono=false` el procesamiento corre dentro de la petición
+    y responde `200` con el resumen, como en versiones anteriores. Solo corre una
+    ejecución a la vez (también respecto de la Azure Function): si hay otra en curso
+    responde 409; con `esperar=true` espera a que termine y devuelve su resumen (sin
+    detalle, con `compartida: true`).
+    
     **Ejemplo de uso:**
     - Llamar este endpoint cada hora desde un scheduler
-    - El frontend consulta `/notificaciones/{id_empresa}/company/all` para mostrar las nuevas
+    - El frontend se suscribe a `/notificaciones/stream/empresa/{id_empresa}` (SSE) o
+      `/notificaciones/stream/ws/empresa/{id_empresa}` (WebSocket) y recibe las nuevas al crearse
     """
 )
 def procesar_notificaciones_postulaciones(
+    response: Response,
+    incremental: bool = Query(default=False, description="Procesar solo lo modificado desde la última ejecución"),
+    shards: int = Query(default=1, ge=1, le=8, description="Cantidad de particiones por id_empresa procesadas en paralelo"),
+    esperar: bool = Query(default=ESPERAR_EN_CURSO, description="Modo síncrono: si hay una ejecución en curso, esperar su resultado"),
+    asincrono: bool = Query(default=True, description="Encolar la ejecución y responder 202 con el id del trabajo; false procesa dentro de la petición"),
     session: Session = Depends(get_db),
-    service: PostulacionNotificacionService = Depends(get_postulacion_service)
+    service: PostulacionNotificacionService = Depends(get_postulacion_service),
+    gestor: GestorTrabajos = Depends(get_gestor_trabajos)
 ):
     """
     Endpoint principal para procesar postulaciones y crear notificaciones.
     
     Returns:
-        Resumen con cantidad de notificaciones creadas y detalle por convocatoria
+        El trabajo encolado o, en modo síncrono, el resumen con cantidad de
+        notificaciones creadas y detalle por convocatoria
+    """
+    if asincrono:
+        try:
+            trabajo = gestor.encolar_postulaciones(incremental, shards)
+        except TrabajoEnCurso as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        response.headers["Location"] = f"{router.prefix}/jobs/{trabajo['id_trabajo']}"
+        return trabajo
+    
+    response.status_code = status.HTTP_200_OK
+
+    def procesar():
+        if shards > 1:
+            return procesar_postulaciones_en_paralelo(
+                crear_sesion,
+                crear_sesion_synapse,
+                num_shards=shards,
+                en_procesos=False,
+                modo_incremental=incremental
+            )
+        return service.procesar_nuevas_postulaciones(session, modo_incremental=incremental)
+    
+    try:
+        return EjecucionExclusiva(crear_sesion, PROCESO_POSTULACIONES).ejecutar(procesar, esperar=esperar)
+    except EjecucionEnCurso as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get(
+    "/jobs/{id_trabajo}",
+    response_model=Dict,
+    status_code=status.HTTP_200_OK,
+    summary="Consultar un trabajo de procesamiento asíncrono",
+    description="""
+    Estado (`pendiente`, `en_curso`, `completado`, `fallido`), última etapa terminada,
+    convocatorias leídas hasta el momento y, al terminar, el resumen de la ejecución
+    (sin detalle) o el error.
+    """
+)
+def obtener_trabajo(
+    id_trabajo: str,
+    gestor: GestorTrabajos = Depends(get_gestor_trabajos)
+):
     """
-    resultado = service.procesar_nuevas_postulaciones(session)
-    return resultado
+    Obtiene el avance o el resultado de un trabajo encolado por `POST /procesamiento/notificar-postulaciones`.
+    """
+    trabajo = gestor.estado_trabajo(id_trabajo)
+    if trabajo is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Trabajo {id_trabajo} no encontrado.")
+    return trabajo
 
 
 @router.get(
@@ -74,6 +158,9 @@ def procesar_notificaciones_postulaciones(
     description="""
     Obtiene un resumen del estado actual de todas las convocatorias activas
     y sus snapshots guardados. Útil para debugging y monitoreo.
+    
+    La vista de Synapse se lee de la caché del proceso (`CACHE_POSTULADOS_TTL_SEGUNDOS`);
+    se descarta con `DELETE /procesamiento/cache-postulados`.
     """
 )
 def obtener_resumen_convocatorias(
@@ -133,7 +220,9 @@ def obtener_estadisticas_snapshots(
     summary="Limpiar snapshots de convocatorias inactivas",
     description="""
     Elimina snapshots de convocatorias que ya no están en la vista activa.
-    Útil para mantener la tabla limpia.
+    Útil para mantener la tabla limpia. La vista se lee siempre de Synapse (sin caché):
+    con datos vencidos se podría borrar el snapshot de una convocatoria recién activada
+    y la próxima ejecución volvería a notificar todos sus postulados.
     """
 )
 def limpiar_snapshots_inactivos(
@@ -149,22 +238,40 @@ def limpiar_snapshots_inactivos(
     snapshot_repo = ConvocatoriaSnapshotRepository(session)
     analytics_repo = NotificacionAnalyticsRepository(synapse_session)
     
-    # Obtener IDs de convocatorias activas
-    convocatorias_activas = analytics_repo.get_postulados_por_convocatoria()
-    ids_activos = {conv['id_convocatoria'] for conv in convocatorias_activas}
+    # Obtener IDs de convocatorias activas; el borrado no puede decidirse con la caché
+    convocatorias_activas = analytics_repo.get_filas_postulados(usar_cache=False)
+    ids_activos = {conv.id_convocatoria for conv in convocatorias_activas}
     
-    # Obtener todos los snapshots
-    todos_snapshots = snapshot_repo.get_all_snapshots()
+    # Obtener los IDs de todos los snapshots (índice compacto, sin entidades ORM)
+    todos_snapshots = snapshot_repo.get_indice_snapshots()
     
     # Eliminar los que ya no están activos
     eliminados = 0
-    for snapshot in todos_snapshots:
-        if snapshot.id_convocatoria not in ids_activos:
-            snapshot_repo.eliminar_snapshot(snapshot.id_convocatoria)
+    for id_convocatoria in todos_snapshots:
+        if id_convocatoria not in ids_activos:
+            snapshot_repo.eliminar_snapshot(id_convocatoria)
             eliminados += 1
     
     return {
         "mensaje": f"Se limpiaron {eliminados} snapshots de convocatorias inactivas",
         "snapshots_eliminados": eliminados,
         "snapshots_restantes": len(todos_snapshots) - eliminados
-    }
\ No newline at end of file
+    }
+
+
+@router.delete(
+    "/cache-postulados",
+    status_code=status.HTTP_200_OK,
+    summary="Descartar la vista de postulados cacheada",
+    description="""
+    Descarta la copia en caché de la vista de postulados de Synapse de esta instancia;
+    la próxima consulta de monitoreo vuelve a leerla.
+    """
+)
+def invalidar_cache_postulados():
+    """
+    Invalida la caché de postulados del proceso.
+    """
+    cache = get_cache_postulados()
+    cache.invalidar()
+    return {"mensaje": "Caché de postulados invalidada", "cache_postulados": cache.estadisticas()}
@@ -0,0 +1,120 @@
+from bisect import bisect_left
+from operator import attrgetter
+from typing import List, Mapping, Sequence, Union
+
+from ..dto.postulacion_dto import IncrementoPostulacionesDTO, ConvocatoriaPostuladosRow, IndiceSnapshots
+from ..config.scheduler import DETECCION_NUMPY
+
+# Detección de incrementos por columnas: los totales actuales y previos de un bloque se
+# alinean por posición en dos vectores de enteros, la diferencia se calcula en una sola
+# pasada y solo se construyen DTOs para las convocatorias con incremento (una minoría).
+
+_ids = attrgetter("id_convocatoria")
+_totales = attrgetter("total_postulados")
+
+_numpy = None
+_numpy_cargado = False
+
+def _cargar_numpy():
+    """NumPy es opcional y se importa en el primer uso (no en el arranque del scheduler)"""
+    global _numpy, _numpy_cargado
+    if not _numpy_cargado:
+        try:
+            import numpy  # dependencia opcional
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+        _numpy_cargado = True
+    return _numpy
+
+TotalesPrevios = Union[IndiceSnapshots, Mapping[int, int]]
+
+def alinear_totales_previos(
+    ids: List[int],
+    totales_previos: TotalesPrevios,
+    usar_numpy: bool = DETECCION_NUMPY
+) -> Sequence[int]:
+    """
+    Total previo de cada id, en el mismo orden (0 si no hay snapshot).
+
+    Con un IndiceSnapshots y NumPy la búsqueda es vectorizada (searchsorted sobre los
+    arreglos del índice, sin copiarlos); sin NumPy es una búsqueda binaria por id.
+    """
+    if not isinstance(totales_previos, IndiceSnapshots):
+        obtener_previo = totales_previos.get
+        return [obtener_previo(id_conv, 0) for id_conv in ids]
+
+    indice_ids, indice_totales = totales_previos.ids, totales_previos.totales
+    if not indice_ids:
+        return [0] * len(ids)
+
+    np = _cargar_numpy() if usar_numpy else None
+    if np is not None:
+        vector_ids = np.frombuffer(indice_ids, dtype=np.int64)
+        buscados = np.asarray(ids, dtype=np.int64)
+        posiciones = np.minimum(np.searchsorted(vector_ids, buscados), len(vector_ids) - 1)
+        encontrados = vector_ids[posiciones] == buscados
+        return np.where(encontrados, np.frombuffer(indice_totales, dtype=np.int64)[posiciones], 0)
+
+    ultimo = len(indice_ids) - 1
+    previos = []
+    for id_conv in ids:
+        posicion = min(bisect_left(indice_ids, id_conv), ultimo)
+        previos.append(indice_totales[posicion] if indice_ids[posicion] == id_conv else 0)
+    return previos
+
+def posiciones_con_incremento(
+    actuales: Sequence[int],
+    previos: Sequence[int],
+    usar_numpy: bool = DETECCION_NUMPY
+) -> List[int]:
+    """
+    Posiciones donde el total actual supera al previo.
+
+    Args:
+        actuales: Totales actuales del bloque
+        previos: Totales previos alineados con `actuales` (0 si no había snapshot)
+        usar_numpy: Vectorizar con NumPy si está disponible
+    """
+    np = _cargar_numpy() if usar_numpy else None
+    if np is not None:
+        delta = np.asarray(actuales, dtype=np.int64) - np.asarray(previos, dtype=np.int64)
+        return np.flatnonzero(delta > 0).tolist()
+    return [i for i, (actual, previo) in enumerate(zip(actuales, previos)) if actual > previo]
+
+def detectar_incrementos(
+    bloque: Sequence[ConvocatoriaPostuladosRow],
+    totales_previos: TotalesPrevios,
+    usar_numpy: bool = DETECCION_NUMPY
+) -> List[IncrementoPostulacionesDTO]:
+    """
+    Compara un bloque de la vista con los totales del último snapshot.
+
+    Regla de negocio: una convocatoria sin snapshot cuenta con total previo 0, así que en
+    la primera ejecución se notifican todas sus postulaciones.
+
+    Args:
+        bloque: Filas leídas de Synapse
+        totales_previos: id_convocatoria -> total_postulados del snapshot (índice o dict)
+        usar_numpy: Vectorizar con NumPy si está disponible
+
+    Returns:
+        Solo las convocatorias con nuevas postulaciones, en el orden del bloque
+    """
+    ids = list(map(_ids, bloque))
+    actuales = list(map(_totales, bloque))
+    previos = alinear_totales_previos(ids, totales_previos, usar_numpy)
+
+    incrementos = []
+    for posicion in posiciones_con_incremento(actuales, previos, usar_numpy):
+        conv = bloque[posicion]
+        total_anterior = int(previos[posicion])
+        incrementos.append(IncrementoPostulacionesDTO(
+            id_empresa=conv.id_empresa,
+            id_convocatoria=conv.id_convocatoria,
+            titulo=conv.titulo,
+            total_anterior=total_anterior,
+            total_actual=conv.total_postulados,
+            nuevas_postulaciones=conv.total_postulados - total_anterior
+        ))
+    return incrementos
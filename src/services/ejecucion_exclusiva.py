@@ -0,0 +1,126 @@
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict
+from uuid import uuid4
+
+from sqlmodel import Session
+
+from ..repositories.lease_repo import LeaseRepository
+from ..exception.ejecucion_en_curso import EjecucionEnCurso
+from ..config.scheduler import (
+    LEASE_SEGUNDOS,
+    ESPERA_MAX_SEGUNDOS,
+    ESPERA_INTERVALO_SEGUNDOS
+)
+
+logger = logging.getLogger(__name__)
+
+class EjecucionExclusiva:
+    """
+    Garantiza que un proceso programado tenga una sola ejecución a la vez entre todos
+    sus disparadores (Azure Function, endpoint) e instancias, con un lease en la base
+    de datos. Un llamador concurrente recibe EjecucionEnCurso o, si decide esperar,
+    el resumen de la ejecución en curso cuando termina.
+    """
+
+    def __init__(
+        self,
+        crear_sesion: Callable[[], Session],
+        proceso: str,
+        duracion_segundos: float = LEASE_SEGUNDOS,
+        espera_max_segundos: float = ESPERA_MAX_SEGUNDOS,
+        intervalo_segundos: float = ESPERA_INTERVALO_SEGUNDOS
+    ):
+        # Cada operación del lease usa su propia sesión corta, ajena a la de la ejecución
+        self.crear_sesion = crear_sesion
+        self.proceso = proceso
+        self.duracion_segundos = duracion_segundos
+        self.espera_max_segundos = espera_max_segundos
+        self.intervalo_segundos = intervalo_segundos
+
+    def ejecutar(self, funcion: Callable[[], Dict[str, Any]], esperar: bool = False) -> Dict[str, Any]:
+        """
+        Ejecuta `funcion` con el lease del proceso tomado.
+
+        Args:
+            funcion: Ejecución del proceso; devuelve su resumen
+            esperar: Si hay otra ejecución en curso, esperar y devolver su resumen (sin
+                detalle, con "compartida": True) en lugar de lanzar EjecucionEnCurso
+
+        Raises:
+            EjecucionEnCurso: Hay otra ejecución en curso y no se espera, o no terminó
+                dentro de espera_max_segundos
+        """
+        titular = str(uuid4())
+        limite_espera = time.monotonic() + self.espera_max_segundos
+
+        while True:
+            if self._operar(lambda repo: repo.adquirir(self.proceso, titular, self.duracion_segundos)):
+                return self._ejecutar_como_titular(titular, funcion)
+
+            lease = self._operar(lambda repo: repo.get(self.proceso))
+            if lease is None or lease.titular is None:
+                # Se liberó entre el intento y la lectura: se vuelve a intentar
+                continue
+            if not esperar:
+                raise EjecucionEnCurso(
+                    f"El proceso {self.proceso} ya tiene una ejecución en curso "
+                    f"(iniciada {lease.fecha_adquisicion:%Y-%m-%d %H:%M:%S} UTC)."
+                )
+
+            en_curso = lease.titular
+            while lease.titular == en_curso and lease.expira > datetime.utcnow():
+                if time.monotonic() > limite_espera:
+                    raise EjecucionEnCurso(
+                        f"La ejecución en curso del proceso {self.proceso} no terminó "
+                        f"en {self.espera_max_segundos:.0f} segundos."
+                    )
+                time.sleep(self.intervalo_segundos)
+                lease = self._operar(lambda repo: repo.get(self.proceso))
+
+            if lease.ultimo_titular == en_curso and lease.ultimo_resultado is not None:
+                return {**json.loads(lease.ultimo_resultado), "compartida": True}
+            # La ejecución esperada falló o venció sin liberar: se intenta tomar el lease
+
+    def _ejecutar_como_titular(self, titular: str, funcion: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        detener = threading.Event()
+        renovacion = threading.Thread(
+            target=self._renovar_periodicamente,
+            args=(titular, detener),
+            name=f"lease-{self.proceso}",
+            daemon=True
+        )
+        renovacion.start()
+
+        resultado_json = None
+        try:
+            resultado = funcion()
+            # Para quienes esperaban: el resumen sin el detalle por convocatoria
+            resultado_json = json.dumps(
+                {clave: valor for clave, valor in resultado.items() if clave != "detalle"},
+                default=str
+            )
+            return resultado
+        finally:
+            detener.set()
+            renovacion.join()
+            if not self._operar(lambda repo: repo.liberar(self.proceso, titular, resultado_json)):
+                logger.warning(f"El lease de {self.proceso} venció antes de terminar la ejecución {titular}")
+
+    def _renovar_periodicamente(self, titular: str, detener: threading.Event) -> None:
+        """Renueva el lease cada tercio de su vigencia mientras la ejecución sigue viva"""
+        while not detener.wait(self.duracion_segundos / 3):
+            try:
+                if not self._operar(lambda repo: repo.renovar(self.proceso, titular, self.duracion_segundos)):
+                    logger.warning(f"Se perdió el lease de {self.proceso} (ejecución {titular})")
+                    return
+            except Exception as e:
+                # Un fallo puntual no detiene la ejecución; se reintenta en el próximo ciclo
+                logger.warning(f"No se pudo renovar el lease de {self.proceso}: {e}")
+
+    def _operar(self, operacion: Callable[[LeaseRepository], Any]) -> Any:
+        with self.crear_sesion() as session:
+            return operacion(LeaseRepository(session))
@@ -0,0 +1,171 @@
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+from ..repositories.notificacion_async_repo import NotificacionAsyncRepository
+from ..dto.notificacion_dto import NotificacionCreateDTO, NotificacionResponseDTO, ConteoNoLeidasDTO
+from ..dto.paginacion_dto import (
+    PaginaNotificacionesDTO,
+    TAMANO_PAGINA_DEFECTO,
+    MAX_TAMANO_PAGINA,
+    construir_pagina,
+    decodificar_cursor,
+    etag_pagina
+)
+from ..models.notificacion import Notificacion
+from ..repositories.contador_no_leidas_repo import AMBITO_USUARIO, AMBITO_EMPRESA
+from ..exception.notificacion_not_found import NotificacionNotFound
+from ..push.hub import HubNotificaciones, get_hub_notificaciones
+
+class NotificacionAsyncService:
+    """Versión asíncrona de NotificacionService para las rutas async"""
+
+    def __init__(self, notificacionRepository: NotificacionAsyncRepository, hub: Optional[HubNotificaciones] = None):
+        self.notificacionRepository = notificacionRepository
+        # Caché de lectura de los feeds; el repositorio la invalida en cada escritura
+        self.cache = notificacionRepository.cache
+        # Envío en vivo a los clientes suscritos por usuario y por empresa
+        self.hub = hub or get_hub_notificaciones()
+
+    async def get_by_id(self, session: AsyncSession, id_notificacion: UUID) -> NotificacionResponseDTO:
+        entidad = await self.notificacionRepository.get_by_id(session, id_notificacion)
+        if not entidad:
+            raise NotificacionNotFound(f"Notificación {id_notificacion} no encontrada.")
+        return NotificacionResponseDTO.model_validate(entidad)
+
+    async def listar_todas(self, session: AsyncSession, limit: int = TAMANO_PAGINA_DEFECTO, cursor: Optional[str] = None) -> PaginaNotificacionesDTO:
+        return await self._listar_pagina(session, limit, cursor)
+
+    async def listar_no_leidas(self, session: AsyncSession, limit: int = TAMANO_PAGINA_DEFECTO, cursor: Optional[str] = None) -> PaginaNotificacionesDTO:
+        return await self._listar_pagina(session, limit, cursor, solo_no_leidas=True)
+    
+    async def listar_dado_id_usuario(self, session: AsyncSession, id_usuario:int, limit: int = TAMANO_PAGINA_DEFECTO, cursor: Optional[str] = None, etag: Optional[str] = None) -> PaginaNotificacionesDTO:
+        
+        # Poner validación de ID cuando se tenga acceso. Con el ETag (versión leída de la
+        # base) en la clave, una página cacheada nunca es más vieja que el ETag que la acompaña
+        return await self.cache.obtener_async(
+            AMBITO_USUARIO, id_usuario, (limit, cursor, etag),
+            lambda: self._listar_pagina(session, limit, cursor, id_usuario=id_usuario)
+        )
+    
+    async def listar_dado_id_empresa(self, session: AsyncSession, id_empresa:int, limit: int = TAMANO_PAGINA_DEFECTO, cursor: Optional[str] = None, etag: Optional[str] = None) -> PaginaNotificacionesDTO:
+        
+        # Poner validación de ID cuando se tenga acceso. Con el ETag (versión leída de la
+        # base) en la clave, una página cacheada nunca es más vieja que el ETag que la acompaña
+        return await self.cache.obtener_async(
+            AMBITO_EMPRESA, id_empresa, (limit, cursor, etag),
+            lambda: self._listar_pagina(session, limit, cursor, id_empresa=id_empresa)
+        )
+
+    async def etag_feed_usuario(self, session: AsyncSession, id_usuario: int, limit: int, cursor: Optional[str]) -> str:
+        """
+        ETag de una página del feed de un usuario, calculado sin cargar notificaciones.
+        La versión se consulta en la base en cada petición (no se cachea): también refleja
+        las escrituras de otros procesos, como el scheduler u otros workers.
+        """
+        version = await self.notificacionRepository.get_version_feed(session, id_usuario=id_usuario)
+        return etag_pagina(version, limit, cursor)
+
+    async def etag_feed_empresa(self, session: AsyncSession, id_empresa: int, limit: int, cursor: Optional[str]) -> str:
+        """
+        ETag de una página del feed de una empresa, calculado sin cargar notificaciones.
+        La versión se consulta en la base en cada petición (no se cachea): también refleja
+        las escrituras de otros procesos, como el scheduler u otros workers.
+        """
+        version = await self.notificacionRepository.get_version_feed(session, id_empresa=id_empresa)
+        return etag_pagina(version, limit, cursor)
+
+    async def _listar_pagina(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: Optional[str],
+        **filtros
+    ) -> PaginaNotificacionesDTO:
+        """Página keyset; el tamaño nunca supera MAX_TAMANO_PAGINA"""
+        despues_de = decodificar_cursor(cursor) if cursor else None
+        limite = max(1, min(limit, MAX_TAMANO_PAGINA))
+        results, hay_mas = await self.notificacionRepository.get_pagina(session, limite, despues_de, **filtros)
+        return construir_pagina(results, hay_mas)
+    
+    async def conteo_no_leidas_usuario(self, session: AsyncSession, id_usuario: int) -> ConteoNoLeidasDTO:
+        """Conteo de no leídas de un usuario leído de los contadores mantenidos"""
+        return ConteoNoLeidasDTO(**await session.run_sync(self.notificacionRepository.contadores.get_conteo, AMBITO_USUARIO, id_usuario))
+
+    async def conteo_no_leidas_empresa(self, session: AsyncSession, id_empresa: int) -> ConteoNoLeidasDTO:
+        """Conteo de no leídas de una empresa leído de los contadores mantenidos"""
+        return ConteoNoLeidasDTO(**await session.run_sync(self.notificacionRepository.contadores.get_conteo, AMBITO_EMPRESA, id_empresa))
+
+    async def create(self, session: AsyncSession, notificacionDto: NotificacionCreateDTO) -> NotificacionResponseDTO:
+        notificacion = Notificacion(**notificacionDto.model_dump())
+        nueva_notificacion = await self.notificacionRepository.create(session, notificacion)
+        self.hub.publicar_notificaciones([nueva_notificacion])
+        return NotificacionResponseDTO.model_validate(nueva_notificacion)
+
+    async def update(self, session: AsyncSession, id_notificacion: UUID, notificacionDto: NotificacionCreateDTO) -> NotificacionResponseDTO:
+        entidad = await self.notificacionRepository.get_by_id(session, id_notificacion)
+        if not entidad:
+            raise NotificacionNotFound(f"Notificación {id_notificacion} no encontrada.")
+
+        for key, value in notificacionDto.model_dump(exclude_unset=True).items():
+            setattr(entidad, key, value)
+
+        notificacion_actualizada = await self.notificacionRepository.update(session, entidad)
+        return NotificacionResponseDTO.model_validate(notificacion_actualizada)
+
+    async def marcar_como_leida(self, session: AsyncSession, id_notificacion: UUID) -> NotificacionResponseDTO:
+        entidad = await self.notificacionRepository.get_by_id(session, id_notificacion)
+        if not entidad:
+            raise NotificacionNotFound(f"Notificación {id_notificacion} no encontrada.")
+
+        entidad.leida = True
+        entidad.fecha_lectura = datetime.now()
+
+        notificacion_actualizada = await self.notificacionRepository.update(session, entidad)
+        return NotificacionResponseDTO.model_validate(notificacion_actualizada)
+
+    async def marcar_todas_leidas_usuario(self, session: AsyncSession, id_usuario: int) -> dict:
+        """Marcar todas las notificaciones de un usuario como leídas"""
+        cantidad = await self.notificacionRepository.marcar_leidas(session, datetime.now(), id_usuario=id_usuario)
+        
+        if not cantidad:
+            return {
+                "mensaje": "No hay notificaciones sin leer para este usuario",
+                "cantidad_actualizada": 0
+            }
+        
+        return {
+            "mensaje": f"Se marcaron {cantidad} notificaciones como leídas",
+            "cantidad_actualizada": cantidad
+        }
+
+    async def marcar_todas_leidas_empresa(self, session: AsyncSession, id_empresa: int) -> dict:
+        """Marcar todas las notificaciones de una empresa como leídas"""
+        cantidad = await self.notificacionRepository.marcar_leidas(session, datetime.now(), id_empresa=id_empresa)
+        
+        if not cantidad:
+            return {
+                "mensaje": "No hay notificaciones sin leer para esta empresa",
+                "cantidad_actualizada": 0
+            }
+        
+        return {
+            "mensaje": f"Se marcaron {cantidad} notificaciones como leídas",
+            "cantidad_actualizada": cantidad
+        }
+
+    async def marcar_leidas_por_ids(self, session: AsyncSession, ids: List[int]) -> dict:
+        """Marcar como leídas una lista de notificaciones (las ya leídas o inexistentes se ignoran)"""
+        cantidad = await self.notificacionRepository.marcar_leidas(session, datetime.now(), ids=list(ids))
+        
+        return {
+            "mensaje": f"Se marcaron {cantidad} notificaciones como leídas",
+            "cantidad_actualizada": cantidad
+        }
+
+    async def delete(self, session: AsyncSession, id_notificacion: UUID) -> None:
+        entidad = await self.notificacionRepository.get_by_id(session, id_notificacion)
+        if not entidad:
+            raise NotificacionNotFound(f"Notificación {id_notificacion} no encontrada.")
+
+        await self.notificacionRepository.delete(session, entidad)
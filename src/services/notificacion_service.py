@@ -1,15 +1,29 @@
 from sqlmodel import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID  
 from datetime import datetime
 from ..repositories.notificacion_repo import NotificacionRepository
-from ..dto.notificacion_dto import NotificacionCreateDTO, NotificacionResponseDTO
+from ..dto.notificacion_dto import NotificacionCreateDTO, NotificacionResponseDTO, ConteoNoLeidasDTO
+from ..dto.paginacion_dto import (
+    PaginaNotificacionesDTO,
+    TAMANO_PAGINA_DEFECTO,
+    MAX_TAMANO_PAGINA,
+    construir_pagina,
+    decodificar_cursor,
+    etag_pagina
+)
 from ..models.notificacion import Notificacion
-from ..exception.notificacion_not_found import NotificacionNotFound 
+from ..repositories.contador_no_leidas_repo import AMBITO_USUARIO, AMBITO_EMPRESA
+from ..exception.notificacion_not_found import NotificacionNotFound
+from ..push.hub import HubNotificaciones, get_hub_notificaciones 
 
 class NotificacionService:
-    def __init__(self, notificacionRepository: NotificacionRepository):
+    def __init__(self, notificacionRepository: NotificacionRepository, hub: Optional[HubNotificaciones] = None):
         self.notificacionRepository = notificacionRepository
+        # Caché de lectura de los feeds; el repositorio la invalida en cada escritura
+        self.cache = notificacionRepository.cache
+        # Envío en vivo a los clientes suscritos por usuario y por empresa
+        self.hub = hub or get_hub_notificaciones()
     
     def get_by_id(self, session: Session, id_notificacion: UUID) -> NotificacionResponseDTO:  # UUID en lugar de int
         entidad = self.notificacionRepository.get_by_id(session, id_notificacion)
@@ -17,29 +31,73 @@ class NotificacionService:
             raise NotificacionNotFound(f"Notificación {id_notificacion} no encontrada.")
         return NotificacionResponseDTO.model_validate(entidad)
 
-    def listar_todas(self, session: Session, limit: int = 100, offset: int = 0) -> List[NotificacionResponseDTO]:
-        results = self.notificacionRepository.list_all(session, offset, limit)
-        return [NotificacionResponseDTO.model_validate(e) for e in results]
+    def listar_todas(self, session: Session, limit: int = TAMANO_PAGINA_DEFECTO, cursor: Optional[str] = None) -> PaginaNotificacionesDTO:
+        return self._listar_pagina(session, limit, cursor)
 
-    def listar_no_leidas(self, session: Session) -> List[NotificacionResponseDTO]:
-        results = self.notificacionRepository.get_by_status(session)
-        return [NotificacionResponseDTO.model_validate(e) for e in results]
+    def listar_no_leidas(self, session: Session, limit: int = TAMANO_PAGINA_DEFECTO, cursor: Optional[str] = None) -> PaginaNotificacionesDTO:
+        return self._listar_pagina(session, limit, cursor, solo_no_leidas=True)
     
-    def listar_dado_id_usuario(self, session: Session, id_usuario:int) -> List[NotificacionResponseDTO]:
-        
-        # Poner validación de ID cuando se tenga acceso
-        results = self.notificacionRepository.get_by_id_usuario(session, id_usuario)
-        return [NotificacionResponseDTO.model_validate(e) for e in results]
+    def listar_dado_id_usuario(self, session: Session, id_usuario:int, limit: int = TAMANO_PAGINA_DEFECTO, cursor: Optional[str] = None, etag: Optional[str] = None) -> PaginaNotificacionesDTO:
+        
+        # Poner validación de ID cuando se tenga acceso. Con el ETag (versión leída de la
+        # base) en la clave, una página cacheada nunca es más vieja que el ETag que la acompaña
+        return self.cache.obtener(
+            AMBITO_USUARIO, id_usuario, (limit, cursor, etag),
+            lambda: self._listar_pagina(session, limit, cursor, id_usuario=id_usuario)
+        )
     
-    def listar_dado_id_empresa(self, session: Session, id_empresa:int) -> List[NotificacionResponseDTO]:
-        
-        # Poner validación de ID cuando se tenga acceso
-        results = self.notificacionRepository.get_by_id_empresa(session, id_empresa)
-        return [NotificacionResponseDTO.model_validate(e) for e in results]
+    def listar_dado_id_empresa(self, session: Session, id_empresa:int, limit: int = TAMANO_PAGINA_DEFECTO, cursor: Optional[str] = None, etag: Optional[str] = None) -> PaginaNotificacionesDTO:
+        
+        # Poner validación de ID cuando se tenga acceso. Con el ETag (versión leída de la
+        # base) en la clave, una página cacheada nunca es más vieja que el ETag que la acompaña
+        return self.cache.obtener(
+            AMBITO_EMPRESA, id_empresa, (limit, cursor, etag),
+            lambda: self._listar_pagina(session, limit, cursor, id_empresa=id_empresa)
+        )
+
+    def etag_feed_usuario(self, session: Session, id_usuario: int, limit: int, cursor: Optional[str]) -> str:
+        """
+        ETag de una página del feed de un usuario, calculado sin cargar notificaciones.
+        La versión se consulta en la base en cada petición (no se cachea): también refleja
+        las escrituras de otros procesos, como el scheduler u otros workers.
+        """
+        version = self.notificacionRepository.get_version_feed(session, id_usuario=id_usuario)
+        return etag_pagina(version, limit, cursor)
+
+    def etag_feed_empresa(self, session: Session, id_empresa: int, limit: int, cursor: Optional[str]) -> str:
+        """
+        ETag de una página del feed de una empresa, calculado sin cargar notificaciones.
+        La versión se consulta en la base en cada petición (no se cachea): también refleja
+        las escrituras de otros procesos, como el scheduler u otros workers.
+        """
+        version = self.notificacionRepository.get_version_feed(session, id_empresa=id_empresa)
+        return etag_pagina(version, limit, cursor)
+
+    def _listar_pagina(
+        self,
+        session: Session,
+        limit: int,
+        cursor: Optional[str],
+        **filtros
+    ) -> PaginaNotificacionesDTO:
+        """Página keyset; el tamaño nunca supera MAX_TAMANO_PAGINA"""
+        despues_de = decodificar_cursor(cursor) if cursor else None
+        limite = max(1, min(limit, MAX_TAMANO_PAGINA))
+        results, hay_mas = self.notificacionRepository.get_pagina(session, limite, despues_de, **filtros)
+        return construir_pagina(results, hay_mas)
     
+    def conteo_no_leidas_usuario(self, session: Session, id_usuario: int) -> ConteoNoLeidasDTO:
+        """Conteo de no leídas de un usuario leído de los contadores mantenidos"""
+        return ConteoNoLeidasDTO(**self.notificacionRepository.contadores.get_conteo(session, AMBITO_USUARIO, id_usuario))
+
+    def conteo_no_leidas_empresa(self, session: Session, id_empresa: int) -> ConteoNoLeidasDTO:
+        """Conteo de no leídas de una empresa leído de los contadores mantenidos"""
+        return ConteoNoLeidasDTO(**self.notificacionRepository.contadores.get_conteo(session, AMBITO_EMPRESA, id_empresa))
+
     def create(self, session: Session, notificacionDto: NotificacionCreateDTO) -> NotificacionResponseDTO:
         notificacion = Notificacion(**notificacionDto.model_dump())
         nueva_notificacion = self.notificacionRepository.create(session, notificacion)
+        self.hub.publicar_notificaciones([nueva_notificacion])
         return NotificacionResponseDTO.model_validate(nueva_notificacion)
 
     def update(self, session: Session, id_notificacion: UUID, notificacionDto: NotificacionCreateDTO) -> NotificacionResponseDTO:  # UUID
@@ -68,46 +126,41 @@ class NotificacionService:
     
     def marcar_todas_leidas_usuario(self, session: Session, id_usuario: int) -> dict:
         """Marcar todas las notificaciones de un usuario como leídas"""
-        notificaciones = self.notificacionRepository.get_no_leidas_by_usuario(session, id_usuario)
+        cantidad = self.notificacionRepository.marcar_leidas(session, datetime.now(), id_usuario=id_usuario)
         
-        if not notificaciones:
+        if not cantidad:
             return {
                 "mensaje": "No hay notificaciones sin leer para este usuario",
                 "cantidad_actualizada": 0
             }
         
-        fecha_actual = datetime.now()
-        for notificacion in notificaciones:
-            notificacion.leida = True
-            notificacion.fecha_lectura = fecha_actual
-        
-        self.notificacionRepository.update_many(session, notificaciones)
-        
         return {
-            "mensaje": f"Se marcaron {len(notificaciones)} notificaciones como leídas",
-            "cantidad_actualizada": len(notificaciones)
+            "mensaje": f"Se marcaron {cantidad} notificaciones como leídas",
+            "cantidad_actualizada": cantidad
         }
 
     def marcar_todas_leidas_empresa(self, session: Session, id_empresa: int) -> dict:
         """Marcar todas las notificaciones de una empresa como leídas"""
-        notificaciones = self.notificacionRepository.get_no_leidas_by_empresa(session, id_empresa)
+        cantidad = self.notificacionRepository.marcar_leidas(session, datetime.now(), id_empresa=id_empresa)
         
-        if not notificaciones:
+        if not cantidad:
             return {
                 "mensaje": "No hay notificaciones sin leer para esta empresa",
                 "cantidad_actualizada": 0
             }
         
-        fecha_actual = datetime.now()
-        for notificacion in notificaciones:
-            notificacion.leida = True
-            notificacion.fecha_lectura = fecha_actual
-        
-        self.notificacionRepository.update_many(session, notificaciones)
+        return {
+            "mensaje": f"Se marcaron {cantidad} notificaciones como leídas",
+            "cantidad_actualizada": cantidad
+        }
+
+    def marcar_leidas_por_ids(self, session: Session, ids: List[int]) -> dict:
+        """Marcar como leídas una lista de notificaciones (las ya leídas o inexistentes se ignoran)"""
+        cantidad = self.notificacionRepository.marcar_leidas(session, datetime.now(), ids=list(ids))
         
         return {
-            "mensaje": f"Se marcaron {len(notificaciones)} notificaciones como leídas",
-            "cantidad_actualizada": len(notificaciones)
+            "mensaje": f"Se marcaron {cantidad} notificaciones como leídas",
+            "cantidad_actualizada": cantidad
         }
 
     def delete(self, session: Session, id_notificacion: UUID) -> None:  # UUID
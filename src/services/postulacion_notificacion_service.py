@@ -1,13 +1,38 @@
 from sqlmodel import Session
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple, Callable, Sequence
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime, timedelta
+import multiprocessing
+import time
+import re
 
 from ..repositories.notificacion_repo import NotificacionRepository
+from ..repositories.contador_no_leidas_repo import ID_USUARIO_SISTEMA
 from ..repositories.convocatoria_snapshot_repo import ConvocatoriaSnapshotRepository
 from ..repositories.analytic_repo import NotificacionAnalyticsRepository
+from ..repositories.marca_agua_repo import MarcaAguaRepository
+from ..repositories.ejecucion_scheduler_repo import EjecucionSchedulerRepository
+from ..models.ejecucion_scheduler import EjecucionScheduler
 from ..models.notificacion import Notificacion
-from ..dto.postulacion_dto import IncrementoPostulacionesDTO
+from ..dto.postulacion_dto import IncrementoPostulacionesDTO, ConvocatoriaPostuladosRow
+from .deteccion_incrementos import detectar_incrementos, TotalesPrevios
 from ..models.notificacionInt import NotificacionInt
+from ..push.hub import HubNotificaciones, get_hub_notificaciones
+from ..cache.postulados import get_cache_postulados
+from ..instrumentacion.etapas import MedidorEtapas, ObservadorProgreso, combinar_resumenes as combinar_instrumentacion
+from ..config.scheduler import (
+    TAMANO_LOTE_NOTIFICACIONES,
+    TAMANO_BLOQUE_SYNAPSE,
+    MODO_INCREMENTAL,
+    MARGEN_DELTA_SEGUNDOS,
+    NUM_SHARDS,
+    SHARDS_EN_PROCESOS,
+    PRESUPUESTO_SEGUNDOS,
+    REANUDAR_MAX_HORAS,
+    AGRUPAR_NO_LEIDAS,
+    USAR_CACHE_POSTULADOS
+)
 
 PRIORIDAD_MAP = {
     "BAJA": 1,
@@ -15,99 +40,392 @@ PRIORIDAD_MAP = {
     "ALTA": 3
 }
 
+# Nombre del proceso en la tabla de marcas de agua
+PROCESO_POSTULACIONES = "notificar_postulaciones"
+
+TIPO_NUEVA_POSTULACION = "NUEVA_POSTULACION"
+_PATRON_NUEVAS = re.compile(r"nuevas:(\d+)")
+
+def _nuevas_previas(datos_adicionales: Optional[str]) -> int:
+    """Postulaciones ya acumuladas en los datos_adicionales de una notificación (nuevas:N,total:M)"""
+    coincidencia = _PATRON_NUEVAS.search(datos_adicionales or "")
+    return int(coincidencia.group(1)) if coincidencia else 0
+
+def _en_bloques(iterable: Iterable, tamano: int) -> Iterator[List]:
+    """Agrupa un iterable (p. ej. un generador) en listas de a lo sumo `tamano` elementos"""
+    iterador = iter(iterable)
+    while bloque := list(islice(iterador, tamano)):
+        yield bloque
+
 class PostulacionNotificacionService:
     def __init__(
         self,
         notificacion_repo: NotificacionRepository,
         snapshot_repo: ConvocatoriaSnapshotRepository,
-        analytics_repo: NotificacionAnalyticsRepository
+        analytics_repo: NotificacionAnalyticsRepository,
+        tamano_lote_notificaciones: int = TAMANO_LOTE_NOTIFICACIONES,
+        tamano_bloque: int = TAMANO_BLOQUE_SYNAPSE,
+        hub: Optional[HubNotificaciones] = None,
+        agrupar_no_leidas: bool = AGRUPAR_NO_LEIDAS,
+        usar_cache_postulados: bool = USAR_CACHE_POSTULADOS
     ):
         self.notificacion_repo = notificacion_repo
         self.snapshot_repo = snapshot_repo
         self.analytics_repo = analytics_repo
+        self.tamano_lote_notificaciones = tamano_lote_notificaciones
+        self.tamano_bloque = tamano_bloque
+        # Envío en vivo de las notificaciones creadas a las empresas suscritas
+        self.hub = hub or get_hub_notificaciones()
+        # Actualizar la notificación no leída de la oferta en lugar de crear otra
+        self.agrupar_no_leidas = agrupar_no_leidas
+        # Reutilizar en la reconciliación completa la vista cacheada si está vigente
+        self.usar_cache_postulados = usar_cache_postulados
     
-    def procesar_nuevas_postulaciones(self, session: Session) -> Dict[str, Any]:
-        convocatorias_actuales = self.analytics_repo.get_postulados_por_convocatoria()
-        
-        if not convocatorias_actuales:
-            return {
-                "mensaje": "No hay convocatorias activas para procesar",
-                "notificaciones_creadas": 0,
-                "convocatorias_procesadas": 0
-            }
+    def procesar_nuevas_postulaciones(
+        self,
+        session: Session,
+        modo_incremental: bool = MODO_INCREMENTAL,
+        shard: Optional[Tuple[int, int]] = None,
+        presupuesto_segundos: float = PRESUPUESTO_SEGUNDOS,
+        progreso: Optional[ObservadorProgreso] = None
+    ) -> Dict[str, Any]:
+        """
+        Detecta incrementos de postulaciones, crea las notificaciones y actualiza los snapshots.
 
-        snapshots_previos = {
-            s.id_convocatoria: s 
-            for s in self.snapshot_repo.get_all_snapshots()
-        }
+        La vista se procesa por bloques en orden de id_convocatoria. Las notificaciones, los
+        contadores, los snapshots y el punto de control de cada bloque se confirman en una
+        sola transacción: si la ejecución se interrumpe, la siguiente invocación la reanuda
+        desde el último bloque confirmado, sin repetir notificaciones.
+
+        Args:
+            session: Sesión de la base principal. Los repositorios de notificaciones y de
+                snapshots deben usar esta misma sesión.
+            modo_incremental: Si es True solo se consultan las convocatorias modificadas
+                desde la última marca de agua; si es False (o no hay marca previa) se
+                reconcilia la vista completa. Una ejecución pendiente se reanuda en su modo.
+            shard: (indice, total) para procesar solo las empresas con
+                id_empresa % total == indice. Cada shard lleva su propia marca de agua.
+            presupuesto_segundos: Tiempo máximo de trabajo (0 = sin límite); al superarse
+                la ejecución queda pendiente y se informa "pendiente": True
+            progreso: Se invoca con (etapa, filas) al terminar cada ejecución de etapa
+
+        Returns:
+            Resumen de la ejecución, con la duración, filas y consultas de cada etapa
+            en "instrumentacion"
+        """
+        proceso = PROCESO_POSTULACIONES if shard is None else f"{PROCESO_POSTULACIONES}:{shard[0]}/{shard[1]}"
         
-        incrementos = self._detectar_incrementos(
-            convocatorias_actuales, 
-            snapshots_previos
-        )
+        # Duración, filas y consultas de cada etapa; se devuelven en el resumen y se emiten como spans
+        with MedidorEtapas(PROCESO_POSTULACIONES, {"proceso": proceso}, progreso=progreso) as medidor:
+            resumen = self._procesar(session, proceso, modo_incremental, shard, presupuesto_segundos, medidor)
         
-        notificaciones_creadas = 0
+        resumen["instrumentacion"] = medidor.resumen()
+        return resumen
+    
+    def _iniciar_o_reanudar(
+        self,
+        ejecuciones: EjecucionSchedulerRepository,
+        marca_agua_repo: MarcaAguaRepository,
+        proceso: str,
+        modo_incremental: bool
+    ) -> Tuple[EjecucionScheduler, bool]:
+        """Ejecución pendiente del proceso a reanudar, o una nueva"""
+        ejecucion = ejecuciones.get_en_curso(proceso)
+        if ejecucion is not None:
+            if ejecucion.fecha_actualizacion >= datetime.utcnow() - timedelta(hours=REANUDAR_MAX_HORAS):
+                return ejecuciones.reanudar(ejecucion), True
+            # Demasiado vieja: lo ya confirmado se conserva y se empieza de nuevo
+            ejecuciones.abandonar(ejecucion)
+        
+        marca_anterior = marca_agua_repo.get_marca(proceso) if modo_incremental else None
+        # Sin marca previa no hay delta posible: se hace una reconciliación completa
+        if marca_anterior is not None:
+            desde = marca_anterior - timedelta(seconds=MARGEN_DELTA_SEGUNDOS)
+            return ejecuciones.iniciar(proceso, "incremental", desde, marca_anterior), False
+        return ejecuciones.iniciar(proceso, "completo", None, None), False
+    
+    def _procesar(
+        self,
+        session: Session,
+        proceso: str,
+        modo_incremental: bool,
+        shard: Optional[Tuple[int, int]],
+        presupuesto_segundos: float,
+        medidor: MedidorEtapas
+    ) -> Dict[str, Any]:
+        inicio = time.monotonic()
+        marca_agua_repo = MarcaAguaRepository(session)
+        ejecuciones = EjecucionSchedulerRepository(session)
+        
+        with medidor.etapa("punto_control"):
+            ejecucion, reanudada = self._iniciar_o_reanudar(ejecuciones, marca_agua_repo, proceso, modo_incremental)
+        modo_incremental = ejecucion.modo == "incremental"
+        
+        cacheadas = None
+        if modo_incremental:
+            convocatorias_actuales = self.analytics_repo.iter_postulados_modificados_desde(
+                ejecucion.desde, self.tamano_bloque, shard=shard, despues_de=ejecucion.ultima_clave
+            )
+            # En modo incremental solo se cargan los snapshots de cada bloque
+            snapshots_previos = None
+        else:
+            cacheadas = (
+                self.analytics_repo.get_postulados_vigentes(shard=shard, despues_de=ejecucion.ultima_clave)
+                if self.usar_cache_postulados else None
+            )
+            if cacheadas is not None:
+                convocatorias_actuales, marca_lectura = cacheadas
+            else:
+                # La marca se toma antes de leer, con el reloj de Synapse: todo cambio
+                # posterior a la lectura tiene una fecha de cambio mayor
+                marca_lectura = self.analytics_repo.get_marca_origen(shard)
+                convocatorias_actuales = self.analytics_repo.iter_postulados_por_convocatoria(
+                    self.tamano_bloque, shard=shard, despues_de=ejecucion.ultima_clave
+                )
+            # Al reanudar se conserva la marca más antigua de las lecturas usadas
+            if marca_lectura is not None and (ejecucion.nueva_marca is None or marca_lectura < ejecucion.nueva_marca):
+                ejecucion.nueva_marca = marca_lectura
+            # Índice compacto id -> total (sin entidades ORM) de los snapshots del alcance
+            with medidor.etapa("lectura_snapshots") as registro:
+                snapshots_previos = self.snapshot_repo.get_indice_snapshots(shard=shard)
+                registro.filas = len(snapshots_previos)
+        
+        nueva_marca = ejecucion.nueva_marca
         detalles = []
+        pendiente = False
         
-        for incremento in incrementos:
-            if incremento.nuevas_postulaciones > 0:
-                notificacion = self._crear_notificacion_incremento(incremento)
-                
-                if notificacion:
-                    notificaciones_creadas += 1
-                    detalles.append({
+        # La vista se consume en streaming: cada bloque se procesa y se descarta.
+        # El tiempo de cada fetch a Synapse se mide aparte del procesamiento del bloque.
+        bloques = medidor.iterar("lectura_synapse", _en_bloques(convocatorias_actuales, self.tamano_bloque), len)
+        for bloque in bloques:
+            previos_bloque = snapshots_previos
+            if previos_bloque is None:
+                with medidor.etapa("lectura_snapshots") as registro:
+                    previos_bloque = self.snapshot_repo.get_indice_snapshots(
+                        ids_convocatoria=[conv.id_convocatoria for conv in bloque]
+                    )
+                    registro.filas = len(previos_bloque)
+            
+            with medidor.etapa("deteccion_incrementos") as registro:
+                incrementos = self._detectar_incrementos(bloque, previos_bloque)
+                registro.filas = len(bloque)
+            
+            # Solo llegan las convocatorias con nuevas postulaciones
+            with medidor.etapa("construccion_notificaciones") as registro:
+                notificaciones = []
+                detalles_bloque = []
+                for incremento in incrementos:
+                    notificaciones.append(self._construir_notificacion_incremento(incremento))
+                    detalles_bloque.append({
                         "id_convocatoria": incremento.id_convocatoria,
                         "titulo": incremento.titulo,
                         "nuevas_postulaciones": incremento.nuevas_postulaciones,
                         "total_actual": incremento.total_actual
                     })
+                registro.filas = len(notificaciones)
+            
+            # La reconciliación completa ya fijó su marca antes de leer
+            if modo_incremental:
+                for conv in bloque:
+                    if conv.fecha_cambio is not None and (nueva_marca is None or conv.fecha_cambio > nueva_marca):
+                        nueva_marca = conv.fecha_cambio
+            
+            # Los IDs generados solo se piden si hay a quién enviarlas en vivo, porque el
+            # RETURNING encarece el insert
+            publicar = bool(notificaciones) and self.hub.publicacion_activa()
+            agrupadas: List[NotificacionInt] = []
+            try:
+                if self.agrupar_no_leidas and notificaciones:
+                    with medidor.etapa("agrupacion_notificaciones") as registro:
+                        notificaciones, agrupadas = self._agrupar_en_no_leidas(incrementos, notificaciones)
+                        registro.filas = len(agrupadas)
+                
+                with medidor.etapa("insercion_notificaciones") as registro:
+                    ids = self.notificacion_repo.crear_en_lote(
+                        notificaciones,
+                        tamano_lote=self.tamano_lote_notificaciones,
+                        devolver_ids=publicar,
+                        confirmar=False
+                    )
+                    registro.filas = len(notificaciones)
+                
+                with medidor.etapa("actualizacion_snapshots") as registro:
+                    # Las filas cacheadas pueden ser más viejas que los snapshots: nunca los bajan
+                    resultado_snapshots = self._actualizar_snapshots(bloque, solo_aumentar=cacheadas is not None)
+                    registro.filas = resultado_snapshots["insertados"] + resultado_snapshots["actualizados"]
+                
+                # Notificaciones, contadores, snapshots y punto de control del bloque juntos
+                with medidor.etapa("confirmacion"):
+                    ejecuciones.registrar_bloque(
+                        ejecucion,
+                        ultima_clave=bloque[-1].id_convocatoria,
+                        nueva_marca=nueva_marca,
+                        convocatorias=len(bloque),
+                        con_incremento=len(incrementos),
+                        notificaciones=len(notificaciones),
+                        agrupadas=len(agrupadas),
+                        insertados=resultado_snapshots["insertados"],
+                        actualizados=resultado_snapshots["actualizados"]
+                    )
+                    session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            
+            ofertas_agrupadas = {notificacion.id_oferta for notificacion in agrupadas}
+            for detalle in detalles_bloque:
+                detalle["agrupada"] = detalle["id_convocatoria"] in ofertas_agrupadas
+            detalles.extend(detalles_bloque)
+            
+            self.notificacion_repo.invalidar_cache_notificaciones(notificaciones + agrupadas)
+            # Los snapshots confirmados ya son más nuevos que la vista cacheada
+            self.analytics_repo.invalidar_cache_postulados()
+            if publicar:
+                with medidor.etapa("publicacion") as registro:
+                    for notificacion, id_notificacion in zip(notificaciones, ids):
+                        notificacion.id_notificacion = id_notificacion
+                    # Las agrupadas se publican con su ID existente: el cliente la reemplaza
+                    self.hub.publicar_notificaciones(notificaciones + agrupadas)
+                    registro.filas = len(notificaciones) + len(agrupadas)
+            
+            if presupuesto_segundos and time.monotonic() - inicio > presupuesto_segundos:
+                # El resto queda para la próxima invocación, que reanuda desde este bloque
+                pendiente = True
+                break
+        
+        modo = "incremental" if modo_incremental else "completo"
+        if not pendiente:
+            # Sin fechas de cambio en la vista no se guarda marca: la próxima ejecución
+            # incremental hará una reconciliación completa
+            with medidor.etapa("marca_agua"):
+                if nueva_marca is not None:
+                    marca_agua_repo.guardar_marca(proceso, nueva_marca, modo)
+                ejecuciones.completar(ejecucion)
         
-        self._actualizar_snapshots(convocatorias_actuales)
+        resumen_ejecucion = {
+            "id_ejecucion": ejecucion.id_ejecucion,
+            "reanudada": reanudada,
+            "pendiente": pendiente,
+            "bloques_confirmados": ejecucion.bloques_confirmados,
+            "cache_postulados": cacheadas is not None
+        }
+        
+        if ejecucion.convocatorias_procesadas == 0:
+            return {
+                "mensaje": (
+                    "No hay convocatorias con cambios desde la última ejecución"
+                    if modo_incremental else
+                    "No hay convocatorias activas para procesar"
+                ),
+                "modo": modo,
+                "notificaciones_creadas": 0,
+                "convocatorias_procesadas": 0,
+                **resumen_ejecucion
+            }
         
+        # Los totales acumulan las invocaciones previas de una ejecución reanudada;
+        # el detalle solo cubre la invocación actual
         return {
-            "mensaje": f"Se procesaron {len(convocatorias_actuales)} convocatorias activas",
-            "notificaciones_creadas": notificaciones_creadas,
-            "convocatorias_procesadas": len(convocatorias_actuales),
-            "convocatorias_con_incremento": len([i for i in incrementos if i.nuevas_postulaciones > 0]),
+            "mensaje": (
+                f"Se procesaron {ejecucion.convocatorias_procesadas} convocatorias activas"
+                + (" (quedan pendientes para la próxima invocación)" if pendiente else "")
+            ),
+            "modo": modo,
+            "notificaciones_creadas": ejecucion.notificaciones_creadas,
+            "notificaciones_agrupadas": ejecucion.notificaciones_agrupadas,
+            "convocatorias_procesadas": ejecucion.convocatorias_procesadas,
+            "convocatorias_con_incremento": ejecucion.convocatorias_con_incremento,
+            "snapshots_insertados": ejecucion.snapshots_insertados,
+            "snapshots_actualizados": ejecucion.snapshots_actualizados,
+            **resumen_ejecucion,
             "detalle": detalles
         }
     
     def _detectar_incrementos(
         self, 
-        convocatorias_actuales: List[Dict],
-        snapshots_previos: Dict[int, Any]
+        convocatorias_actuales: Sequence[ConvocatoriaPostuladosRow],
+        totales_previos: TotalesPrevios
     ) -> List[IncrementoPostulacionesDTO]:
-        incrementos = []
+        """
+        Convocatorias del bloque cuyo total supera al del snapshot (ver deteccion_incrementos).
+
+        Args:
+            convocatorias_actuales: Bloque leído de Synapse
+            totales_previos: id_convocatoria -> total_postulados del último snapshot
+        """
+        return detectar_incrementos(convocatorias_actuales, totales_previos)
+    
+    def _agrupar_en_no_leidas(
+        self,
+        incrementos: List[IncrementoPostulacionesDTO],
+        notificaciones: List[NotificacionInt]
+    ) -> Tuple[List[NotificacionInt], List[NotificacionInt]]:
+        """
+        Agrupa las notificaciones del bloque en las NUEVA_POSTULACION aún no leídas de la
+        misma empresa y oferta, acumulando las nuevas postulaciones. No hace commit.
+
+        Args:
+            incrementos: Incrementos del bloque
+            notificaciones: Notificación construida para cada incremento (mismo orden)
+
+        Returns:
+            (notificaciones a insertar, notificaciones existentes actualizadas con su ID)
+        """
+        existentes = self.notificacion_repo.get_no_leidas_por_oferta(
+            TIPO_NUEVA_POSTULACION,
+            ID_USUARIO_SISTEMA,
+            ((notificacion.id_empresa, notificacion.id_oferta) for notificacion in notificaciones)
+        )
+        if not existentes:
+            return notificaciones, []
         
-        for conv in convocatorias_actuales:
-            id_conv = conv['id_convocatoria']
-            total_actual = conv['total_postulados']
-            
-            if id_conv in snapshots_previos:
-                total_anterior = snapshots_previos[id_conv].total_postulados
-                nuevas = max(0, total_actual - total_anterior)
+        nuevas = []
+        candidatas = []
+        for incremento, notificacion in zip(incrementos, notificaciones):
+            existente = existentes.get((notificacion.id_empresa, notificacion.id_oferta))
+            if existente is None:
+                nuevas.append(notificacion)
+                continue
+            id_notificacion, datos_adicionales = existente
+            agrupada = self._construir_notificacion_incremento(
+                incremento,
+                acumuladas=_nuevas_previas(datos_adicionales) + incremento.nuevas_postulaciones
+            )
+            agrupada.id_notificacion = id_notificacion
+            candidatas.append((notificacion, agrupada))
+        
+        leidas = self.notificacion_repo.agrupar_en_no_leidas(
+            [
+                {
+                    "id_notificacion": agrupada.id_notificacion,
+                    "id_usuario": agrupada.id_usuario,
+                    "id_empresa": agrupada.id_empresa,
+                    "asunto": agrupada.asunto,
+                    "mensaje": agrupada.mensaje,
+                    "datos_adicionales": agrupada.datos_adicionales
+                }
+                for _, agrupada in candidatas
+            ],
+            confirmar=False
+        )
+        
+        agrupadas = []
+        for notificacion, agrupada in candidatas:
+            # Leída o reasignada entre la consulta y el UPDATE: se crea una nueva, como sin agrupación
+            if agrupada.id_notificacion in leidas:
+                nuevas.append(notificacion)
             else:
-                # Regla de negocio: Notificar todo en la primera ejecución
-                total_anterior = 0
-                nuevas = total_actual
-            
-            incrementos.append(IncrementoPostulacionesDTO(
-                id_empresa=conv['id_empresa'],
-                id_convocatoria=id_conv,
-                titulo=conv['titulo'],
-                total_anterior=total_anterior,
-                total_actual=total_actual,
-                nuevas_postulaciones=nuevas
-            ))
-        
-        return incrementos
+                agrupadas.append(agrupada)
+        return nuevas, agrupadas
     
-    def _crear_notificacion_incremento(
+    def _construir_notificacion_incremento(
         self, 
-        incremento: IncrementoPostulacionesDTO
-    ) -> NotificacionInt | None:
+        incremento: IncrementoPostulacionesDTO,
+        acumuladas: Optional[int] = None
+    ) -> NotificacionInt:
         
-        cantidad = incremento.nuevas_postulaciones
+        # Al agrupar en una notificación no leída, el mensaje informa el acumulado
+        cantidad = acumuladas if acumuladas is not None else incremento.nuevas_postulaciones
         titulo = incremento.titulo
         
         if cantidad == 1:
@@ -115,10 +433,10 @@ class PostulacionNotificacionService:
         else:
             mensaje = f"Tienes {cantidad} nuevas postulaciones en '{titulo}'. Total: {incremento.total_actual}"
         
-        notificacion = NotificacionInt(
-            id_usuario=0, 
+        return NotificacionInt(
+            id_usuario=ID_USUARIO_SISTEMA,
             id_empresa=incremento.id_empresa,
-            tipo_notificacion="NUEVA_POSTULACION",
+            tipo_notificacion=TIPO_NUEVA_POSTULACION,
             asunto=f"Nuevas postulaciones en {titulo}",
             mensaje=mensaje,
             id_oferta=incremento.id_convocatoria, 
@@ -126,22 +444,16 @@ class PostulacionNotificacionService:
             datos_adicionales=f"nuevas:{cantidad},total:{incremento.total_actual}",
             leida=False
         )
-        
-        # Llama al método create_ que gestiona su propia sesión
-        return self.notificacion_repo.create_(notificacion)
     
-    def _actualizar_snapshots(self, convocatorias_actuales: List[Dict]) -> None:
-        snapshots_data = [
-            {
-                'id_empresa': conv['id_empresa'],
-                'id_convocatoria': conv['id_convocatoria'],
-                'titulo': conv['titulo'],
-                'total_postulados': conv['total_postulados']
-            }
-            for conv in convocatorias_actuales
-        ]
+    def _actualizar_snapshots(
+        self,
+        convocatorias_actuales: Iterable[ConvocatoriaPostuladosRow],
+        solo_aumentar: bool = False
+    ) -> Dict[str, int]:
+        """Upsert de los snapshots del bloque, sin commit (se confirma con el bloque)"""
+        snapshots_data = [conv._asdict() for conv in convocatorias_actuales]
         
-        self.snapshot_repo.actualizar_multiples_snapshots(snapshots_data)
+        return self.snapshot_repo.upsert_masivo_snapshots(snapshots_data, confirmar=False, solo_aumentar=solo_aumentar)
     
     def obtener_resumen_convocatorias(self, session: Session) -> Dict[str, Any]:
         """
@@ -149,7 +461,7 @@ class PostulacionNotificacionService:
         Útil para debugging y monitoreo.
         """
         convocatorias_actuales = self.analytics_repo.get_postulados_por_convocatoria()
-        snapshots = self.snapshot_repo.get_all_snapshots()
+        snapshots = self.snapshot_repo.get_indice_snapshots()
         
         return {
             "convocatorias_activas": len(convocatorias_actuales),
@@ -163,4 +475,118 @@ class PostulacionNotificacionService:
                 }
                 for conv in convocatorias_actuales
             ]
-        }
\ No newline at end of file
+        }
+
+
+def procesar_postulaciones_en_paralelo(
+    fabrica_sesion: Callable[[], Session],
+    fabrica_sesion_analitica: Callable[[], Session],
+    num_shards: int = NUM_SHARDS,
+    en_procesos: bool = SHARDS_EN_PROCESOS,
+    modo_incremental: bool = MODO_INCREMENTAL,
+    progreso: Optional[ObservadorProgreso] = None
+) -> Dict[str, Any]:
+    """
+    Ejecuta procesar_nuevas_postulaciones repartiendo las empresas en shards por
+    id_empresa, cada uno con sus propias sesiones, y combina los resúmenes.
+
+    Args:
+        fabrica_sesion: Crea una sesión nueva de la base principal
+        fabrica_sesion_analitica: Crea una sesión nueva de la fuente analítica (Synapse)
+        num_shards: Cantidad de shards (y de workers)
+        en_procesos: Usar un pool de procesos en lugar de hilos. Los procesos se inician con
+            "spawn": no heredan el engine, sus conexiones ni los hilos (p. ej. la renovación
+            del lease) del padre, y cada uno crea su propio engine. Las fábricas deben ser
+            funciones de módulo importables para poder enviarse a otro proceso.
+        modo_incremental: Igual que en procesar_nuevas_postulaciones
+        progreso: Igual que en procesar_nuevas_postulaciones; se invoca desde los hilos
+            de cada shard y se ignora con en_procesos
+
+    Returns:
+        Resumen con el mismo formato que procesar_nuevas_postulaciones
+    """
+    if en_procesos:
+        # Con fork, los hijos compartirían las conexiones del pool del padre y podrían
+        # quedar bloqueados por un lock tomado por uno de sus hilos al momento del fork
+        pool = ProcessPoolExecutor(max_workers=num_shards, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        pool = ThreadPoolExecutor(max_workers=num_shards)
+
+    with pool:
+        futuros = [
+            pool.submit(
+                _procesar_shard,
+                fabrica_sesion,
+                fabrica_sesion_analitica,
+                (indice, num_shards),
+                modo_incremental,
+                None if en_procesos else progreso
+            )
+            for indice in range(num_shards)
+        ]
+        # Se espera a todos los shards antes de propagar un error para no cortar
+        # a los que siguen escribiendo
+        errores = [f.exception() for f in futuros if f.exception() is not None]
+        if errores:
+            raise errores[0]
+        resumenes = [f.result() for f in futuros]
+
+    if en_procesos:
+        # Cada proceso invalidó su propia caché; la del proceso padre también quedó vieja
+        get_cache_postulados().invalidar()
+    return _combinar_resumenes(resumenes)
+
+
+def _procesar_shard(
+    fabrica_sesion: Callable[[], Session],
+    fabrica_sesion_analitica: Callable[[], Session],
+    shard: Tuple[int, int],
+    modo_incremental: bool,
+    progreso: Optional[ObservadorProgreso] = None
+) -> Dict[str, Any]:
+    with fabrica_sesion() as session, fabrica_sesion_analitica() as analytics_session:
+        service = PostulacionNotificacionService(
+            NotificacionRepository(session),
+            ConvocatoriaSnapshotRepository(session),
+            NotificacionAnalyticsRepository(analytics_session)
+        )
+        return service.procesar_nuevas_postulaciones(
+            session, modo_incremental=modo_incremental, shard=shard, progreso=progreso
+        )
+
+
+def _combinar_resumenes(resumenes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Suma los resúmenes de cada shard en uno solo"""
+    convocatorias_procesadas = sum(r["convocatorias_procesadas"] for r in resumenes)
+    # Si algún shard cayó a reconciliación completa, la ejecución se informa como completa
+    modo = "incremental" if all(r["modo"] == "incremental" for r in resumenes) else "completo"
+
+    if convocatorias_procesadas == 0:
+        return {
+            "mensaje": (
+                "No hay convocatorias con cambios desde la última ejecución"
+                if modo == "incremental" else
+                "No hay convocatorias activas para procesar"
+            ),
+            "modo": modo,
+            "notificaciones_creadas": 0,
+            "convocatorias_procesadas": 0,
+            "pendiente": any(r.get("pendiente") for r in resumenes),
+            "instrumentacion": combinar_instrumentacion([r["instrumentacion"] for r in resumenes])
+        }
+
+    return {
+        "mensaje": f"Se procesaron {convocatorias_procesadas} convocatorias activas",
+        "modo": modo,
+        "notificaciones_creadas": sum(r["notificaciones_creadas"] for r in resumenes),
+        "notificaciones_agrupadas": sum(r.get("notificaciones_agrupadas", 0) for r in resumenes),
+        "convocatorias_procesadas": convocatorias_procesadas,
+        "convocatorias_con_incremento": sum(r.get("convocatorias_con_incremento", 0) for r in resumenes),
+        "snapshots_insertados": sum(r.get("snapshots_insertados", 0) for r in resumenes),
+        "snapshots_actualizados": sum(r.get("snapshots_actualizados", 0) for r in resumenes),
+        "shards": len(resumenes),
+        # Si un shard agotó su presupuesto, la próxima invocación lo reanuda
+        "pendiente": any(r.get("pendiente") for r in resumenes),
+        "detalle": [d for r in resumenes for d in r.get("detalle", [])],
+        "instrumentacion": combinar_instrumentacion([r["instrumentacion"] for r in resumenes])
+    }
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+import time
+
+from ..repositories.retencion_repo import RetencionNotificacionesRepository
+from ..instrumentacion.etapas import MedidorEtapas
+from ..config.retencion import (
+    RETENCION_DIAS_LEIDAS,
+    RETENCION_DIAS_NO_LEIDAS,
+    RETENCION_TAMANO_LOTE,
+    RETENCION_PAUSA_MS,
+    RETENCION_PRESUPUESTO_SEGUNDOS
+)
+
+class RetencionNotificacionesService:
+    """
+    Archiva las notificaciones antiguas: las leídas con más de `dias_leidas` días y las
+    no leídas con más de `dias_no_leidas`. Mantiene acotada la tabla notificaciones,
+    que de otro modo solo crece.
+    """
+
+    def __init__(
+        self,
+        retencion_repo: RetencionNotificacionesRepository,
+        dias_leidas: int = RETENCION_DIAS_LEIDAS,
+        dias_no_leidas: int = RETENCION_DIAS_NO_LEIDAS,
+        tamano_lote: int = RETENCION_TAMANO_LOTE,
+        pausa_ms: int = RETENCION_PAUSA_MS,
+        presupuesto_segundos: float = RETENCION_PRESUPUESTO_SEGUNDOS
+    ):
+        if dias_no_leidas < dias_leidas:
+            raise ValueError("La retención de las no leídas no puede ser menor que la de las leídas")
+        self.retencion_repo = retencion_repo
+        self.dias_leidas = dias_leidas
+        self.dias_no_leidas = dias_no_leidas
+        self.tamano_lote = tamano_lote
+        self.pausa_ms = pausa_ms
+        self.presupuesto_segundos = presupuesto_segundos
+
+    def archivar_antiguas(self, simulacion: bool = False, ahora: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Mueve las notificaciones vencidas a notificaciones_archivadas por lotes.
+
+        Args:
+            simulacion: Con True no se modifica nada: solo se informa qué se archivaría
+            ahora: Fecha de referencia de las antigüedades (por defecto, la actual)
+
+        Returns:
+            Resumen con las cantidades archivadas (o candidatas, en simulación) y la
+            instrumentación por etapa
+        """
+        ahora = ahora or datetime.utcnow()
+        limite_leidas = ahora - timedelta(days=self.dias_leidas)
+        limite_no_leidas = ahora - timedelta(days=self.dias_no_leidas)
+
+        with MedidorEtapas("retencion_notificaciones", {"simulacion": simulacion}) as medidor:
+            if simulacion:
+                with medidor.etapa("conteo") as registro:
+                    candidatas = self.retencion_repo.contar_candidatas(limite_leidas, limite_no_leidas)
+                    registro.filas = len(candidatas)
+                resumen = {
+                    "mensaje": f"Se archivarían {sum(c['cantidad'] for c in candidatas)} notificaciones",
+                    "simulacion": True,
+                    "limite_leidas": limite_leidas,
+                    "limite_no_leidas": limite_no_leidas,
+                    "candidatas_leidas": sum(c["cantidad"] for c in candidatas if c["leida"]),
+                    "candidatas_no_leidas": sum(c["cantidad"] for c in candidatas if not c["leida"]),
+                    "detalle": candidatas
+                }
+            else:
+                resumen = self._archivar(limite_leidas, limite_no_leidas, medidor)
+
+        resumen["instrumentacion"] = medidor.resumen()
+        return resumen
+
+    def _archivar(self, limite_leidas: datetime, limite_no_leidas: datetime, medidor: MedidorEtapas) -> Dict[str, Any]:
+        inicio = time.monotonic()
+        with medidor.etapa("tope"):
+            hasta = self.retencion_repo.id_tope(limite_leidas, limite_no_leidas)
+
+        leidas = no_leidas = lotes = 0
+        pendiente = False
+        ultima_clave: Optional[int] = None
+        while hasta is not None:
+            with medidor.etapa("archivado") as registro:
+                leidas_lote, no_leidas_lote, seleccionadas, ultima_clave = self.retencion_repo.archivar_lote(
+                    limite_leidas, limite_no_leidas, ultima_clave, hasta, self.tamano_lote
+                )
+                registro.filas = leidas_lote + no_leidas_lote
+            if ultima_clave is None:
+                break
+            leidas += leidas_lote
+            no_leidas += no_leidas_lote
+            lotes += 1
+            if seleccionadas < self.tamano_lote:
+                # Lote incompleto: no quedan candidatas hasta el tope. Se mira lo seleccionado y
+                # no lo archivado, que puede ser menos si alguna cambió antes del DELETE
+                break
+
+            if self.presupuesto_segundos and time.monotonic() - inicio > self.presupuesto_segundos:
+                # El resto se archiva en la próxima invocación
+                pendiente = True
+                break
+            if self.pausa_ms:
+                time.sleep(self.pausa_ms / 1000)
+
+        return {
+            "mensaje": (
+                f"Se archivaron {leidas + no_leidas} notificaciones"
+                + (" (quedan pendientes para la próxima invocación)" if pendiente else "")
+            ),
+            "simulacion": False,
+            "limite_leidas": limite_leidas,
+            "limite_no_leidas": limite_no_leidas,
+            "archivadas_leidas": leidas,
+            "archivadas_no_leidas": no_leidas,
+            "lotes": lotes,
+            "pendiente": pendiente
+        }
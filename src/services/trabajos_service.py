@@ -0,0 +1,219 @@
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlmodel import Session
+
+from ..repositories.trabajo_repo import TrabajoRepository
+from ..repositories.notificacion_repo import NotificacionRepository
+from ..repositories.convocatoria_snapshot_repo import ConvocatoriaSnapshotRepository
+from ..repositories.analytic_repo import NotificacionAnalyticsRepository
+from ..models.trabajo_procesamiento import TrabajoProcesamiento
+from .postulacion_notificacion_service import (
+    PostulacionNotificacionService,
+    procesar_postulaciones_en_paralelo,
+    PROCESO_POSTULACIONES
+)
+from .ejecucion_exclusiva import EjecucionExclusiva
+from ..exception.trabajo_en_curso import TrabajoEnCurso
+from ..instrumentacion.etapas import ObservadorProgreso
+from ..config.trabajos import (
+    TRABAJOS_MAX_WORKERS,
+    TRABAJOS_INTERVALO_PROGRESO_SEGUNDOS,
+    TRABAJOS_HUERFANO_SEGUNDOS
+)
+
+logger = logging.getLogger(__name__)
+
+# Etapa cuyas filas se informan como avance: convocatorias leídas de la vista
+ETAPA_AVANCE = "lectura_synapse"
+
+class _ReporteProgreso:
+    """
+    Acumula el avance informado por el medidor de etapas y lo guarda desde un hilo
+    propio cada `intervalo` segundos. El pipeline nunca espera la escritura, que además
+    hace de latido del trabajo.
+    """
+
+    def __init__(self, guardar: Callable[[Optional[str], int], None], intervalo: float):
+        self.guardar = guardar
+        self.intervalo = intervalo
+        self.etapa: Optional[str] = None
+        self.filas = 0
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._guardar_periodicamente, name="progreso-trabajo", daemon=True)
+
+    def registrar(self, etapa: str, filas: int) -> None:
+        # Puede llamarse desde los hilos de varios shards
+        with self._lock:
+            self.etapa = etapa
+            if etapa == ETAPA_AVANCE:
+                self.filas += filas
+
+    def __enter__(self) -> "_ReporteProgreso":
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self._detener.set()
+        self._hilo.join()
+
+    def _guardar_periodicamente(self) -> None:
+        while not self._detener.wait(self.intervalo):
+            with self._lock:
+                etapa, filas = self.etapa, self.filas
+            try:
+                self.guardar(etapa, filas)
+            except Exception as e:
+                logger.warning(f"No se pudo guardar el avance del trabajo: {e}")
+
+
+class GestorTrabajos:
+    """
+    Ejecuta en segundo plano, dentro de la aplicación, los procesamientos encolados
+    desde la API. El estado de cada trabajo vive en la tabla procesamiento_trabajos.
+    """
+
+    def __init__(
+        self,
+        crear_sesion: Callable[[], Session],
+        crear_sesion_synapse: Callable[[], Session],
+        max_workers: int = TRABAJOS_MAX_WORKERS,
+        intervalo_progreso: float = TRABAJOS_INTERVALO_PROGRESO_SEGUNDOS,
+        huerfano_segundos: float = TRABAJOS_HUERFANO_SEGUNDOS
+    ):
+        self.crear_sesion = crear_sesion
+        self.crear_sesion_synapse = crear_sesion_synapse
+        self.intervalo_progreso = intervalo_progreso
+        self.huerfano_segundos = huerfano_segundos
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="trabajo")
+
+    def encolar_postulaciones(self, incremental: bool, shards: int) -> Dict[str, Any]:
+        """
+        Encola una ejecución del proceso de postulaciones. Si ya hay un trabajo pendiente
+        o en curso con los mismos parámetros se devuelve ese, sin encolar otro.
+
+        Returns:
+            Estado del trabajo (ver estado_trabajo), con "existente": True si ya estaba encolado
+
+        Raises:
+            TrabajoEnCurso: Hay un trabajo pendiente o en curso con otros parámetros
+        """
+        solicitados = {"incremental": incremental, "shards": shards}
+        with self.crear_sesion() as session:
+            repo = TrabajoRepository(session)
+            activo = repo.get_activo(PROCESO_POSTULACIONES, self._huerfano_antes())
+            if activo is not None:
+                if json.loads(activo.parametros) != solicitados:
+                    raise TrabajoEnCurso(
+                        f"Ya hay un trabajo {activo.estado} ({activo.id_trabajo}) con otros "
+                        f"parámetros: {activo.parametros}."
+                    )
+                return {**_a_dict(activo), "existente": True}
+            trabajo = repo.crear(PROCESO_POSTULACIONES, json.dumps(solicitados))
+
+        self.executor.submit(self._ejecutar, trabajo.id_trabajo)
+        return {**_a_dict(trabajo), "existente": False}
+
+    def estado_trabajo(self, id_trabajo: str) -> Optional[Dict[str, Any]]:
+        """Estado, etapa, filas procesadas y resumen final de un trabajo, o None si no existe"""
+        with self.crear_sesion() as session:
+            trabajo = TrabajoRepository(session).get(id_trabajo)
+            return _a_dict(trabajo) if trabajo is not None else None
+
+    def recuperar(self) -> int:
+        """
+        Vuelve a encolar los trabajos pendientes y los en curso huérfanos (p. ej. tras
+        reiniciarse el worker que los ejecutaba). El proceso retoma su ejecución desde el
+        último bloque confirmado.
+
+        Returns:
+            Cantidad de trabajos encolados
+        """
+        with self.crear_sesion() as session:
+            ids = TrabajoRepository(session).get_recuperables(self._huerfano_antes())
+        for id_trabajo in ids:
+            self.executor.submit(self._ejecutar, id_trabajo)
+        return len(ids)
+
+    def cerrar(self) -> None:
+        """Deja de aceptar trabajos; los que estén en curso se retoman al reiniciar"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _ejecutar(self, id_trabajo: str) -> None:
+        with self.crear_sesion() as session:
+            repo = TrabajoRepository(session)
+            if not repo.reclamar(id_trabajo, self._huerfano_antes()):
+                return
+            parametros = json.loads(repo.get(id_trabajo).parametros)
+
+        def guardar_progreso(etapa: Optional[str], filas: int) -> None:
+            with self.crear_sesion() as session:
+                TrabajoRepository(session).registrar_progreso(id_trabajo, etapa, filas)
+
+        try:
+            with _ReporteProgreso(guardar_progreso, self.intervalo_progreso) as reporte:
+                # Si hay otra ejecución en curso (Azure Function u otro trabajo) se
+                # espera su resultado en lugar de repetir el procesamiento
+                resultado = EjecucionExclusiva(self.crear_sesion, PROCESO_POSTULACIONES).ejecutar(
+                    lambda: self._procesar_postulaciones(parametros, reporte.registrar),
+                    esperar=True
+                )
+            resumen = json.dumps(
+                {clave: valor for clave, valor in resultado.items() if clave != "detalle"},
+                default=str
+            )
+            with self.crear_sesion() as session:
+                repo = TrabajoRepository(session)
+                repo.registrar_progreso(id_trabajo, reporte.etapa, reporte.filas)
+                repo.completar(id_trabajo, resumen)
+
+        except Exception as e:
+            logger.error(f"Error en el trabajo {id_trabajo}: {e}", exc_info=True)
+            with self.crear_sesion() as session:
+                TrabajoRepository(session).fallar(id_trabajo, str(e))
+
+    def _procesar_postulaciones(self, parametros: Dict[str, Any], progreso: ObservadorProgreso) -> Dict[str, Any]:
+        if parametros["shards"] > 1:
+            return procesar_postulaciones_en_paralelo(
+                self.crear_sesion,
+                self.crear_sesion_synapse,
+                num_shards=parametros["shards"],
+                en_procesos=False,
+                modo_incremental=parametros["incremental"],
+                progreso=progreso
+            )
+
+        with self.crear_sesion() as session, self.crear_sesion_synapse() as analytics_session:
+            service = PostulacionNotificacionService(
+                NotificacionRepository(session),
+                ConvocatoriaSnapshotRepository(session),
+                NotificacionAnalyticsRepository(analytics_session)
+            )
+            return service.procesar_nuevas_postulaciones(
+                session, modo_incremental=parametros["incremental"], progreso=progreso
+            )
+
+    def _huerfano_antes(self) -> datetime:
+        return datetime.utcnow() - timedelta(seconds=self.huerfano_segundos)
+
+
+def _a_dict(trabajo: TrabajoProcesamiento) -> Dict[str, Any]:
+    return {
+        "id_trabajo": trabajo.id_trabajo,
+        "proceso": trabajo.proceso,
+        "estado": trabajo.estado,
+        "parametros": json.loads(trabajo.parametros),
+        "etapa": trabajo.etapa,
+        "filas_procesadas": trabajo.filas_procesadas,
+        "intentos": trabajo.intentos,
+        "resumen": json.loads(trabajo.resumen) if trabajo.resumen else None,
+        "error": trabajo.error,
+        "fecha_creacion": trabajo.fecha_creacion,
+        "fecha_inicio": trabajo.fecha_inicio,
+        "fecha_fin": trabajo.fecha_fin
+    }